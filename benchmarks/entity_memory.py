@@ -0,0 +1,72 @@
+"""
+Memory benchmark for the entity representation: bytes per alive entity of the former dict-based entities compared to
+the slotted entities with lazy names and compact server history.
+
+Run from the repository root: python -m benchmarks.entity_memory
+"""
+import gc
+import tracemalloc
+from src.core.entity import Entity, EntityManager, EntityName, SubEntity
+
+NUMBER_OF_ENTITIES = 100_000
+SERVER_NAMES = ["Placement", "FinePitchFast", "Inspection", "Rework"]
+SERVER_VISITS = 8
+
+
+class DictEntity:
+    """Former dict-based entity representation with an eagerly built name."""
+    def __init__(self, name, creation_time):
+        self.name = name
+        self.creation_time = creation_time
+        self.destruction_time = None
+
+
+class DictSubEntity(DictEntity):
+    """Former dict-based sub entity with a server history of server name strings."""
+    def __init__(self, name, creation_time):
+        super().__init__(name, creation_time)
+        self.num_times_processed = 0
+        self.server_history = []
+
+    def add_to_server_history(self, server):
+        self.server_history.append(server)
+
+
+def bytes_per_entity(create_entity) -> float:
+    """
+    Measures the memory allocated per alive entity.
+
+    :param create_entity: Callable which creates the i-th entity
+    :return: Allocated bytes per entity
+    """
+    gc.collect()
+    tracemalloc.start()
+    entities = [create_entity(i) for i in range(NUMBER_OF_ENTITIES)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entities
+    return allocated / NUMBER_OF_ENTITIES
+
+
+def with_history(entity):
+    for visit in range(SERVER_VISITS):
+        entity.add_to_server_history(SERVER_NAMES[visit % len(SERVER_NAMES)])
+    return entity
+
+
+def main():
+    EntityManager.retain_entities = False
+    results = {
+        'Entity (dict, f-string name)': bytes_per_entity(lambda i: DictEntity(f"Source1_Entity_{i}", i)),
+        'Entity (slots, lazy name)': bytes_per_entity(lambda i: Entity(EntityName("Source1", i), i)),
+        f'SubEntity, {SERVER_VISITS} visits (dict, str history)':
+            bytes_per_entity(lambda i: with_history(DictSubEntity(f"PCB_Entity_{i}", i))),
+        f'SubEntity, {SERVER_VISITS} visits (slots, array history)':
+            bytes_per_entity(lambda i: with_history(SubEntity(EntityName("PCB", i), i))),
+    }
+    for representation, allocated in results.items():
+        print(f"{representation:<50} {allocated:>8.1f} bytes per entity")
+
+
+if __name__ == '__main__':
+    main()
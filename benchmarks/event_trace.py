@@ -0,0 +1,57 @@
+"""
+Runtime of a one-week PCB run without tracing and with the binary event trace, compared to rendering the same events
+as the former string-formatted TRACE log entries, which the components used to do while running.
+
+Run from the repository root: python -m benchmarks.event_trace
+"""
+import time
+from src.core.connection import Connection
+from src.core.entity import EntityManager
+from src.core.server import Server
+from src.core.sink import Sink
+from src.core.source import Source
+from src.models.model_pcb import setup_model_pcb
+from src.util.event_trace import EventTrace
+from src.util.simulations import run_simulation
+
+MINUTES = 10080
+REPETITIONS = 5
+
+
+def clear_components():
+    for manager in (Source.sources, Server.servers, Sink.sinks, Connection.connections):
+        manager.resetable_named_objects.clear()
+    EntityManager.destroy_all_entities()
+
+
+def seconds_per_run(event_trace=None) -> float:
+    """
+    :param event_trace: Trace to record the events into, None to run without tracing
+    :return: Fastest runtime of the repetitions in seconds
+    """
+    seconds = []
+    for _ in range(REPETITIONS):
+        clear_components()
+        start = time.perf_counter()
+        run_simulation(model=setup_model_pcb, minutes=MINUTES, event_trace=event_trace)
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def main():
+    untraced = seconds_per_run()
+    trace = EventTrace()
+    traced = seconds_per_run(trace)
+    start = time.perf_counter()
+    trace.render()
+    # the trace holds the records of all repetitions
+    rendering = (time.perf_counter() - start) / REPETITIONS
+
+    print(f"Recorded events per run: {trace.number_of_records // REPETITIONS}")
+    print(f"{'Without trace':<35} {untraced:>8.2f} s")
+    print(f"{'Binary event trace':<35} {traced:>8.2f} s ({(traced / untraced - 1) * 100:+.1f} %)")
+    print(f"{'Rendering the TRACE log entries':<35} {rendering:>8.2f} s")
+
+
+if __name__ == '__main__':
+    main()
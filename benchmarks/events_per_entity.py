@@ -0,0 +1,56 @@
+"""
+Counts the SimPy events scheduled per created entity in the PCB model, with zero-hop connections (connections without
+process duration hand over entities directly) and with every hop going through the Connection process.
+
+Run from the repository root: python -m benchmarks.events_per_entity
+"""
+import simpy
+from src.core.connection import Connection
+from src.core.entity import EntityManager
+from src.models.model_pcb import setup_model_pcb
+from src.util.global_imports import random, RANDOM_SEED
+
+MINUTES = 10080
+
+
+class CountingEnvironment(simpy.Environment):
+    """SimPy environment which counts all scheduled events."""
+    def __init__(self):
+        super().__init__()
+        self.events_scheduled = 0
+
+    def schedule(self, event, priority=1, delay=0):
+        self.events_scheduled += 1
+        super().schedule(event, priority, delay)
+
+
+def events_per_entity(zero_hop: bool) -> float:
+    """
+    Runs the PCB model for one week.
+
+    :param zero_hop: Use direct dispatch for connections without process duration
+    :return: Scheduled events per created entity
+    """
+    random.seed(RANDOM_SEED)
+    EntityManager.destroy_all_entities()
+    env = CountingEnvironment()
+    setup_model_pcb(env)
+    if not zero_hop:
+        for connection in Connection.connections:
+            if connection.env is env and connection.is_direct:
+                connection.is_direct = False
+                connection.action = env.process(connection.run())
+    env.run(until=MINUTES)
+    return env.events_scheduled / EntityManager.statistics.number_created
+
+
+def main():
+    through_process = events_per_entity(zero_hop=False)
+    zero_hop = events_per_entity(zero_hop=True)
+    print(f"Connection process: {through_process:.2f} events per entity")
+    print(f"Zero-hop:           {zero_hop:.2f} events per entity")
+    print(f"Reduction:          {(1 - zero_hop / through_process) * 100:.1f} %")
+
+
+if __name__ == '__main__':
+    main()
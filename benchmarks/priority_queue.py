@@ -0,0 +1,60 @@
+"""
+Microbenchmark of the heap-based priority queue compared to a list filtered for the entity with the lowest priority on
+every pop: time per enqueue and dequeue at queue depths from 10^2 to 10^6. At each depth the queue is filled, then
+entities are dequeued and enqueued alternately, so the depth stays constant.
+
+Run from the repository root: python -m benchmarks.priority_queue
+"""
+import random
+import time
+from src.core.entity import EntityManager, PriorityEntity
+from src.core.priority_queue import PRIORITY_KEYS, PriorityQueue
+from src.core.queue_type import QueueType
+
+DEPTHS = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+OPERATIONS = 10_000
+"""Dequeue and enqueue pairs per depth"""
+LIST_MAX_DEPTH = 10 ** 5
+"""Largest depth to measure the filtered list at, it takes minutes beyond"""
+
+
+class FilteredList(list):
+    """Queue which searches the entity with the lowest priority on every pop."""
+    def popleft(self):
+        return self.pop(min(range(len(self)), key=lambda i: self[i].priority))
+
+
+def seconds_per_operation(queue, depth: int) -> tuple[float, float]:
+    """
+    :param queue: Empty queue
+    :param depth: Queue depth
+    :return: Seconds per enqueue and per dequeue at the depth
+    """
+    rng = random.Random(1)
+    for i in range(depth):
+        queue.append(PriorityEntity(i, 0, priority=rng.random()))
+    entities = [PriorityEntity(i, 0, priority=rng.random()) for i in range(OPERATIONS)]
+
+    enqueue = dequeue = 0
+    for entity in entities:
+        start = time.perf_counter()
+        queue.popleft()
+        middle = time.perf_counter()
+        queue.append(entity)
+        enqueue += time.perf_counter() - middle
+        dequeue += middle - start
+    return enqueue / OPERATIONS, dequeue / OPERATIONS
+
+
+def main():
+    EntityManager.retain_entities = False
+    print(f"{'Depth':>9} {'Heap enqueue':>14} {'Heap dequeue':>14} {'List enqueue':>14} {'List dequeue':>14}")
+    for depth in DEPTHS:
+        heap_times = seconds_per_operation(PriorityQueue(PRIORITY_KEYS[QueueType.PRIORITY]), depth)
+        list_times = seconds_per_operation(FilteredList(), depth) if depth <= LIST_MAX_DEPTH else (None, None)
+        print(f"{depth:>9}" + "".join(f"{t * 1e6:>12.2f}us" if t is not None else f"{'-':>14}"
+                                      for t in heap_times + list_times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Parent-side cost of collecting the statistics of many replications of the PCB model: pickling the statistics of every
+replication back from the workers, regrouping them into lists and aggregating them with create_pivot, compared to
+aggregating the replication × statistic array which the workers write into shared memory, and to accumulating the
+rows window by window, with memory independent of the number of replications.
+
+Run from the repository root: python -m benchmarks.replication_results
+"""
+import logging
+import pickle
+import time
+import numpy as np
+from src.models.model_pcb import setup_model_pcb
+from src.util.replication_results import ReplicationAggregator, SharedResults, StatLayout
+from src.util.simulations import calculate_statistics, create_pivot, replication
+
+REPLICATIONS = 100_000
+DISTINCT_REPLICATIONS = 20
+ENTITY_STAT_NAMES = ['AvgTimeInSystem', 'MaxTimeInSystem', 'MinTimeInSystem', 'NumberCreated', 'NumberDestroyed',
+                     'NumberInSystem', 'AvgNumberInSystem', 'MaxNumberInSystem']
+SERVER_STAT_NAMES = ['ScheduledUtilization', 'UnitsUtilized', 'AvgTimeProcessing', 'TotalTimeProcessing',
+                     'NumberEntered', 'NumberExited', 'TotalDowntime', 'NumberDowntimes', 'AvgNumberInQueue',
+                     'MaxNumberInQueue', 'AvgTimeInQueue', 'MaxTimeInQueue']
+SINK_STAT_NAMES = ['AvgTimeInSystem', 'MaxTimeInSystem', 'MinTimeInSystem', 'NumberEntered']
+SOURCE_STAT_NAMES = ['NumberCreated', 'NumberExited']
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    distinct = [replication(setup_model_pcb, calculate_statistics, 600, r) for r in range(DISTINCT_REPLICATIONS)]
+    results = [distinct[r % DISTINCT_REPLICATIONS] for r in range(REPLICATIONS)]
+
+    start = time.perf_counter()
+    results = [pickle.loads(pickle.dumps(result)) for result in results]
+    all_entity_stats, all_server_stats, all_sink_stats, all_source_stats = [], {}, {}, {}
+    for entity_stats, server_stats, sink_stats, source_stats in results:
+        all_entity_stats.append(entity_stats)
+        for server_stat in server_stats:
+            all_server_stats.setdefault(server_stat['Server'], []).append(server_stat)
+        for sink_name, stat in sink_stats.items():
+            all_sink_stats.setdefault(sink_name, []).append(stat)
+        for source_name, stat in source_stats.items():
+            all_source_stats.setdefault(source_name, []).append(stat)
+    create_pivot(all_entity_stats, all_server_stats, all_sink_stats, all_source_stats, ENTITY_STAT_NAMES,
+                 SERVER_STAT_NAMES, SINK_STAT_NAMES, SOURCE_STAT_NAMES, log_pivot=False)
+    dictionaries = time.perf_counter() - start
+
+    layout = StatLayout.from_result(results[0], ENTITY_STAT_NAMES, SERVER_STAT_NAMES, SINK_STAT_NAMES,
+                                    SOURCE_STAT_NAMES)
+    values = np.empty((REPLICATIONS, len(layout)))
+    for r, result in enumerate(results):
+        # done by the workers
+        layout.write(values[r], result)
+    start = time.perf_counter()
+    layout.pivot(values)
+    shared_memory = time.perf_counter() - start
+
+    start = time.perf_counter()
+    aggregator = ReplicationAggregator(layout)
+    for first in range(0, REPLICATIONS, SharedResults.window):
+        aggregator.add_rows(values[first:first + SharedResults.window])
+    aggregator.pivot()
+    window = time.perf_counter() - start
+
+    print(f"{REPLICATIONS} replications, {len(layout)} statistics per replication")
+    print(f"{'Pickled dictionaries':<25} {dictionaries:>8.2f} s")
+    print(f"{'Shared memory array':<25} {shared_memory:>8.2f} s")
+    print(f"{'Shared memory window':<25} {window:>8.2f} s")
+
+
+if __name__ == '__main__':
+    main()
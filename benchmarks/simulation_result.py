@@ -0,0 +1,66 @@
+"""
+Per-call overhead of short what-if evaluations which read a single KPI of run_simulation: the former eager pivot
+table, built from a list of row dictionaries and logged at every call, compared to the SimulationResult whose pivot
+table is only built on demand.
+
+Run from the repository root: python -m benchmarks.simulation_result
+"""
+import logging
+import time
+import pandas as pd
+from src.models.model4_1 import setup_model4_1
+from src.util.helper import round_value
+from src.util.simulations import calculate_statistics, run_simulation
+from src.util.simulation_result import SimulationResult
+
+MINUTES = 10
+CALLS = 2000
+KPI = ('Sink', 'Sink1', 'AvgTimeInSystem')
+
+
+class Environment:
+    now = MINUTES
+
+
+def former_pivot_table(entity_stats: dict, server_stats: list[dict], sink_stats: dict,
+                       source_stats: dict) -> pd.DataFrame:
+    data = [{'Type': 'Entity', 'Name': 'Entity', 'Stat': key, 'Value': round_value(value)}
+            for key, value in entity_stats.items()]
+    data += [{'Type': 'Server', 'Name': stat['Server'], 'Stat': key, 'Value': round_value(value)}
+             for stat in server_stats for key, value in stat.items() if key != 'Server']
+    for component_type, component_stats in (('Sink', sink_stats), ('Source', source_stats)):
+        data += [{'Type': component_type, 'Name': name, 'Stat': key, 'Value': round_value(value)}
+                 for name, stats in component_stats.items() for key, value in stats.items()]
+    pivot_table = pd.DataFrame(data).pivot_table(index=['Type', 'Name', 'Stat'], values='Value', aggfunc='mean')
+    logging.info(pivot_table)
+    return pivot_table
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    run_simulation(model=setup_model4_1, minutes=MINUTES)
+    statistics = calculate_statistics(Environment)
+
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        former_pivot_table(*statistics).at[KPI, 'Value']
+    former = (time.perf_counter() - start) / CALLS
+
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        SimulationResult.from_statistics(*statistics)[KPI]
+    result = (time.perf_counter() - start) / CALLS
+
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        run_simulation(model=setup_model4_1, minutes=MINUTES)[KPI]
+    call = (time.perf_counter() - start) / CALLS
+
+    print(f"Result of a run of {MINUTES} minutes, one KPI read, mean of {CALLS} calls")
+    print(f"{'Eager pivot table':<25} {former * 1000:>8.3f} ms")
+    print(f"{'SimulationResult':<25} {result * 1000:>8.3f} ms")
+    print(f"{'Whole run_simulation':<25} {call * 1000:>8.3f} ms, formerly {(call - result + former) * 1000:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Runtime of successive calls with many short replications on the process pool: the former scheme, a new pool per call
+with one task and a full garbage collection per replication, compared to run_replications with the chunks of
+replications on a pool started per call and on the warm pool of the previous call.
+
+Run from the repository root: python -m benchmarks.worker_pool
+"""
+import concurrent.futures
+import gc
+import logging
+import time
+from src.models.model4_1 import setup_model4_1
+from src.util.simulations import calculate_statistics, replication, run_replications
+from src.util.worker_pool import WorkerPool
+
+MINUTES = 60
+REPLICATIONS = 200
+CALLS = 3
+
+
+def former_replication(r: int) -> tuple:
+    result = replication(setup_model4_1, calculate_statistics, MINUTES, r)
+    gc.collect()
+    return result
+
+
+def former_call() -> None:
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        futures = [executor.submit(former_replication, r) for r in range(REPLICATIONS)]
+        [future.result() for future in futures]
+
+
+def warm_pool_call() -> None:
+    run_replications(model=setup_model4_1, minutes=MINUTES, num_replications=REPLICATIONS, multiprocessing=True)
+
+
+def pool_per_call() -> None:
+    warm_pool_call()
+    WorkerPool.shutdown()
+
+
+def seconds_per_call(call) -> float:
+    """
+    :param call: Function running the replications once
+    :return: Fastest runtime of the calls in seconds
+    """
+    seconds = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        call()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    former = seconds_per_call(former_call)
+    per_call = seconds_per_call(pool_per_call)
+    warm = seconds_per_call(warm_pool_call)
+    WorkerPool.shutdown()
+
+    print(f"{REPLICATIONS} replications of {MINUTES} minutes per call")
+    print(f"{'Task per replication':<25} {former:>8.2f} s")
+    print(f"{'Chunks, pool per call':<25} {per_call:>8.2f} s ({(per_call / former - 1) * 100:+.1f} %)")
+    print(f"{'Chunks, warm pool':<25} {warm:>8.2f} s ({(warm / former - 1) * 100:+.1f} %)")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,11 +3,19 @@ The core directory contains essential components for the simulation framework.
 
     entity.py: This module defines the Entity class, which represents entities moving through the simulation system. Entities can have attributes and states that evolve over time as they interact with other components of the simulation. The Entity class is responsible for managing the lifecycle of entities, including their creation and, optionally, destruction times. Additionally, the EntityManager class tracks and manages collections of Entity instances, ensuring efficient management within the simulation framework.
 
+    event_calendar.py: This module provides the EventCalendar class, a lightweight alternative to the SimPy environment. It keeps a heap of (time, seq, callback) entries, and the standard components run as callbacks on it instead of SimPy processes, with statistics identical to the SimPy path.
+
+    model.py: This module provides the Model class, the scoped context of a simulation run. It owns the components, the entities and entity statistics and the seed of the random number streams. The class-level registries such as Server.servers refer to the active context, and every run and replication activates a fresh one, so nothing leaks from one run into the next and several models can be built in one process.
+
     queue_orders.py: This module implements the QueueOrders class, which manages the order queue within the simulation. It handles the arrival and departure of entities from queues, maintaining the order in which entities are processed.
 
+    priority_queue.py: This module provides the PriorityQueue class, a binary heap of queued entities ordered by their priority, processing time or due date, with stable ties and lazy removal. Servers use it instead of a deque for the PRIORITY, SPT and EDD queue orders.
+
     server.py: The Server class defined in this module simulates processing stations or servers within the simulation. It manages the processing of entities, including service times, resource utilization, and potential machine breakdowns. The class includes methods for processing entities, maintaining queues, handling connections to other components based on specified probabilities, and logging simulation events. Additionally, it provides a string representation of server objects.
 
     sink.py: sink.py: This module implements the Sink class, which serves as the final destination for entities within the simulation. Upon completing their journey through the system, entities arrive at the sink, where relevant statistics regarding their processing are collected. The Sink class tracks important metrics such as the total number of entities processed, the time entities spent in the system, and the maximum and minimum durations of entity processing. Additionally, the Sink class offers functionality to reset its statistics and provides a method to process entities, updating the pertinent statistics and logging processing events.
 
+    time_weighted_statistic.py: This module provides the TimeWeightedStatistic class, which integrates a piecewise constant level such as the busy units of a server over time whenever the level changes. It yields exact time averages after the warm-up, optionally per time bucket, in constant memory.
+
     source.py: The Source class serves as the initial point for entity generation within the simulation framework. It orchestrates the creation of entities based on predefined arrival patterns and directs them into the system for further processing. The class encapsulates essential functionalities for managing entity generation, routing, and interaction with subsequent components in the simulation.
     """
@@ -1,19 +1,20 @@
-import logging
 from simpy import Environment
 from collections import deque
 import src.util.global_imports as gi
-from src.core.entity import Entity
-from src.util.global_imports import ENTITY_PROCESSING_LOG_ENTRY
-from src.util.date_time import DateTime
-from src.core.resetable_named_object import ResetAbleNamedObject, ResetAbleNamedObjectManager
+from src.core.entity import ComponentIds, Entity
+from src.util.event_trace import EventTrace, TraceEvent
+from src.core.resetable_named_object import ResetAbleNamedObject
 from src.core.routing_object import RoutingObject
+from src.core.event_calendar import EventCalendar
+from src.core.model import ComponentType, Model, ModelComponents
 
 
 class Connection(ResetAbleNamedObject, RoutingObject):
-    connections = ResetAbleNamedObjectManager()
+    connections = ModelComponents(ComponentType.CONNECTIONS)
 
     def __init__(self, env: Environment, origin_component, next_component, name: str, process_duration: float = None, probability: float = None):
-        super().__init__(env, name, Connection.connections)
+        super().__init__(env, name)
+        Model.current.add_component(self, ComponentType.CONNECTIONS)
         RoutingObject.__init__(self, env)
 
         self.probability = probability
@@ -22,18 +23,35 @@ class Connection(ResetAbleNamedObject, RoutingObject):
         self.entities_queue: deque = deque()  # changed from []
         self.origin_component = origin_component
         self.next_component = next_component
-        self.processing = env.event()
+        self.uses_event_calendar = isinstance(env, EventCalendar)
+        """Runs as callbacks of an event calendar instead of a SimPy process"""
+        self.processing = None if self.uses_event_calendar else env.event()
+        self.processing_triggered = False
+        """Event calendar counterpart of `processing.triggered`, a hand-over is scheduled or in progress"""
         self.process_duration = process_duration
-        self.action = env.process(self.run())
+        self.is_direct = process_duration is None
+        """Connections without process duration hand over entities directly, without a SimPy process."""
+        self.action = None if self.is_direct or self.uses_event_calendar else env.process(self.run())
 
     def reset(self):
         self.entities_processed = 0
         self.entities_queue.clear()
 
     def handle_entity_arrival(self, entity: Entity):
+        if self.is_direct:
+            # zero-hop: same counters and trace output as run(), but without scheduling any event
+            self.number_entered += 1
+            self.log_and_process(self.origin_component, self.next_component, entity)
+            self.entities_processed += 1
+            return
+
         self.entities_queue.append(entity)
 
-        if not self.processing.triggered:
+        if self.uses_event_calendar:
+            if not self.processing_triggered:
+                self.processing_triggered = True
+                self.env.schedule(0, self._transport_next_entity)
+        elif not self.processing.triggered:
             self.processing.succeed()
 
     def run(self):
@@ -55,11 +73,33 @@ class Connection(ResetAbleNamedObject, RoutingObject):
                 self.processing = self.env.event()
                 yield self.processing
 
+    def _transport_next_entity(self):
+        """
+        Event calendar counterpart of `run` waking up: takes the next entity from the queue and hands it over after the
+        process duration. Like `run`, further queued entities wait for the next arrival.
+        """
+        if not self.entities_queue:
+            self.processing_triggered = False
+            return
+
+        entity = self.entities_queue.popleft()
+        self.number_entered += 1
+
+        if self.process_duration:
+            self.env.schedule(self.process_duration, self._hand_over, entity)
+        else:
+            self._hand_over(entity)
+
+    def _hand_over(self, entity: Entity):
+        """Event calendar callback at the end of the process duration."""
+        self.processing_triggered = False
+        self.log_and_process(self.origin_component, self.next_component, entity)
+        self.entities_processed += 1
+
     @staticmethod
     def log_and_process(component, next_component, entity: Entity):
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-            "".join([component.name, " added ", entity.name, " to ", next_component.name]),
-            DateTime.get(component.env.now)))
+        EventTrace.active is not None and EventTrace.active.record(
+            component.env.now, TraceEvent.ADDED, component.name, entity, ComponentIds.get(next_component.name))
         next_component.handle_entity_arrival(entity)
         component.number_exited += 1
 
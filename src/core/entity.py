@@ -1,22 +1,80 @@
-from typing import Union
+from array import array
+from itertools import count
+from typing import Optional, Union
+import src.util.global_imports as gi
+from src.core.time_weighted_statistic import TimeWeightedStatistic
 from src.util.singleton import Singleton
+from src.util.warm_up import MserWarmUp
+
+
+class EntityName:
+    """
+    Lazily rendered entity name. Sources pass an EntityName instead of an f-string, so the string is only built if the
+    name is actually used, e.g., for logging.
+    """
+    __slots__ = ('prefix', 'number')
+
+    def __init__(self, prefix: str, number: int) -> None:
+        """
+        :param prefix: Name of the creating component
+        :param number: Consecutive number of the entity
+        """
+        self.prefix = prefix
+        self.number = number
+
+    def __str__(self) -> str:
+        return f"{self.prefix}_Entity_{self.number}"
 
 
 class Entity:
     """Represents a generic entity with a name, creation time, and optional destruction time."""
-    def __init__(self, name: str, creation_time: Union[int, float]) -> None:
+    __slots__ = ('_name', 'creation_time', 'destruction_time', 'queue_entry_time', '_id')
+    ids = count()
+    """Source of the entity IDs, unique within the process"""
+    priority: Union[int, float] = 0
+    """Priority in queues ordered by priority, the same for all entities but a `PriorityEntity`"""
+    due_date: Optional[Union[int, float]] = None
+    """Due date in queues ordered by earliest due date, none for all entities but a `PriorityEntity`"""
+
+    def __init__(self, name: Union[str, EntityName], creation_time: Union[int, float]) -> None:
         """
         Initializes an Entity instance with Name, creation_time and destruction_time set to none and adds it to the
         EntityManager class for tracking.
 
-        :param name (str): The name of the entity.
+        :param name (Union[str, EntityName]): The name of the entity, rendered on first access if lazy.
         :param creation_time (Union[int, float]): The creation time of the entity.
         """
-        self.name = name
+        self._name = name
         self.creation_time = creation_time
         self.destruction_time = None
+        self.queue_entry_time = None
+        """Time the entity entered the queue of its current server"""
+        self._id = -1
         EntityManager.add_entity(self)
 
+    @property
+    def id(self) -> int:
+        """
+        Unique ID, identifies the entity in event traces and lifecycle exports. It is assigned on first access, so
+        only traced or exported entities hold one.
+        """
+        entity_id = self._id
+        if entity_id < 0:
+            entity_id = self._id = next(Entity.ids)
+        return entity_id
+
+    @property
+    def name(self) -> str:
+        """The name of the entity. A lazy EntityName is rendered once and then cached."""
+        name = self._name
+        if name.__class__ is not str:
+            name = self._name = str(name)
+        return name
+
+    @name.setter
+    def name(self, name: Union[str, EntityName]) -> None:
+        self._name = name
+
     def __repr__(self) -> str:
         """
         Provides a string representation of the Entity instance, showing its lifecycle.
@@ -28,45 +86,218 @@ class Entity:
             else f"{self.name} ({self.destruction_time - self.creation_time})"
 
 
+class PriorityEntity(Entity):
+    """Entity with its own priority and due date for queues ordered by priority or earliest due date."""
+    __slots__ = ('priority', 'due_date')
+
+    def __init__(self, name: Union[str, EntityName], creation_time: Union[int, float],
+                 priority: Union[int, float] = 0, due_date: Optional[Union[int, float]] = None) -> None:
+        """
+        :param priority (Union[int, float]): Priority in queues ordered by priority, lower values first.
+        :param due_date (Optional[Union[int, float]]): Due date in queues ordered by earliest due date.
+        """
+        super().__init__(name, creation_time)
+        self.priority = priority
+        self.due_date = due_date
+
+
+class ComponentIds:
+    """
+    Maps component names to small integer IDs, so entities can store their server history compactly.
+    """
+    ids: dict[str, int] = {}
+    """Component name to ID"""
+    names: list[str] = []
+    """ID to component name"""
+
+    @classmethod
+    def get(cls, name: str) -> int:
+        """
+        Returns the ID of a component name and assigns the next free ID to unknown names.
+
+        :param name: Name of the component
+        :return: ID of the component
+        """
+        component_id = cls.ids.get(name)
+        if component_id is None:
+            component_id = cls.ids[name] = len(cls.names)
+            cls.names.append(name)
+        return component_id
+
+    @classmethod
+    def name(cls, component_id: int) -> str:
+        """
+        :param component_id: ID of a component
+        :return: Name of the component
+        """
+        return cls.names[component_id]
+
+
+class EntityStatistics:
+    """
+    Collects the entity lifecycle KPIs online, i.e. when entities are created and destroyed, instead of walking all
+    entities after the run. Memory usage is constant regardless of the simulated horizon.
+    """
+    def __init__(self) -> None:
+        self.number_created = 0
+        """Number of created entities which are not destroyed during the warm-up."""
+        self.number_destroyed = 0
+        """Number of entities destroyed after the warm-up."""
+        self.total_time_in_system = 0
+        """Sum of the time in system of all entities destroyed after the warm-up."""
+        self.max_time_in_system = 0
+        """Maximum time in system of all entities destroyed after the warm-up."""
+        self.min_time_in_system = float('inf')
+        """Minimum time in system of all entities destroyed after the warm-up."""
+        self.number_in_system = TimeWeightedStatistic()
+        """Number of entities in the system (WIP) over time"""
+
+    def reset(self) -> None:
+        """Resets all collected KPIs."""
+        self.__init__()
+
+    def clear(self, time: Union[int, float]) -> None:
+        """
+        Discards the KPIs collected up to the given time, e.g., at the start of a batch of a batch-means run. The
+        entities in the system count as created, like the entities which are not destroyed during the warm-up.
+
+        :param time: Current simulation time
+        """
+        self.number_created = self.number_in_system.level
+        self.number_destroyed = 0
+        self.total_time_in_system = 0
+        self.max_time_in_system = 0
+        self.min_time_in_system = float('inf')
+        self.number_in_system.clear(time)
+
+    def record_creation(self, entity: Entity) -> None:
+        """
+        Counts a newly created entity.
+
+        :param entity: The created entity
+        """
+        self.number_created += 1
+        self.number_in_system.record(self.number_in_system.level + 1, entity.creation_time)
+
+    def record_destruction(self, entity: Entity) -> None:
+        """
+        Updates the KPIs with a destroyed entity. The warm-up filter is applied at event time: entities destroyed
+        during the warm-up are not taken into account at all.
+
+        :param entity: The destroyed entity with its destruction time set
+        """
+        self.number_in_system.record(self.number_in_system.level - 1, entity.destruction_time)
+        MserWarmUp.active is not None and MserWarmUp.active.observe(
+            entity.destruction_time, entity.destruction_time - entity.creation_time)
+        if entity.destruction_time <= gi.DURATION_WARM_UP:
+            self.number_created -= 1
+            return
+
+        time_in_system = entity.destruction_time - entity.creation_time
+        self.number_destroyed += 1
+        self.total_time_in_system += time_in_system
+        if time_in_system > self.max_time_in_system:
+            self.max_time_in_system = time_in_system
+        if time_in_system < self.min_time_in_system:
+            self.min_time_in_system = time_in_system
+
+    def calculate_statistics(self, time: Optional[Union[int, float]] = None) -> dict:
+        """
+        Calculates the entity statistics for the pivot table.
+
+        :param time: Simulation time at the end, by default the time of the last creation or destruction
+        :return: Dictionary with the entity statistics
+        """
+        if time is None:
+            time = self.number_in_system.last_change
+        if self.number_destroyed:
+            avg_time_in_system = self.total_time_in_system / self.number_destroyed
+            max_time_in_system = self.max_time_in_system
+            min_time_in_system = self.min_time_in_system
+        else:
+            avg_time_in_system = max_time_in_system = min_time_in_system = 0
+
+        return {
+            'NumberInSystem': self.number_created,
+            'AvgTimeInSystem': avg_time_in_system,
+            'MaxTimeInSystem': max_time_in_system,
+            'MinTimeInSystem': min_time_in_system,
+            'NumberCreated': self.number_created,
+            'NumberDestroyed': self.number_destroyed,
+            'AvgNumberInSystem': self.number_in_system.average(time),
+            'MaxNumberInSystem': self.number_in_system.maximum
+        }
+
+
 class EntityManager(Singleton):
     """
     Manages a collection of Entity instances. Utilizes the Singleton design pattern to ensure that only one instance of
     this class exists throughout the application.
-    This class is responsible for adding entities to a tracking list and for the destruction of all entities
-    within that list.
+    This class is responsible for collecting the entity statistics online and, if retaining is enabled, for adding
+    entities to a tracking list and for the destruction of all entities within that list.
     """
     entities: list[Entity] = []
-    """List of all existing entities instances"""
+    """List of all existing entities instances, only filled if `retain_entities` is set"""
+    retain_entities: bool = False
+    """Opt-in to keep every entity instance (also in `Source.entities` and `Sink.processed_entities`)"""
+    statistics: EntityStatistics = EntityStatistics()
+    """Streaming entity lifecycle KPIs"""
 
     @classmethod
     def add_entity(cls, entity: Entity) -> None:
         """
-        Adds an Entity instance to the EntityManager's list for tracking. This method ensures that all entities
-        are accounted for and can be managed collectively.
+        Counts the creation of an Entity instance and, if retaining is enabled, adds it to the EntityManager's list
+        for tracking.
 
         :param entity: The Entity instance to be added to the tracking list.
         """
-        cls.entities.append(entity)
+        cls.statistics.record_creation(entity)
+        if cls.retain_entities:
+            cls.entities.append(entity)
+
+    @classmethod
+    def destroy_entity(cls, entity: Entity, destruction_time: Union[int, float]) -> None:
+        """
+        Sets the destruction time of an entity and records it in the entity statistics.
+
+        :param entity: The Entity instance which leaves the system
+        :param destruction_time: Time of destruction
+        """
+        entity.destruction_time = destruction_time
+        cls.statistics.record_destruction(entity)
 
     @classmethod
     def destroy_all_entities(cls) -> None:
-        """Destroys all entities managed by the EntityManager by resetting their destruction time
-        and clearing them from the tracking list."""
+        """Destroys all entities managed by the EntityManager by clearing them from the tracking list and resets the
+        entity statistics."""
         EntityManager.entities.clear()
+        EntityManager.statistics.reset()
 
 
 class SubEntity(Entity):
-    def __init__(self, name: str, creation_time: Union[int, float]) -> None:
+    """Entity which counts how often it is processed and keeps the history of the servers it passed."""
+    __slots__ = ('num_times_processed', '_server_history')
+
+    def __init__(self, name: Union[str, EntityName], creation_time: Union[int, float]) -> None:
         super().__init__(name, creation_time)
         self.num_times_processed = 0
-        self.server_history = []
-        EntityManager.add_entity(self)
+        self._server_history = None
+        """Component IDs of the servers passed, allocated on the first entry"""
+
+    @property
+    def server_history(self) -> list[str]:
+        """Names of the servers passed in order of processing."""
+        if self._server_history is None:
+            return []
+        return [ComponentIds.name(component_id) for component_id in self._server_history]
 
     def count_processing(self) -> None:
         self.num_times_processed += 1
 
     def add_to_server_history(self, server: str) -> None:
-        self.server_history.append(server)
+        if self._server_history is None:
+            self._server_history = array('H')
+        self._server_history.append(ComponentIds.get(server))
 
     def __repr__(self):
         return f"{self.name} ({self.creation_time})" if not self.destruction_time \
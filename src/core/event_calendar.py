@@ -0,0 +1,57 @@
+from heapq import heappop, heappush
+from itertools import count
+from typing import Callable, Union
+
+
+class EventCalendar:
+    """
+    Lightweight alternative to the SimPy environment for the standard components. The calendar is a heap of
+    (time, seq, callback, args) entries, events at the same time are executed in the order they were scheduled.
+
+    Source, Server, Connection and Sink detect the event calendar and run as callbacks instead of SimPy processes. They
+    schedule their events in the same order as their SimPy processes, so the statistics are identical for the same
+    seeds, while no generator, process or event object is allocated per entity.
+    """
+
+    def __init__(self, initial_time: Union[int, float] = 0) -> None:
+        """
+        :param initial_time: Simulation time at the start
+        """
+        self.now = initial_time
+        """Current simulation time"""
+        self._calendar = []
+        """Heap of the scheduled (time, seq, callback, args) entries"""
+        self._sequence = count()
+        """Consecutive numbers of the scheduled events, so events at the same time keep their order"""
+
+    def schedule(self, delay: Union[int, float], callback: Callable, *args) -> None:
+        """
+        Schedules a callback.
+
+        :param delay: Time from now until the callback is called
+        :param callback: Callable to call
+        :param args: Arguments of the callback
+        """
+        if delay < 0:
+            raise ValueError(f"Negative delay {delay}")
+        heappush(self._calendar, (self.now + delay, next(self._sequence), callback, args))
+
+    def run(self, until: Union[int, float] = None) -> None:
+        """
+        Executes the scheduled events in time order. Like SimPy, events scheduled at `until` are not executed.
+
+        :param until: Simulation time to stop at, by default the calendar runs until no event is left
+        """
+        calendar = self._calendar
+        while calendar and (until is None or calendar[0][0] < until):
+            self.now, _, callback, args = heappop(calendar)
+            callback(*args)
+        if until is not None:
+            self.now = until
+
+    def __len__(self) -> int:
+        """Number of scheduled events."""
+        return len(self._calendar)
+
+    def __repr__(self) -> str:
+        return f"EventCalendar(now={self.now}, {len(self._calendar)} events)"
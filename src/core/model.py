@@ -1,24 +1,108 @@
-from src.util.singleton import Singleton
-from src.core.resetable_named_object import ResetAbleNamedObjectManager
 from enum import Enum
+from typing import Optional, Union
+import numpy as np
+from src.core.entity import EntityManager, EntityStatistics
+from src.core.resetable_named_object import ResetAbleNamedObjectManager
+from src.util.global_imports import RANDOM_SEED
+from src.util.random_streams import RandomStreams
 
 
 class ComponentType(Enum):
     SOURCES = 'Sources'
     SERVERS = 'Servers'
     SINKS = 'Sinks'
+    CONNECTIONS = 'Connections'
+
+
+class Model:
+    """
+    Scoped context of a simulation run. It owns the components of the run, the entities and entity statistics and the
+    seed of the random number streams. The class-level registries, e.g., `Server.servers`, `EntityManager.statistics`
+    and `RandomStreams.seed_sequence`, refer to the active context, so activating a fresh context for every run
+    discards everything of the previous run, and several models can be built in one process, each in its own context.
+    """
+    current: Optional['Model'] = None
+    """Active context, the components register in it"""
 
+    def __init__(self, seed: int = RANDOM_SEED, antithetic: Optional[bool] = None) -> None:
+        """
+        :param seed: Seed of the random number streams of the components, see `RandomStreams.seed`
+        :param antithetic: None for independent replications, False and True for the first and second run of an
+            antithetic pair
+        """
+        self.components = {component_type: ResetAbleNamedObjectManager() for component_type in ComponentType}
+        self.entities = []
+        """Entities of the run, only filled if `EntityManager.retain_entities` is set"""
+        self.entity_statistics = EntityStatistics()
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.antithetic = antithetic
+        self.previous: Optional['Model'] = None
+        """Context which was active when this one was entered, reactivated on exit"""
 
-class Model(metaclass=Singleton):
-    def __init__(self):
-        self.components = {
-            ComponentType.SOURCES: ResetAbleNamedObjectManager(),
-            ComponentType.SERVERS: ResetAbleNamedObjectManager(),
-            ComponentType.SINKS: ResetAbleNamedObjectManager()
-        }
+    def activate(self) -> 'Model':
+        """
+        Makes this context the active context, components created afterwards belong to it. The previously active
+        context is replaced, not kept, so it is discarded if nothing else refers to it, e.g., the context of the
+        previous `run_simulation`. Use the context as a context manager to return to the previous context afterwards.
+        """
+        Model.current = self
+        EntityManager.entities = self.entities
+        EntityManager.statistics = self.entity_statistics
+        RandomStreams.seed_sequence = self.seed_sequence
+        RandomStreams.antithetic = self.antithetic
+        return self
+
+    def deactivate(self) -> None:
+        """Reactivates the context which was active when this context was entered, this context can be discarded."""
+        previous, self.previous = self.previous, None
+        if Model.current is self and previous is not None:
+            previous.activate()
+
+    def __enter__(self) -> 'Model':
+        self.previous = Model.current
+        return self.activate()
+
+    def __exit__(self, *exc_info) -> None:
+        self.deactivate()
 
     def add_component(self, component, component_type):
         self.components[component_type].add(component)
 
+    def get_component(self, name: str, component_type: ComponentType):
+        """
+        :param name: Name of the component
+        :param component_type: Type of the component
+        :return: Component with the name, None if there is none
+        """
+        return self.components[component_type].get(name)
+
+    def clear_statistics(self, time: Union[int, float]) -> None:
+        """
+        Discards the statistics of the components and entities collected up to the given time, e.g., at the start of
+        a batch of a batch-means run. The state of the run is kept.
+
+        :param time: Current simulation time
+        """
+        self.entity_statistics.clear(time)
+        for component_type in (ComponentType.SOURCES, ComponentType.SERVERS, ComponentType.SINKS):
+            for component in self.components[component_type].resetable_named_objects:
+                component.clear_statistics()
+
     def get_components(self):
         return {ctype.value: manager for ctype, manager in self.components.items()}
+
+
+class ModelComponents:
+    """
+    Class-level registry of a component type, e.g., `Server.servers`, which resolves to the components of the active
+    context.
+    """
+
+    def __init__(self, component_type: ComponentType) -> None:
+        self.component_type = component_type
+
+    def __get__(self, instance, owner) -> ResetAbleNamedObjectManager:
+        return Model.current.components[self.component_type]
+
+
+Model().activate()
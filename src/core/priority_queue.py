@@ -0,0 +1,113 @@
+import math
+from heapq import heapify, heappop, heappush
+from itertools import count
+from operator import attrgetter
+from typing import Callable, Iterator, Optional, Union
+from src.core.entity import Entity
+from src.core.queue_type import QueueType
+
+
+def due_date_key(entity: Entity) -> Union[int, float]:
+    """Due date of an entity, entities without due date are queued behind all entities with due date."""
+    return math.inf if entity.due_date is None else entity.due_date
+
+
+PRIORITY_KEYS: dict[QueueType, Optional[Callable[[Entity], Union[int, float]]]] = {
+    QueueType.PRIORITY: attrgetter('priority'),
+    QueueType.SPT: None,
+    QueueType.EDD: due_date_key,
+}
+"""
+Key of the queued entities per heap-based queue order, lower keys are processed first. The key of SPT queues is the
+processing time, which the server draws when the entity is added and passes to `PriorityQueue.append`.
+"""
+
+
+class PriorityQueue:
+    """
+    Server queue ordered by a key of the entities, e.g., their priority, on top of a binary heap. Entities with equal
+    keys are processed in the order they were added. Entities are removed lazily: `remove` only marks the heap entry,
+    which is skipped when it reaches the top. Provides the part of the deque interface the server uses, so it can
+    replace the deque of FIFO and LIFO queues.
+    """
+    __slots__ = ('key', 'heap', 'entries', 'sequence')
+
+    def __init__(self, key: Optional[Callable[[Entity], Union[int, float]]]) -> None:
+        """
+        :param key: Key of an entity, evaluated once when the entity is added, None if the keys are given on adding
+        """
+        self.key = key
+        self.heap = []
+        """Heap of [key, sequence number, entity] entries, the entity is None for removed entries"""
+        self.entries = {}
+        """Entity to its heap entry, only for entities in the queue"""
+        self.sequence = count()
+        """Sequence numbers to break ties in the order the entities were added"""
+
+    def append(self, entity: Entity, key: Optional[Union[int, float]] = None) -> None:
+        """
+        Adds an entity to the queue in O(log n).
+
+        :param entity: Entity to add
+        :param key: Key of the entity, by default the one of the key function
+        """
+        entry = [self.key(entity) if key is None else key, next(self.sequence), entity]
+        self.entries[entity] = entry
+        heappush(self.heap, entry)
+
+    def popleft(self) -> Entity:
+        """
+        Removes the entity with the lowest key in amortized O(log n).
+
+        :return: Entity with the lowest key, the first added one for equal keys
+        """
+        heap = self.heap
+        while heap:
+            entity = heappop(heap)[2]
+            if entity is not None:
+                del self.entries[entity]
+                return entity
+        raise IndexError("pop from an empty priority queue")
+
+    def popleft_with_key(self) -> tuple[Union[int, float], Entity]:
+        """
+        Removes the entity with the lowest key like `popleft`.
+
+        :return: Lowest key and its entity
+        """
+        heap = self.heap
+        while heap:
+            key, _, entity = heappop(heap)
+            if entity is not None:
+                del self.entries[entity]
+                return key, entity
+        raise IndexError("pop from an empty priority queue")
+
+    pop = popleft
+    """The queue order is defined by the key, so both ends of the deque interface process the lowest key first"""
+
+    def remove(self, entity: Entity) -> None:
+        """
+        Removes an entity from the queue in O(1) by marking its heap entry. The heap is compacted once the marked
+        entries outnumber the queued entities.
+
+        :param entity: Queued entity
+        """
+        self.entries.pop(entity)[2] = None
+        if len(self.heap) > 2 * len(self.entries) + 16:
+            self.heap = [entry for entry in self.heap if entry[2] is not None]
+            heapify(self.heap)
+
+    def clear(self) -> None:
+        self.heap.clear()
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, entity: Entity) -> bool:
+        return entity in self.entries
+
+    def __iter__(self) -> Iterator[Entity]:
+        """Iterates over the queued entities in processing order, sorts the queue in O(n log n)."""
+        return (entry[2] for entry in sorted(self.entries.values()))
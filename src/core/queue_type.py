@@ -8,6 +8,14 @@ class QueueType(Enum):
     Attributes:
         FIFO: First-In-First-Out order. Elements are processed in the order they were added.
         LIFO: Last-In-First-Out order. The last element added is processed first.
+        PRIORITY: Lowest `priority` of the entities first, e.g., priority 1 before priority 2, see `PriorityEntity`.
+        SPT: Shortest processing time first. The processing time is drawn when the entity enters the queue.
+        EDD: Earliest `due_date` of the entities first, entities without due date last.
+
+    Elements with equal priority, processing time or due date are processed in the order they were added.
     """
     FIFO = 0
     LIFO = 1
+    PRIORITY = 2
+    SPT = 3
+    EDD = 4
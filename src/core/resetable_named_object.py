@@ -6,9 +6,22 @@ class ResetAbleNamedObjectManager:
 
     def __init__(self):
         self.resetable_named_objects = []
+        self.named_objects = {}
+        """Name to object, for lookups by name in constant time"""
 
     def add(self, rno):
         self.resetable_named_objects.append(rno)
+        self.named_objects[rno.name] = rno
+
+    def get(self, name):
+        """
+        :param name: Name of the object
+        :return: Object with the name, None if there is none
+        """
+        return self.named_objects.get(name)
+
+    def __len__(self):
+        return len(self.resetable_named_objects)
 
     def __iter__(self):
         self.iteration_object = -1
@@ -31,10 +44,11 @@ class ResetAbleNamedObjectManager:
 
 class ResetAbleNamedObject(ABC):
 
-    def __init__(self, env: simpy.Environment, name: str, rnom: ResetAbleNamedObjectManager):
+    def __init__(self, env: simpy.Environment, name: str, rnom: ResetAbleNamedObjectManager = None):
         self.name = name
         self.env = env
-        rnom.add(self)
+        if rnom is not None:
+            rnom.add(self)
 
     @abstractmethod
     def reset(self):
@@ -1,4 +1,5 @@
 from src.core.entity import Entity
+from src.core.routing_table import RoutingTable
 from src.util.global_imports import random
 
 
@@ -9,19 +10,27 @@ class RoutingObject:
         self.routing_expression = routing_expression
         self.next_components = []  # TODO: to be deleted?
         self.number_exited = 0
-        self.connection_cache = {}
+        self.connection_cache = {}  # kept for existing routing expressions, use routing_table instead
+        self.routing_table = RoutingTable()
+        self.routing_random = random
+        """Random number stream of the routing decisions, components use their own stream"""
         self.connections = {}
 
+    def select_connection(self):
+        """
+        Draws the next connection from the routing table. Can be used by custom routing expressions.
+
+        :return: Selected connection or None if there are no connections
+        """
+        return self.routing_table.sample(self.routing_random.random())
+
     def route_entity(self, entity: Entity):
         if self.routing_expression:
             self.routing_expression[0](self, entity, *self.routing_expression[1:])
         else:
-            decision = random.uniform(0, 100)
-            for cumulative_probability in self.connection_cache:
-                if decision <= cumulative_probability:
-                    next_server_via = self.connection_cache[cumulative_probability]
-                    next_server_via.handle_entity_arrival(entity)
-                    break
+            next_server_via = self.routing_table.sample(self.routing_random.random())
+            if next_server_via is not None:
+                next_server_via.handle_entity_arrival(entity)
 
     def connect(self, next_server, probability: float = None, process_duration: float = None):
         from src.core.source import Source  # circular import workaround
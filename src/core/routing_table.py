@@ -0,0 +1,106 @@
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Optional
+import numpy as np
+
+
+class RoutingTable:
+    """
+    Precompiled routing table of a routing object. It is built once when the component is initialized and maps a
+    uniform random number to the next connection, either by bisecting the cumulative probabilities (O(log n)) or, for
+    large fan-outs, by Walker's alias method (O(1)).
+    """
+
+    ALIAS_THRESHOLD = 16
+    """Number of connections from which the alias method is used instead of bisection."""
+
+    def __init__(self, connections: Optional[list] = None, probabilities: Optional[list[float]] = None) -> None:
+        """
+        :param connections: Connections to route to
+        :param probabilities: Probabilities of the connections in percent, in the same order as the connections
+        """
+        self.connections = list(connections or [])
+        """Connections in order of their cumulative probabilities"""
+        self.cumulative_probabilities = list(accumulate(probabilities or []))
+        """Cumulative probabilities in percent"""
+        self.alias_probabilities = None
+        """Probability to keep the drawn column of the alias table, None if bisection is used"""
+        self.aliases = None
+        """Alias of each column of the alias table"""
+
+        if len(self.connections) >= RoutingTable.ALIAS_THRESHOLD:
+            self._build_alias_table(probabilities)
+
+    @classmethod
+    def from_connections(cls, connections: dict) -> 'RoutingTable':
+        """
+        Builds the routing table of a component from its connections with validated probabilities.
+
+        :param connections: Connections of the component by name
+        :return: Routing table
+        """
+        return cls(list(connections.values()), [connection.probability for connection in connections.values()])
+
+    def _build_alias_table(self, probabilities: list[float]) -> None:
+        """Builds the alias table with Vose's variant of Walker's alias method."""
+        number_of_connections = len(probabilities)
+        total = sum(probabilities)
+        scaled = [probability * number_of_connections / total for probability in probabilities]
+        aliases = list(range(number_of_connections))
+        small = [i for i, probability in enumerate(scaled) if probability < 1]
+        large = [i for i, probability in enumerate(scaled) if probability >= 1]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            aliases[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+
+        # remaining columns are full apart from rounding errors
+        for i in small + large:
+            scaled[i] = 1
+
+        self.alias_probabilities = scaled
+        self.aliases = aliases
+
+    def sample(self, uniform: float):
+        """
+        Selects the connection for a uniform random number.
+
+        :param uniform: Random number in [0, 1)
+        :return: Selected connection or None if the table is empty
+        """
+        if not self.connections:
+            return None
+
+        if self.aliases is not None:
+            scaled = uniform * len(self.connections)
+            column = int(scaled)
+            return self.connections[column] if scaled - column < self.alias_probabilities[column] \
+                else self.connections[self.aliases[column]]
+
+        index = bisect_left(self.cumulative_probabilities, uniform * 100)
+        return self.connections[min(index, len(self.connections) - 1)]
+
+    def sample_indices(self, uniforms: np.ndarray) -> np.ndarray:
+        """
+        Selects the connections for an array of uniform random numbers at once, the same as `sample` for each of them.
+
+        :param uniforms: Random numbers in [0, 1)
+        :return: Indices of the selected connections in `connections`
+        """
+        if self.aliases is not None:
+            scaled = uniforms * len(self.connections)
+            columns = scaled.astype(int)
+            keep = scaled - columns < np.asarray(self.alias_probabilities)[columns]
+            return np.where(keep, columns, np.asarray(self.aliases)[columns])
+
+        indices = np.searchsorted(self.cumulative_probabilities, uniforms * 100, side='left')
+        return np.minimum(indices, len(self.connections) - 1)
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    def __repr__(self) -> str:
+        return f"RoutingTable({len(self.connections)} connections, " \
+               f"{'alias' if self.aliases is not None else 'bisect'})"
@@ -1,28 +1,33 @@
-import logging
 from collections import deque
-from functools import lru_cache
+from typing import Union
 
 import simpy
 import src.util.global_imports as gi
 from simpy import Event
 from src.core.entity import Entity
 from src.core.entity import SubEntity
-from src.util.global_imports import ENTITY_PROCESSING_LOG_ENTRY
-from src.util.helper import get_value_from_distribution_with_parameters, validate_probabilities, round_value, \
-    create_connection_cache
+from src.util.helper import get_value_from_distribution_with_parameters, validate_probabilities, \
+    create_connection_cache, create_routing_table
 from src.core.queue_type import QueueType
-from src.util.date_time import DateTime
-from src.core.resetable_named_object import ResetAbleNamedObject, ResetAbleNamedObjectManager
-from src.util.work_schedule import ask_work_schedule
+from src.core.priority_queue import PRIORITY_KEYS, PriorityQueue
+from src.util.columnar_export import LifecycleExport
+from src.util.event_trace import EventTrace, TraceEvent
+from src.util.random_streams import RandomStreams
+from src.core.resetable_named_object import ResetAbleNamedObject
+from src.util.work_schedule import current_shift_start, next_shift_change, steps_in_time
 from src.core.routing_object import RoutingObject
-from src.core.model import Model, ComponentType
+from src.core.model import ComponentType, Model, ModelComponents
+from src.core.event_calendar import EventCalendar
+from src.core.time_weighted_statistic import TimeWeightedStatistic
 
 
 class Server(ResetAbleNamedObject, RoutingObject):
     """Represents a server in a simulation environment"""
 
-    servers = ResetAbleNamedObjectManager()
-    """List of all existing server instances"""
+    servers = ModelComponents(ComponentType.SERVERS)
+    """List of all existing server instances of the active model context"""
+    trace_units_utilized: bool = False
+    """Opt-in to record a (start, end, units) debug trace of every processed entity in `units_utilized_over_time`"""
 
     def __init__(self, env: simpy.Environment, name: str,
                  processing_time_distribution_with_parameters=None,
@@ -31,7 +36,8 @@ class Server(ResetAbleNamedObject, RoutingObject):
                  machine_breakdown_duration=None,
                  work_schedule=None,
                  queue_order: QueueType = QueueType.FIFO,
-                 routing_expression=None):
+                 routing_expression=None,
+                 utilization_bucket_size=None):
         """
         Creates a server object which takes a simpy environment, and a name. You can optionally set parameters for
         distribution with a set processing time, a time between machine breakdowns, and a time for the duration of a
@@ -42,24 +48,39 @@ class Server(ResetAbleNamedObject, RoutingObject):
        :param processing_time_distribution_with_parameters:
        :param time_between_machine_breakdowns: Time between machine breakdowns
        :param machine_breakdown_duration: Duration of the machine breakdown
-       :param queue_order: e.g., FIFO
+       :param queue_order: e.g., FIFO, or PRIORITY, SPT and EDD for a heap-based queue
+       :param utilization_bucket_size: Length of the time buckets to collect the units utilized per bucket
        """
-        super().__init__(env, name, Server.servers)
-        Model().add_component(self, ComponentType.SERVERS)
+        super().__init__(env, name)
+        Model.current.add_component(self, ComponentType.SERVERS)
         RoutingObject.__init__(self, env, routing_expression)
 
         self.week = work_schedule
-        self.processing_time_dwp = processing_time_distribution_with_parameters
-        self.time_between_machine_breakdowns = time_between_machine_breakdowns
-        self.machine_breakdown_duration = machine_breakdown_duration
+        self.processing_time_dwp = RandomStreams.bind(processing_time_distribution_with_parameters, name, 'processing')
+        self.time_between_machine_breakdowns = RandomStreams.bind(time_between_machine_breakdowns, name,
+                                                                  'time_between_machine_breakdowns')
+        self.machine_breakdown_duration = RandomStreams.bind(machine_breakdown_duration, name,
+                                                             'machine_breakdown_duration')
+        self.routing_random = RandomStreams.random(name, 'routing')
         self.queue_order = queue_order
 
-        self.server_queue: deque = deque()
+        self.server_queue: Union[deque, PriorityQueue] = \
+            PriorityQueue(PRIORITY_KEYS[queue_order]) if queue_order in PRIORITY_KEYS else deque()
         """List which contains all entities that have been added to the server queue."""
         self.entities_processed = 0
         """Counter for how many entities are processed yet."""
 
-        self.action = env.process(self.run())
+        self.uses_event_calendar = isinstance(env, EventCalendar)
+        """Runs as callbacks of an event calendar instead of a SimPy process"""
+        if self.uses_event_calendar:
+            self.action = None
+            env.schedule(0, self._initialize_server)
+            if work_schedule:
+                env.schedule(0, self._change_shift)
+        else:
+            self.action = env.process(self.run())
+            if work_schedule:
+                env.process(self._run_work_schedule())
         """The action that will be performed on the next component."""
         self.total_processing_time_pivot_table = 0
         """Counter for the total processing time."""
@@ -75,11 +96,28 @@ class Server(ResetAbleNamedObject, RoutingObject):
         self.start_processing_time = 0
         """Counter for the start processing time."""
         self.capacity = capacity  #
-        """New attribute for server's capacity."""
+        """New attribute for server's capacity, with a work schedule the capacity of the current shift."""
+        self.on_shift = True
+        """Whether the server works, changed by the shift change events of the work schedule"""
+        if work_schedule:
+            self.on_shift, _, shift_capacity = next_shift_change(env.now, work_schedule)
+            if self.on_shift:
+                self.capacity = shift_capacity
+        self.scheduled_capacity_time = 0
+        """Available capacity integrated over the time after the warm-up, up to the last shift change"""
+        self.last_shift_change = env.now
+        """Time of the last shift change"""
+        self.shift_start = current_shift_start(env.now, work_schedule) if work_schedule else None
+        """Step in the week the current shift of the work schedule started"""
+        self.shift_utilization = {}
+        """Per shift start in the week the busy unit time and the available capacity time"""
+        self.busy_time_at_last_shift_change = 0
         self.currently_processing = []  #
         """Track currently processing entities."""
 
-        self.processing = env.event()
+        self.processing = None if self.uses_event_calendar else env.event()
+        self.processing_triggered = False
+        """Event calendar counterpart of `processing.triggered`, a wake-up is scheduled"""
         self.total_downtime_pivot_table = 0
         """Counts the total downtime of the Server."""
         self.number_downtimes_pivot_table = 0
@@ -91,7 +129,18 @@ class Server(ResetAbleNamedObject, RoutingObject):
         self.connection_cache = {}
 
         self.initialized = False
+        self.units_utilized = TimeWeightedStatistic(env.now, utilization_bucket_size)
+        """Number of busy units over time"""
+        self.queue_length = TimeWeightedStatistic(env.now)
+        """Number of entities in the queue over time"""
+        self.number_left_queue = 0
+        """Number of entities which left the queue after the warm-up"""
+        self.total_time_in_queue = 0
+        """Total time in queue of the entities which left the queue after the warm-up"""
+        self.max_time_in_queue = 0
+        """Maximum time in queue of the entities which left the queue after the warm-up"""
         self.units_utilized_over_time = []
+        """Debug trace, only filled if `trace_units_utilized` is set."""
 
         if self.time_between_machine_breakdowns:
             self.time_until_next_machine_breakdown = (
@@ -101,6 +150,27 @@ class Server(ResetAbleNamedObject, RoutingObject):
         self.server_queue.clear()
         self.currently_processing.clear()
 
+    def clear_statistics(self) -> None:
+        """
+        Discards the statistics collected up to now, e.g., at the start of a batch of a batch-means run. The state of
+        the server, its queue and the entities in process, is kept.
+        """
+        if self.week:
+            self.update_scheduled_capacity_time()
+        self.units_utilized.clear(self.env.now)
+        self.queue_length.clear(self.env.now)
+        self.entities_processed = 0
+        self.total_processing_time_pivot_table = 0
+        self.number_entered_pivot_table = 0
+        self.number_exited_pivot_table = 0
+        self.total_downtime_pivot_table = 0
+        self.number_downtimes_pivot_table = 0
+        self.scheduled_capacity_time = 0
+        self.busy_time_at_last_shift_change = 0
+        self.number_left_queue = 0
+        self.total_time_in_queue = 0
+        self.max_time_in_queue = 0
+
     @classmethod
     def reset_all(cls):
         for server in cls.servers:
@@ -124,15 +194,100 @@ class Server(ResetAbleNamedObject, RoutingObject):
         if self.env.now >= gi.DURATION_WARM_UP:
             self.number_entered_pivot_table += 1
 
-        self.server_queue.append(entity)
+        if self.queue_order is QueueType.SPT:
+            # the processing time is drawn on arrival and kept as the key of the heap entry
+            self.server_queue.append(entity, get_value_from_distribution_with_parameters(self.processing_time_dwp))
+        else:
+            self.server_queue.append(entity)
+        entity.queue_entry_time = self.env.now
+        self.queue_length.record(len(self.server_queue), self.env.now)
+
+        # activate processing if not activated, off shift the next shift start activates it
+        if self.on_shift and self._activate_processing():
+            EventTrace.active is not None and EventTrace.active.record(
+                self.env.now, TraceEvent.STARTS_PROCESSING, self.name)
+            self.uptime = self.env.now
+
+    def _activate_processing(self) -> bool:
+        """
+        Wakes up the processing of the queue if it is not woken up yet.
 
-        # activate processing if not activated
-        if not self.processing.triggered:
+        :return: True if activated, False if already activated
+        """
+        if self.uses_event_calendar:
+            if self.processing_triggered:
+                return False
+            self.processing_triggered = True
+            self.env.schedule(0, self._wake_up)
+        else:
+            if self.processing.triggered:
+                return False
             self.processing.succeed()
-            (logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format("".join([self.name, " starts processing"]),
-                                                   DateTime.get(self.env.now))))
-            self.uptime = self.env.now
+        return True
+
+    def _run_work_schedule(self):
+        """Changes the shift at every transition of the work schedule instead of polling it."""
+        while True:
+            time_until_change = self._change_shift()
+            yield self.env.timeout(time_until_change)
+
+    def _change_shift(self):
+        """
+        Looks up the current shift of the work schedule and starts processing the queue at a shift start. With the event
+        calendar it schedules itself at the next transition.
+
+        :return: Time until the next shift change
+        """
+        active, time_until_change, capacity = next_shift_change(self.env.now, self.week)
+        if active != self.on_shift or (active and capacity != self.capacity):
+            EventTrace.active is not None and EventTrace.active.record(
+                self.env.now, TraceEvent.SHIFT_STARTS if active else TraceEvent.SHIFT_ENDS, self.name,
+                value=capacity if active else 0)
+            self.update_scheduled_capacity_time()
+            self.shift_start = current_shift_start(self.env.now, self.week)
+            # Entities in process finish even if the capacity decreases, only more capacity can start processing
+            capacity_increased = active and (not self.on_shift or capacity > self.capacity)
+            self.on_shift = active
+            if active:
+                self.capacity = capacity
+            if capacity_increased:
+                self._activate_processing()
+
+        if self.uses_event_calendar:
+            self.env.schedule(time_until_change, self._change_shift)
+        return time_until_change
+
+    def update_scheduled_capacity_time(self) -> None:
+        """
+        Adds the capacity available since the last shift change to the scheduled capacity time and, together with the
+        busy unit time, to the utilization of the current shift.
+        """
+        start = max(self.last_shift_change, gi.DURATION_WARM_UP)
+        busy_time = self.units_utilized.total(self.env.now)
+        if self.on_shift and self.env.now > start:
+            available_time = self.capacity * (self.env.now - start)
+            self.scheduled_capacity_time += available_time
+            shift = self.shift_utilization.setdefault(self.shift_start, [0, 0])
+            shift[0] += busy_time - self.busy_time_at_last_shift_change
+            shift[1] += available_time
+        self.busy_time_at_last_shift_change = busy_time
+        self.last_shift_change = self.env.now
+
+    def utilization_per_shift(self) -> dict:
+        """
+        :return: Utilization in percent of the capacity available in each shift of the work schedule up to now, keyed
+            by the weekday, hour and minute the shift starts
+        """
+        self.update_scheduled_capacity_time()
+        return {steps_in_time(shift_start): busy_time / available_time * 100
+                for shift_start, (busy_time, available_time) in sorted(self.shift_utilization.items())
+                if available_time > 0}
+
+    def utilization_per_bucket(self) -> list[float]:
+        """
+        :return: Average number of busy units per time bucket of `utilization_bucket_size` up to now
+        """
+        return self.units_utilized.bucket_averages(self.env.now)
 
     def _handle_machine_breakdown(self, processing_time):
         """
@@ -144,54 +299,78 @@ class Server(ResetAbleNamedObject, RoutingObject):
             # (1) process until breakdown
             yield self.env.timeout(self.time_until_next_machine_breakdown)
 
-            logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-                "".join([self.name, " failure at "]), DateTime.get(self.env.now)))
+            EventTrace.active is not None and EventTrace.active.record(self.env.now, TraceEvent.FAILURE, self.name)
 
             # (2) Breakdown
             breakdown_duration = get_value_from_distribution_with_parameters(self.machine_breakdown_duration)
             yield self.env.timeout(breakdown_duration)
 
-            # (3) Update downtime statistics
-            if self.env.now >= gi.DURATION_WARM_UP:
-                self.number_downtimes_pivot_table += 1
-                self.total_downtime_pivot_table += breakdown_duration
-
-            logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-                "".join([self.name, " failure corrected at "]), DateTime.get(self.env.now)))
-
-            # (4) Continue processing after breakdown is resolved
-            processing_time_remaining = processing_time - self.time_until_next_machine_breakdown
-            self.time_until_next_machine_breakdown = \
-                (get_value_from_distribution_with_parameters(self.time_between_machine_breakdowns))
-            yield self.env.timeout(processing_time_remaining)
+            # (3) Update downtime statistics and (4) continue processing after breakdown is resolved
+            yield self.env.timeout(self._resolve_machine_breakdown(processing_time, breakdown_duration))
 
         else:
             yield self.env.timeout(processing_time)
             self.time_until_next_machine_breakdown -= processing_time
 
-    def _process_entity_logic(self, entity):
+    def _resolve_machine_breakdown(self, processing_time, breakdown_duration):
+        """
+        Updates the downtime statistics after a machine breakdown and draws the time until the next breakdown.
+
+        :param processing_time: Processing time of the interrupted entity
+        :param breakdown_duration: Duration of the breakdown
+        :return: Remaining processing time of the interrupted entity
+        """
+        if self.env.now >= gi.DURATION_WARM_UP:
+            self.number_downtimes_pivot_table += 1
+            self.total_downtime_pivot_table += breakdown_duration
+
+        EventTrace.active is not None and EventTrace.active.record(
+            self.env.now, TraceEvent.FAILURE_CORRECTED, self.name)
+
+        processing_time_remaining = processing_time - self.time_until_next_machine_breakdown
+        self.time_until_next_machine_breakdown = \
+            (get_value_from_distribution_with_parameters(self.time_between_machine_breakdowns))
+        return processing_time_remaining
+
+    def _process_entity_logic(self, entity, processing_time=None):
         """
         Logic to process an entity, considering processing time.
         This is a generator function used by SimPy's process management.
+
+        :param processing_time: Processing time drawn when the entity entered an SPT queue, None to draw it now
         """
         start_time = self.env.now
 
-        processing_time = get_value_from_distribution_with_parameters(self.processing_time_dwp)
+        if processing_time is None:
+            processing_time = get_value_from_distribution_with_parameters(self.processing_time_dwp)
 
         if self.time_between_machine_breakdowns is None:
             yield self.env.timeout(processing_time)
         else:
             yield from self._handle_machine_breakdown(processing_time)
 
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-            "".join([self.name, " processing ", entity.name, " done, time ",
-                     str(round_value(self.env.now - start_time))]), DateTime.get(self.env.now)))
+        self._finish_processing(entity, start_time, processing_time)
+
+    def _finish_processing(self, entity, start_time, processing_time):
+        """
+        Updates the statistics after an entity is processed, routes it to the next component and starts processing the
+        next entity in the queue.
+
+        :param entity: Processed entity
+        :param start_time: Time the processing started
+        :param processing_time: Drawn processing time, without downtimes
+        """
+        EventTrace.active is not None and EventTrace.active.record(
+            self.env.now, TraceEvent.PROCESSED, self.name, entity, self.env.now - start_time)
+        LifecycleExport.active is not None and LifecycleExport.active.record_visit(
+            entity, self.name, start_time, self.env.now)
 
         end_time = self.env.now
 
         # Update utilization records
         if end_time >= gi.DURATION_WARM_UP:
-            self.units_utilized_over_time.append((start_time, end_time, len(self.currently_processing)))
+            if Server.trace_units_utilized:
+                self.units_utilized_over_time.append((start_time, end_time, len(self.currently_processing)))
 
             self.entities_processed += 1
             self.total_processing_time_pivot_table += processing_time
@@ -200,11 +379,7 @@ class Server(ResetAbleNamedObject, RoutingObject):
 
         # After processing, remove entity from list of currently processing entities
         self.currently_processing.remove(entity)
-
-        # Log completion of processing
-        logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format("".join([self.name, " finished processing ", entity.name]),
-                                               DateTime.get(end_time)))
+        self.units_utilized.record(len(self.currently_processing), self.env.now)
 
         if isinstance(entity, SubEntity):
             entity.count_processing()
@@ -213,7 +388,7 @@ class Server(ResetAbleNamedObject, RoutingObject):
         # Handle connections to next components
         self.route_entity(entity)
 
-        if not self.week:
+        if self.on_shift:
             self._try_process_from_queue()
 
     def _try_process_from_queue(self):
@@ -223,42 +398,92 @@ class Server(ResetAbleNamedObject, RoutingObject):
         """
         if self.server_queue and len(self.currently_processing) < self.capacity:
 
+            processing_time = None
             if self.queue_order == QueueType.LIFO:
                 entity = self.server_queue.pop()
-            else:   # FIFO
+            elif self.queue_order is QueueType.SPT:
+                processing_time, entity = self.server_queue.popleft_with_key()
+            else:   # FIFO or lowest key of a priority queue
                 entity = self.server_queue.popleft()
 
             self.currently_processing.append(entity)
-            self.env.process(self._process_entity_logic(entity))
+            self.units_utilized.record(len(self.currently_processing), self.env.now)
+            self.queue_length.record(len(self.server_queue), self.env.now)
+            if self.env.now >= gi.DURATION_WARM_UP:
+                time_in_queue = self.env.now - entity.queue_entry_time
+                self.number_left_queue += 1
+                self.total_time_in_queue += time_in_queue
+                if time_in_queue > self.max_time_in_queue:
+                    self.max_time_in_queue = time_in_queue
+            if self.uses_event_calendar:
+                self._start_processing(entity, processing_time)
+            else:
+                self.env.process(self._process_entity_logic(entity, processing_time))
+
+    def _wake_up(self):
+        """Event calendar counterpart of `run` waking up: starts processing entities while there's capacity."""
+        self.processing_triggered = False
+        while self.on_shift and self.server_queue and len(self.currently_processing) < self.capacity:
+            self._try_process_from_queue()
+
+    def _start_processing(self, entity, processing_time=None):
+        """
+        Event calendar counterpart of `_process_entity_logic`: draws the processing time and schedules either the end
+        of processing or the next machine breakdown.
+        """
+        if processing_time is None:
+            processing_time = get_value_from_distribution_with_parameters(self.processing_time_dwp)
+
+        if self.time_between_machine_breakdowns is not None \
+                and processing_time > self.time_until_next_machine_breakdown:
+            self.env.schedule(self.time_until_next_machine_breakdown, self._machine_breakdown,
+                              entity, self.env.now, processing_time)
+        else:
+            self.env.schedule(processing_time, self._end_processing, entity, self.env.now, processing_time)
+
+    def _end_processing(self, entity, start_time, processing_time):
+        """Event calendar callback at the end of processing without machine breakdown."""
+        if self.time_between_machine_breakdowns is not None:
+            self.time_until_next_machine_breakdown -= processing_time
+        self._finish_processing(entity, start_time, processing_time)
+
+    def _machine_breakdown(self, entity, start_time, processing_time):
+        """Event calendar callback at a machine breakdown while processing an entity."""
+        EventTrace.active is not None and EventTrace.active.record(self.env.now, TraceEvent.FAILURE, self.name)
+
+        breakdown_duration = get_value_from_distribution_with_parameters(self.machine_breakdown_duration)
+        self.env.schedule(breakdown_duration, self._machine_repaired,
+                          entity, start_time, processing_time, breakdown_duration)
+
+    def _machine_repaired(self, entity, start_time, processing_time, breakdown_duration):
+        """Event calendar callback when a machine breakdown is resolved, processing continues."""
+        processing_time_remaining = self._resolve_machine_breakdown(processing_time, breakdown_duration)
+        self.env.schedule(processing_time_remaining, self._finish_processing, entity, start_time, processing_time)
 
-    @lru_cache(maxsize=512)
     def run(self) -> Event:
         """
         Runs the queued entities while taking the queue order into consideration
         """
         if not self.initialized:
             self._initialize_server()
-            self.initialized = True
         while True:
-            # Handle work schedule
-            active, time_to_wait, _ = ask_work_schedule(self.env.now, self.week) if self.week else (True, 0, None)
-
-            if active:
+            # Off shift, the queue waits until the shift start triggers processing
+            if self.on_shift:
                 # Check if there's any entity currently being processed and if there's space for more
                 if self.server_queue and len(self.currently_processing) < self.capacity:
                     self._try_process_from_queue()
 
-                # If there's nothing to process or the server is at capacity, wait for the next trigger
-                if not self.server_queue or len(self.currently_processing) == self.capacity:
-                    yield self.processing
-                    self.processing = self.env.event()  # Reset the event for the next round
-            else:
-                yield self.env.timeout(time_to_wait)
+            # If there's nothing to process, the server is at capacity or off shift, wait for the next trigger
+            if not self.on_shift or not self.server_queue or len(self.currently_processing) >= self.capacity:
+                yield self.processing
+                self.processing = self.env.event()  # Reset the event for the next round
 
     def _initialize_server(self):
         """Perform initial setup tasks for the server, including validating probabilities."""
         validate_probabilities(self)
         create_connection_cache(self)
+        create_routing_table(self)
+        self.initialized = True
 
     def __repr__(self):
         """Returns the name of the object when called by the Print function."""
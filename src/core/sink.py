@@ -1,19 +1,18 @@
-import logging
 import src.util.global_imports as gi
 from simpy import Environment
 
-from src.core.entity import Entity
-from src.util.global_imports import ENTITY_PROCESSING_LOG_ENTRY
-from src.util.date_time import DateTime
-from src.core.resetable_named_object import ResetAbleNamedObject, ResetAbleNamedObjectManager
+from src.core.entity import Entity, EntityManager
+from src.util.columnar_export import LifecycleExport
+from src.util.event_trace import EventTrace, TraceEvent
+from src.core.resetable_named_object import ResetAbleNamedObject
 from src.core.tally_statistic import TallyStatistic
-from src.core.model import Model, ComponentType
+from src.core.model import ComponentType, Model, ModelComponents
 
 
 class Sink(ResetAbleNamedObject):
     """Class variable to keep track of all sink instances"""
-    sinks = ResetAbleNamedObjectManager()
-    """list of all existing sinks instances"""
+    sinks = ModelComponents(ComponentType.SINKS)
+    """list of all existing sinks instances of the active model context"""
 
     def __init__(self, env: Environment, name: str, addon_processing_done_method_with_parameters=None) -> None:
         """
@@ -23,8 +22,8 @@ class Sink(ResetAbleNamedObject):
         :param name (str): Name of the new sink
         :param addon_processing_done_method_with_parameters: Callable to be executed as an add-on process trigger
         """
-        super().__init__(env, name, Sink.sinks)
-        Model().add_component(self, ComponentType.SINKS)
+        super().__init__(env, name)
+        Model.current.add_component(self, ComponentType.SINKS)
 
         self.entities_processed = 0
         """Total number of entities processed by this sink."""
@@ -41,10 +40,19 @@ class Sink(ResetAbleNamedObject):
         self.addon_processing_done_method_with_parameters = addon_processing_done_method_with_parameters
 
         self.processed_entities = []
+        """Destroyed entities, only filled if `EntityManager.retain_entities` is set."""
 
     def reset(self):
         self.entities_processed = 0
 
+    def clear_statistics(self) -> None:
+        """Discards the statistics collected up to now, e.g., at the start of a batch of a batch-means run."""
+        self.entities_processed = 0
+        self.total_time_in_system = 0
+        self.max_time_in_system_pivot_table = 0
+        self.min_time_in_system_pivot_table = float('inf')
+        self.number_entered_pivot_table = 0
+
     @classmethod
     def reset_all(cls):
         for sink in cls.sinks:
@@ -69,16 +77,19 @@ class Sink(ResetAbleNamedObject):
 
         self.entities_processed += 1
 
-        entity.destruction_time = self.env.now
+        EntityManager.destroy_entity(entity, self.env.now)
 
-        self.processed_entities.append(entity)
+        if EntityManager.retain_entities:
+            self.processed_entities.append(entity)
 
         if self.addon_processing_done_method_with_parameters:
             self.addon_processing_done_method_with_parameters[0](self, entity,
                                                                  *self.addon_processing_done_method_with_parameters[1:])
 
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-            "".join([self.name, " destroyed ", entity.name]), DateTime.get(self.env.now)))
+        EventTrace.active is not None and EventTrace.active.record(
+            self.env.now, TraceEvent.DESTROYED, self.name, entity)
+        LifecycleExport.active is not None and LifecycleExport.active.record_destruction(
+            entity, self.name, self.env.now)
 
     def __repr__(self) -> str:
         """
@@ -1,23 +1,24 @@
-import logging
 from typing import Union, Optional
 import pandas as pd
-from src.util.global_imports import ENTITY_PROCESSING_LOG_ENTRY
 import src.util.global_imports as gi
-from src.core.entity import Entity
-from src.util.helper import get_value_from_distribution_with_parameters, validate_probabilities, create_connection_cache
-from src.util.date_time import DateTime
-from src.core.resetable_named_object import ResetAbleNamedObject, ResetAbleNamedObjectManager
+from src.core.entity import Entity, EntityManager, EntityName
+from src.util.helper import get_value_from_distribution_with_parameters, validate_probabilities, create_connection_cache, \
+    create_routing_table
+from src.util.event_trace import EventTrace, TraceEvent
+from src.util.random_streams import RandomStreams
+from src.core.resetable_named_object import ResetAbleNamedObject
 from src.core.routing_object import RoutingObject
-from src.core.model import Model, ComponentType
+from src.core.model import ComponentType, Model, ModelComponents
+from src.core.event_calendar import EventCalendar
 
 
 class Source(ResetAbleNamedObject, RoutingObject):
     """
     A source is a component that creates entities and routes them to the next component.
     """
-    sources = ResetAbleNamedObjectManager()
+    sources = ModelComponents(ComponentType.SOURCES)
     """
-    A list of all the sources in the simulation.
+    A list of all the sources of the active model context.
     """
 
     def __init__(self, env, name, creation_time_distribution_with_parameters=None, arrival_table_path=None,
@@ -30,10 +31,11 @@ class Source(ResetAbleNamedObject, RoutingObject):
         :param creation_time_distribution_with_parameters: Tuple of distribution function and parameters
         :param arrival_table_path: Path to the arrival table
         """
-        super().__init__(env, name, Source.sources)
-        Model().add_component(self, ComponentType.SOURCES)
+        super().__init__(env, name)
+        Model.current.add_component(self, ComponentType.SOURCES)
         RoutingObject.__init__(self, env, routing_expression)
-        self.creation_time_dwp = creation_time_distribution_with_parameters
+        self.creation_time_dwp = RandomStreams.bind(creation_time_distribution_with_parameters, name, 'creation')
+        self.routing_random = RandomStreams.random(name, 'routing')
         self.entity_class = entity_class
 
         if arrival_table_path:
@@ -44,9 +46,14 @@ class Source(ResetAbleNamedObject, RoutingObject):
             self.arrival_table = None
             self.arrival_table_index = None
 
-        self.action = env.process(self.run())
+        if isinstance(env, EventCalendar):
+            self.action = None
+            env.schedule(0, self._start)
+        else:
+            self.action = env.process(self.run())
 
         self.entities = []
+        """Created entities, only filled if `EntityManager.retain_entities` is set."""
         self.entities_created_pivot_table = 0
         self.number_exited_pivot_table = 0
 
@@ -59,14 +66,24 @@ class Source(ResetAbleNamedObject, RoutingObject):
         self.entities = []
         self.number_exited_pivot_table = 0
 
+    def clear_statistics(self) -> None:
+        """Discards the statistics collected up to now, e.g., at the start of a batch of a batch-means run."""
+        self.entities_created_pivot_table = 0
+        self.number_exited_pivot_table = 0
+
     @classmethod
     def reset_all(cls):
         for source in cls.sources:
             source.reset()
 
-    def run(self):
+    def _initialize_source(self):
+        """Perform initial setup tasks for the source, including validating probabilities."""
         validate_probabilities(self)
         create_connection_cache(self)
+        create_routing_table(self)
+
+    def run(self):
+        self._initialize_source()
         # original
         """while True:
             entity = self.entity_class(f"{self.name}_Entity_{self.entities_created_pivot_table}", self.env.now)
@@ -89,8 +106,7 @@ class Source(ResetAbleNamedObject, RoutingObject):
             yield self.env.timeout(wait_time)"""
         # modified
         while True:
-            wait_time = self.arrival_table_based_wait_time() if self.arrival_table is not None else (
-                get_value_from_distribution_with_parameters(self.creation_time_dwp))
+            wait_time = self._get_wait_time()
 
             if wait_time is None:
                 # Arrival table exhausted
@@ -100,18 +116,46 @@ class Source(ResetAbleNamedObject, RoutingObject):
             yield self.env.timeout(wait_time)
 
             # Create entity after wait to ensure no entity is created automatically at 0
-            entity = self.entity_class(f"{self.name}_Entity_{self.entities_created_pivot_table}", self.env.now)
+            self._create_entity()
+
+    def _start(self):
+        """Event calendar counterpart of `run`: initializes the source and schedules the first entity creation."""
+        self._initialize_source()
+        self._schedule_entity_creation()
 
-            logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(
-                    "".join([self.name, " created ", entity.name]),
-                    DateTime.get(entity.creation_time)
-                )
-            )
+    def _schedule_entity_creation(self):
+        """Event calendar counterpart of waiting in `run`: schedules the creation of the next entity."""
+        wait_time = self._get_wait_time()
+
+        # Arrival table exhausted if None
+        if wait_time is not None:
+            self.env.schedule(wait_time, self._create_entity_and_schedule_next)
+
+    def _create_entity_and_schedule_next(self):
+        """Event calendar callback creating an entity."""
+        self._create_entity()
+        self._schedule_entity_creation()
+
+    def _get_wait_time(self) -> Optional[Union[int, float]]:
+        """
+        Get the time until the next entity is created, either from the arrival table or from the distribution.
+
+        :return: wait_time, None if the arrival table is exhausted
+        """
+        return self.arrival_table_based_wait_time() if self.arrival_table is not None else (
+            get_value_from_distribution_with_parameters(self.creation_time_dwp))
+
+    def _create_entity(self):
+        """Creates an entity at the current time and routes it to the next component."""
+        entity = self.entity_class(EntityName(self.name, self.entities_created_pivot_table), self.env.now)
+
+        EventTrace.active is not None and EventTrace.active.record(
+            entity.creation_time, TraceEvent.CREATED, self.name, entity)
+        if EntityManager.retain_entities:
             self.entities.append(entity)
-            self.route_entity(entity)
-            if self.env.now >= gi.DURATION_WARM_UP:
-                self.entities_created_pivot_table += 1
+        self.route_entity(entity)
+        if self.env.now >= gi.DURATION_WARM_UP:
+            self.entities_created_pivot_table += 1
 
     def arrival_table_based_wait_time(self) -> Optional[Union[int, float]]:
         """
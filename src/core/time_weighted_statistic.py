@@ -0,0 +1,100 @@
+import math
+from typing import Optional, Union
+import src.util.global_imports as gi
+
+
+class TimeWeightedStatistic:
+    """
+    Time-persistent statistic of a piecewise constant level, e.g., the number of busy units of a server, in constant
+    memory. The level is integrated over the time after the warm-up whenever it changes, optionally also per time
+    bucket. Levels which last no time, e.g., an entity entering and leaving a queue at the same time, are ignored.
+    """
+
+    def __init__(self, initial_time: Union[int, float] = 0, bucket_size: Optional[Union[int, float]] = None) -> None:
+        """
+        :param initial_time: Simulation time at which the level is 0
+        :param bucket_size: Length of the time buckets to integrate the level per bucket, None for no buckets
+        """
+        self.level = 0
+        """Current level"""
+        self.last_change = initial_time
+        """Time the level was last recorded"""
+        self.integral = 0
+        """Level integrated over the time after the warm-up up to the last change"""
+        self.maximum = 0
+        """Maximum level held after the warm-up up to the last change"""
+        self.bucket_size = bucket_size
+        self.bucket_integrals = []
+        """Level integrated per time bucket, bucket k covers [k * bucket_size, (k + 1) * bucket_size)"""
+
+    def record(self, level: Union[int, float], time: Union[int, float]) -> None:
+        """
+        Records a change of the level.
+
+        :param level: New level
+        :param time: Simulation time of the change
+        """
+        self._accumulate(time)
+        self.level = level
+
+    def _accumulate(self, time: Union[int, float]) -> None:
+        """Integrates the level since the last change up to the given time."""
+        start = max(self.last_change, gi.DURATION_WARM_UP)
+        self.last_change = time
+        if time <= start or not self.level:
+            return
+        self.integral += self.level * (time - start)
+        if self.level > self.maximum:
+            self.maximum = self.level
+
+        if self.bucket_size:
+            while start < time:
+                bucket = int(start // self.bucket_size)
+                end = min(time, (bucket + 1) * self.bucket_size)
+                if bucket >= len(self.bucket_integrals):
+                    self.bucket_integrals.extend([0] * (bucket + 1 - len(self.bucket_integrals)))
+                self.bucket_integrals[bucket] += self.level * (end - start)
+                start = end
+
+    def clear(self, time: Union[int, float]) -> None:
+        """
+        Discards the level integrated up to the given time, e.g., at the start of a batch of a batch-means run. The
+        current level is kept and integrated from the given time on.
+
+        :param time: Current simulation time
+        """
+        self._accumulate(time)
+        self.integral = 0
+        self.maximum = 0
+
+    def total(self, time: Union[int, float]) -> float:
+        """
+        :param time: Current simulation time
+        :return: Level integrated over the time after the warm-up up to the given time
+        """
+        self._accumulate(time)
+        return self.integral
+
+    def average(self, time: Union[int, float]) -> float:
+        """
+        :param time: Current simulation time
+        :return: Time-weighted average of the level after the warm-up up to the given time
+        """
+        elapsed = time - gi.DURATION_WARM_UP
+        return self.total(time) / elapsed if elapsed > 0 else 0
+
+    def bucket_averages(self, time: Union[int, float]) -> list[float]:
+        """
+        :param time: Current simulation time
+        :return: Time-weighted average of the level after the warm-up per time bucket up to the given time, 0 for
+            buckets within the warm-up
+        """
+        if not self.bucket_size:
+            return []
+        self._accumulate(time)
+        averages = []
+        for bucket in range(math.ceil(time / self.bucket_size)):
+            elapsed = min(time, (bucket + 1) * self.bucket_size) - max(bucket * self.bucket_size, gi.DURATION_WARM_UP)
+            integral = self.bucket_integrals[bucket] if bucket < len(self.bucket_integrals) else 0
+            averages.append(integral / elapsed if elapsed > 0 else 0)
+        return averages
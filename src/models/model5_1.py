@@ -27,7 +27,7 @@ def main():
 
     run_replications(model=setup_model5_1, minutes=7200, num_replications=10, multiprocessing=True)
 
-    print(Model().get_components())
+    print(Model.current.get_components())
 
 
 if __name__ == '__main__':
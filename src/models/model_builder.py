@@ -9,6 +9,7 @@ from src.core.sink import Sink
 from src.core.source import Source
 from src.util.simulations import run_replications
 from src.util.helper import load_config
+from src.util.distribution_stream import DistributionStream
 
 
 def get_component_id(component_config: dict) -> str:
@@ -99,8 +100,8 @@ def create_server(env: simpy.Environment,
 
     queue_order: str = server_config.get('queue_order', 'FIFO')  # direct cast not possible
 
-    if queue_order == 'FIFO':
-        queue_order: QueueType = QueueType.FIFO
+    if queue_order in QueueType.__members__:
+        queue_order: QueueType = QueueType[queue_order]
     else:
         queue_order: QueueType = QueueType.LIFO
 
@@ -216,9 +217,13 @@ def model_function(env: simpy.Environment) -> dict:
 
 def get_distribution(distribution_config: dict) -> (Callable, ...):
     """
-    Get the distribution with parameters from the configuration file.
+    Get the distribution with parameters from the configuration file. The variates are drawn in blocks by a
+    distribution stream.
 
     :param distribution_config: Dictionary containing the parameters for the distribution.
+
+    See also:
+        - [DistributionStream](../util/distribution_stream.html): Batched NumPy random-variate stream.
     """  # noqa: E501
     if not distribution_config or not distribution_config.get('type'):
         return None  # No distribution specified
@@ -230,21 +235,23 @@ def get_distribution(distribution_config: dict) -> (Callable, ...):
         low = float(params['low'])
         high = float(params['high'])
         mode = float(params['mode'])
-        return (random.triangular, low, high, mode)
+        dwp = (random.triangular, low, high, mode)
     elif dist_type == 'uniform':
         low = float(params['low'])
         high = float(params['high'])
-        return (random.uniform, low, high)
+        dwp = (random.uniform, low, high)
     elif dist_type == 'expovariate':
         lambd = float(params['lambda'])
-        return (random.expovariate, lambd)
+        dwp = (random.expovariate, lambd)
     elif dist_type == 'normalvariate':
         mu = float(params['mu'])
         sigma = float(params['sigma'])
-        return (random.normalvariate, mu, sigma)
+        dwp = (random.normalvariate, mu, sigma)
     else:
         raise ValueError(f"Unsupported distribution type: {dist_type}")
 
+    return (DistributionStream.from_distribution(dwp),)
+
 
 def get_config_path() -> str:
     """
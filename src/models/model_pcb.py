@@ -12,18 +12,10 @@ def record_times_processed(routing_object, entity, *parameters):
 
 def routing_rework_limitation(routing_object, entity, *parameters):
     if isinstance(entity, SubEntity) and entity.num_times_processed == 11:
-        for server_probability in routing_object.connection_cache:
-            if routing_object.connection_cache[server_probability].name == 'BadParts':
-                next_server = routing_object.connection_cache[server_probability]
-                next_server.handle_entity_arrival(entity)
-                routing_object.number_exited_pivot_table += 1
+        routing_object.connections['BadParts'].handle_entity_arrival(entity)
+        routing_object.number_exited_pivot_table += 1
     else:
-        decision = random.uniform(0, 100)
-        for cumulative_probability in routing_object.connection_cache:
-            if decision <= cumulative_probability:
-                next_server_via = routing_object.connection_cache[cumulative_probability]
-                next_server_via.handle_entity_arrival(entity)
-                break
+        routing_object.select_connection().handle_entity_arrival(entity)
 
 
 def setup_model_pcb(env):
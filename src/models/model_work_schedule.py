@@ -28,7 +28,7 @@ def setup_work_schedule(env):
     week.print_stats("week")
 
     source1 = Source(env, "Source1", (random.expovariate, 1 / 1.25))
-    server1 = Server(env, "Server1", (random.expovariate, 1), week)
+    server1 = Server(env, "Server1", (random.expovariate, 1), work_schedule=week)
     sink1 = Sink(env, "Sink1")
 
     source1.connect(server1)
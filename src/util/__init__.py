@@ -1,15 +1,37 @@
 """
 The util directory hosts utility modules and functions that support the simulation framework.
 
+    batch_means.py: This module checks the batches of a batch-means run, see run_batch_means in simulations.py, for autocorrelation. The half-widths of the batch means assume independent batches, so the statistics whose batch values are significantly correlated at lag 1 are reported with a warning.
+
+    columnar_export.py: This module provides the LifecycleExport class, which streams the lifecycle of every entity, its creation, destruction and the queue and processing times of each server visit, into chunked .npy files during the run. The ChunkedTableWriter keeps only one chunk per table in memory, and the tables are loaded with pandas after the run.
+
     date_time.py: This module offers utilities for managing date and time-related functionalities within the simulation environment. It facilitates tasks like computing time intervals and formatting timestamps to suit the simulation's requirements. The core functionalities include setting the initial date and time, retrieving the current date and time, mapping time components to different units (such as seconds, minutes, or hours), and calculating delta times relative to the initial date. By encapsulating these operations, the module enhances the simulation framework's flexibility and adaptability to various time-based scenarios.
 
+    distribution_stream.py: This module provides the DistributionStream class, a batched source of random variates. It pre-draws blocks of variates with a NumPy Generator and hands them out one at a time, so it can replace the distribution functions of the random module wherever a distribution with parameters tuple is accepted.
+
+    event_trace.py: This module provides the EventTrace class, which records the events of a run as fixed-width binary records of simulation time, event code, component ID and entity ID in a preallocated NumPy ring buffer, optionally memory-mapped to a file. Names and dates are only rendered on export, as a DataFrame or as the former TRACE log entries.
+
     global_imports.py: The code sets up configurations for a simulation framework. It imports necessary modules, defines custom logging levels, initializes a random seed, and configures logging. It also defines a class Stats as a Singleton to store detailed statistics for simulation runs.
 
     helper.py: The Helper module serves as a repository for diverse helper functions and utilities crucial for common tasks within the simulation framework. It encapsulates functionalities ranging from generating random numbers to conducting statistical calculations, enhancing the overall efficiency and versatility of the simulation process. This module integrates essential components like probability validation, logging customization, value rounding, and distribution parameter retrieval, facilitating seamless operation and management of simulation entities and processes.
 
+    lindley.py: This module provides a fast path for feed-forward networks of FIFO single servers. It detects whether a model qualifies and then computes the departure times with the vectorized Lindley recursion over pre-drawn interarrival and processing times instead of running events, writing the same statistics to the components.
+
+    lockstep.py: This module provides the LockstepReplications class, which runs all replications of a model together. In every step each replication executes its next event, and the events of all replications at the same component are computed on NumPy arrays, so the per-event interpreter overhead is shared by the replications while every replication draws the same variates as when run on its own.
+
+    random_streams.py: This module provides the RandomStreams class, which gives every source, server and routing decision its own random number stream. The streams are derived deterministically from the replication seed with a NumPy SeedSequence and keyed by component name, so adding a component does not change the random numbers of the other components.
+
+    replication_results.py: This module provides the StatLayout class, a fixed order of the statistics of a model with one column per component and statistic, so the statistics of all replications form one array which is aggregated with vectorized reductions. The ReplicationAggregator class aggregates these rows in a single pass as the replications complete, with mergeable accumulators of count, mean, variance, minimum and maximum, so the memory does not depend on the number of replications. The SharedResults class keeps a window of rows in shared memory, where the workers of the pool write the statistics of their replications.
+
+    simulation_result.py: This module provides the SimulationResult class returned by run_simulation. It keeps the rounded statistics of the run in a flat dictionary keyed by type, name and statistic for fast scalar access, and builds the pandas pivot table only when it is logged, stored or used.
+
     simulations.py: This module serves as a repository for predefined simulation scenarios or experiments within the simulation framework. Here, users can access ready-to-use simulation setups designed to leverage the core components of the framework. These simulations are crafted to cater to various testing or analysis needs, offering a convenient platform for researchers and practitioners to explore and experiment with different system configurations and parameters.
 
     singleton.py: The Singleton module provides an implementation of the Singleton design pattern, ensuring that specific classes within the simulation have only one instance throughout the runtime. This is achieved using a custom metaclass Singleton, which controls the instantiation process, ensuring that only a single instance of the class is created and reused whenever needed.
 
     visualization.py: This module hosts utilities for creating visual representations of simulation results or system dynamics.  It has tools to create different kinds visualizations, ranging from scatterplots and histograms to boxplots and violin plots.
+
+    warm_up.py: This module provides the MserWarmUp class, which detects the warm-up of a run online. It collects batch means of the time in system of the destroyed entities and applies the MSER-5 rule, and once the truncation point is found, the global warm-up ends so the statistics are collected from then on.
+
+    worker_pool.py: This module provides the WorkerPool class, a process pool which is started once and reused by the successive run_replications calls of a process. Its workers run chunks of replications and collect the garbage once per chunk instead of once per replication.
 """
@@ -0,0 +1,35 @@
+import logging
+import math
+import numpy as np
+from src.util.replication_results import StatLayout
+
+
+def lag1_autocorrelation(values: np.ndarray) -> np.ndarray:
+    """
+    :param values: Batch × statistic array, one row per batch in order of time
+    :return: Lag-1 autocorrelation of the batch values of every statistic, NaN for statistics with missing or
+        constant values
+    """
+    deviations = values - values.mean(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.sum(deviations[1:] * deviations[:-1], axis=0) / np.sum(deviations ** 2, axis=0)
+
+
+def autocorrelated_statistics(layout: StatLayout, values: np.ndarray) -> list[tuple]:
+    """
+    Checks the batches of a batch-means run for autocorrelation. The half-width of the batch means assumes independent
+    batches, the statistics whose batch values are significantly positively correlated at lag 1 (5 % level) are
+    logged with a warning, their batches are too short.
+
+    :param layout: Layout of the statistics
+    :param values: Batch × statistic array, one row per batch in order of time
+    :return: (Type, Name, Stat) of the autocorrelated statistics
+    """
+    autocorrelation = lag1_autocorrelation(values)
+    bound = 1.96 / math.sqrt(len(values))
+    autocorrelated = [key for key, correlation in zip(layout.keys, autocorrelation) if correlation > bound]
+    if autocorrelated:
+        logging.warning(f"The batch means of {len(autocorrelated)} statistics are autocorrelated (lag 1 above "
+                        f"{bound:.3f}), the half-widths are too small. Run longer or use fewer batches: "
+                        f"{autocorrelated}")
+    return autocorrelated
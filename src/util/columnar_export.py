@@ -0,0 +1,180 @@
+import glob
+import os
+from struct import Struct
+from typing import Optional, Union
+import numpy as np
+import pandas as pd
+from src.core.entity import ComponentIds, Entity
+
+STRUCT_CODES = {('f', 8): 'd', ('i', 8): 'q', ('i', 4): 'i', ('u', 4): 'I', ('u', 2): 'H', ('u', 1): 'B'}
+"""struct format character per NumPy kind and size of a field"""
+
+
+def chunk_path(directory: str, table: str, index: int) -> str:
+    """
+    :return: Path of the index-th chunk file of a table
+    """
+    return os.path.join(directory, f"{table}-{index:05d}.npy")
+
+
+def remove_chunks(directory: str, *tables: str) -> None:
+    """Removes the chunk files of the tables, so a reused directory does not mix the chunks of two runs."""
+    for table in tables:
+        for path in glob.glob(os.path.join(directory, f"{table}-*.npy")):
+            os.remove(path)
+
+
+def write_component_names(directory: str) -> None:
+    """Writes the names of the component IDs, so the component columns of the tables can be resolved."""
+    np.save(os.path.join(directory, "components.npy"), np.array(ComponentIds.names, dtype=str))
+
+
+def load_table(directory: str, table: str) -> pd.DataFrame:
+    """
+    Loads all chunks of a table, e.g., for the analysis with pandas. DuckDB and other tools can read the chunk files
+    with any .npy reader, they are plain structured arrays.
+
+    :param directory: Export directory
+    :param table: Table name, e.g., 'entities', 'visits' or 'events'
+    :return: Table with component IDs resolved to component names
+    """
+    chunks = [np.load(path) for path in sorted(glob.glob(os.path.join(directory, f"{table}-*.npy")))]
+    dataframe = pd.DataFrame(np.concatenate(chunks)) if chunks else pd.DataFrame()
+    names_path = os.path.join(directory, "components.npy")
+    if os.path.exists(names_path):
+        names = np.load(names_path)
+        for column in ('component', 'server', 'sink'):
+            if column in dataframe:
+                dataframe[column] = names[dataframe[column].to_numpy()]
+    return dataframe
+
+
+def entity_lifecycles(directory: str) -> pd.DataFrame:
+    """
+    Joins the entity and visit tables of a `LifecycleExport` to one row per destroyed entity.
+
+    :param directory: Export directory
+    :return: Creation and destruction time, sink, servers visited, total waiting and processing time per entity
+    """
+    entities = load_table(directory, 'entities')
+    visits = load_table(directory, 'visits')
+    visits['waiting_time'] = visits['start_time'] - visits['queue_entry_time']
+    visits['processing_time'] = visits['end_time'] - visits['start_time']
+    per_entity = visits.groupby('entity').agg(servers_visited=('server', 'size'),
+                                              waiting_time=('waiting_time', 'sum'),
+                                              processing_time=('processing_time', 'sum'))
+    lifecycles = entities.join(per_entity, on='entity')
+    lifecycles['servers_visited'] = lifecycles['servers_visited'].fillna(0).astype(int)
+    return lifecycles.fillna({'waiting_time': 0, 'processing_time': 0})
+
+
+class ChunkedTableWriter:
+    """
+    Appends rows of a fixed-width table to a preallocated buffer and writes the buffer as chunk file whenever it is
+    full, so the memory of a table is bounded by the chunk size regardless of the number of rows.
+    """
+
+    def __init__(self, directory: str, table: str, dtype: np.dtype, chunk_size: int) -> None:
+        """
+        :param directory: Directory of the chunk files
+        :param table: Table name, prefix of the chunk files
+        :param dtype: Packed structured dtype of the rows
+        :param chunk_size: Number of rows per chunk file
+        """
+        self.directory = directory
+        self.table = table
+        self.buffer = np.zeros(chunk_size, dtype)
+        self.memory = self.buffer.data.cast('B')
+        self.pack_into = Struct('<' + ''.join(STRUCT_CODES[dtype.fields[name][0].kind, dtype.fields[name][0].itemsize]
+                                              for name in dtype.names)).pack_into
+        self.row_size = dtype.itemsize
+        self.position = 0
+        self.chunks_written = 0
+
+    def append(self, *row: Union[int, float]) -> None:
+        """Appends a row, the values in the order of the dtype fields."""
+        position = self.position
+        self.pack_into(self.memory, position * self.row_size, *row)
+        self.position = position + 1
+        if self.position == len(self.buffer):
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered rows as chunk file."""
+        if self.position:
+            np.save(chunk_path(self.directory, self.table, self.chunks_written), self.buffer[:self.position])
+            self.chunks_written += 1
+            self.position = 0
+
+
+class LifecycleExport:
+    """
+    Streams the lifecycles of the entities into chunked columnar .npy files during the run, instead of keeping the
+    entities in memory (see `EntityManager.retain_entities`):
+
+    - entities: entity ID, creation time, destruction time and sink of each destroyed entity
+    - visits: entity ID, server, queue entry, processing start and end time of each processed entity
+
+    Use `entity_lifecycles` to join them to one row per entity, and `EventTrace` with a directory for the state changes
+    of the components.
+    """
+    ENTITY_DTYPE = np.dtype([('entity', '<i8'), ('creation_time', '<f8'), ('destruction_time', '<f8'),
+                             ('sink', '<u2')])
+    VISIT_DTYPE = np.dtype([('entity', '<i8'), ('server', '<u2'), ('queue_entry_time', '<f8'), ('start_time', '<f8'),
+                            ('end_time', '<f8')])
+
+    active: Optional['LifecycleExport'] = None
+    """Export the components write into, None if exporting is off"""
+
+    def __init__(self, directory: str, chunk_size: int = 100_000) -> None:
+        """
+        :param directory: Directory of the chunk files, created if missing. Chunks of a previous export in it are
+            removed, including the 'events' chunks of an `EventTrace`.
+        :param chunk_size: Number of rows per chunk file and table
+        """
+        os.makedirs(directory, exist_ok=True)
+        # the chunk numbers start at 0 again, so the chunks of a previous export would be loaded with the new ones
+        remove_chunks(directory, 'entities', 'visits', 'events')
+        self.directory = directory
+        self.entities = ChunkedTableWriter(directory, 'entities', self.ENTITY_DTYPE, chunk_size)
+        self.visits = ChunkedTableWriter(directory, 'visits', self.VISIT_DTYPE, chunk_size)
+        self.component_ids = {}
+        """Component name to its ID in `ComponentIds`"""
+
+    def start(self) -> 'LifecycleExport':
+        """Makes this export the active export of the components."""
+        LifecycleExport.active = self
+        return self
+
+    def close(self) -> None:
+        """Stops exporting and writes the buffered rows and the component names."""
+        if LifecycleExport.active is self:
+            LifecycleExport.active = None
+        self.entities.flush()
+        self.visits.flush()
+        write_component_names(self.directory)
+
+    def _component_id(self, component: str) -> int:
+        component_id = self.component_ids.get(component)
+        if component_id is None:
+            component_id = self.component_ids[component] = ComponentIds.get(component)
+        return component_id
+
+    def record_visit(self, entity: Entity, server: str, start_time: Union[int, float],
+                     end_time: Union[int, float]) -> bool:
+        """
+        Records that a server processed an entity.
+
+        :return: True, so the call can be chained
+        """
+        self.visits.append(entity.id, self._component_id(server), entity.queue_entry_time, start_time, end_time)
+        return True
+
+    def record_destruction(self, entity: Entity, sink: str, destruction_time: Union[int, float]) -> bool:
+        """
+        Records that a sink destroyed an entity.
+
+        :return: True, so the call can be chained
+        """
+        self.entities.append(entity.id, entity.creation_time, destruction_time, self._component_id(sink))
+        return True
@@ -0,0 +1,126 @@
+import random
+from statistics import NormalDist
+from typing import Callable, Optional, Tuple
+import numpy as np
+
+
+_MIN_UNIFORM = 1e-16
+_standard_normal_quantile = np.vectorize(NormalDist().inv_cdf, otypes=[float])
+
+
+class DistributionStream:
+    """
+    Stream of random variates which pre-draws blocks with a NumPy Generator and hands them out one at a time. The
+    buffer is refilled when it is empty.
+
+    An instance is callable without parameters, so it can be used wherever a distribution with parameters tuple is
+    accepted, e.g., ``Server(env, "Server1", (DistributionStream('exponential', 1),))``.
+    """
+
+    DEFAULT_BLOCK_SIZE = 1024
+    """Number of variates drawn at once."""
+
+    STDLIB_DISTRIBUTIONS = {
+        'expovariate': lambda lambd: ('exponential', 1 / lambd),
+        'uniform': lambda a, b: ('uniform', a, b),
+        'triangular': lambda low=0.0, high=1.0, mode=None: ('triangular', low,
+                                                            (low + high) / 2 if mode is None else mode, high),
+        'normalvariate': lambda mu=0.0, sigma=1.0: ('normal', mu, sigma),
+        'gauss': lambda mu=0.0, sigma=1.0: ('normal', mu, sigma),
+        'lognormvariate': lambda mu, sigma: ('lognormal', mu, sigma),
+        'gammavariate': lambda alpha, beta: ('gamma', alpha, beta),
+        'betavariate': lambda alpha, beta: ('beta', alpha, beta),
+    }
+    """Maps the functions of the random module to the NumPy Generator method and its parameters."""
+
+    INVERSE_DISTRIBUTION_FUNCTIONS = {
+        'exponential': lambda u, scale=1.0: -scale * np.log1p(-u),
+        'uniform': lambda u, low=0.0, high=1.0: low + (high - low) * u,
+        'triangular': lambda u, left, mode, right: np.where(
+            u < (mode - left) / (right - left),
+            left + np.sqrt(u * (right - left) * (mode - left)),
+            right - np.sqrt((1 - u) * (right - left) * (right - mode))),
+        'normal': lambda u, loc=0.0, scale=1.0: loc + scale * _standard_normal_quantile(u),
+        'lognormal': lambda u, mean=0.0, sigma=1.0: np.exp(mean + sigma * _standard_normal_quantile(u)),
+        'weibull': lambda u, a: (-np.log1p(-u)) ** (1 / a),
+    }
+    """Inverse distribution functions used for sampling by inversion, e.g., for antithetic variates."""
+
+    def __init__(self, distribution: str, *parameters, block_size: int = DEFAULT_BLOCK_SIZE,
+                 generator: Optional[np.random.Generator] = None, complement: Optional[bool] = None) -> None:
+        """
+        :param distribution: Name of the NumPy Generator method, e.g., 'exponential' or 'triangular'
+        :param parameters: Parameters of the NumPy Generator method
+        :param block_size: Number of variates drawn at once
+        :param generator: NumPy Generator, by default seeded from the random module, so the stream follows
+            `random.seed` like all other distributions
+        :param complement: None samples with the NumPy Generator method. False and True sample by inversion of the
+            uniforms U and of the complementary uniforms 1 - U, i.e., the first and second run of an antithetic pair
+        """
+        if not hasattr(np.random.Generator, distribution):
+            raise ValueError(f"Unsupported distribution: {distribution}")
+        if complement is not None and distribution not in DistributionStream.INVERSE_DISTRIBUTION_FUNCTIONS:
+            raise ValueError(f"Distribution {distribution} can not be sampled by inversion")
+
+        self.distribution = distribution
+        self.parameters = parameters
+        self.block_size = block_size
+        self.generator = generator if generator is not None else np.random.default_rng(random.getrandbits(64))
+        self.complement = complement
+        self._values = []
+        """Buffered variates in reversed order, so the next one can be popped from the end"""
+
+    @classmethod
+    def from_distribution(cls, dwp: Tuple[Callable[..., float]], **kwargs) -> 'DistributionStream':
+        """
+        Creates a stream for a distribution with parameters tuple of the random module,
+        e.g., ``(random.expovariate, 1)``.
+
+        :param dwp: Tuple of distribution function and parameters
+        :param kwargs: Keyword arguments of the stream, e.g., block_size
+        :return: Distribution stream
+        """
+        distribution, parameters = dwp[0], dwp[1:]
+        name = getattr(distribution, '__name__', None)
+        if name not in cls.STDLIB_DISTRIBUTIONS:
+            raise ValueError(f"No NumPy equivalent for distribution: {name}")
+        numpy_distribution, *numpy_parameters = cls.STDLIB_DISTRIBUTIONS[name](*parameters)
+        return cls(numpy_distribution, *numpy_parameters, **kwargs)
+
+    def _draw_block(self) -> list:
+        """Draws the next block of variates."""
+        if self.complement is None:
+            values = getattr(self.generator, self.distribution)(*self.parameters, size=self.block_size)
+        else:
+            uniforms = np.clip(self.generator.random(self.block_size), _MIN_UNIFORM, 1 - _MIN_UNIFORM)
+            if self.complement:
+                uniforms = 1 - uniforms
+            values = DistributionStream.INVERSE_DISTRIBUTION_FUNCTIONS[self.distribution](uniforms, *self.parameters)
+        values = values.tolist()
+        values.reverse()
+        return values
+
+    def __call__(self) -> float:
+        """
+        :return: Next variate of the stream
+        """
+        values = self._values
+        if not values:
+            values = self._values = self._draw_block()
+        return values.pop()
+
+    def take(self, count: int) -> np.ndarray:
+        """
+        :param count: Number of variates
+        :return: Next variates of the stream, the same as calling the stream `count` times
+        """
+        values = self._values
+        while len(values) < count:
+            values = self._values = self._draw_block() + values
+        taken = values[len(values) - count:]
+        del values[len(values) - count:]
+        taken.reverse()
+        return np.array(taken, dtype=float)
+
+    def __repr__(self) -> str:
+        return f"DistributionStream({self.distribution}, {', '.join(map(str, self.parameters))})"
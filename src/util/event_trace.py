@@ -0,0 +1,218 @@
+import logging
+from struct import Struct
+from typing import Optional, Union
+import numpy as np
+import pandas as pd
+from src.core.entity import ComponentIds, Entity
+from src.util.columnar_export import chunk_path, remove_chunks, write_component_names
+from src.util.date_time import DateTime
+from src.util.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.util.helper import round_value
+
+
+class TraceEvent:
+    """Event codes of the trace records, plain integers as enum members are too slow to pack for every event."""
+    CREATED = 0
+    """A source created the entity"""
+    ADDED = 1
+    """A connection handed the entity over, the value is the ID of the next component"""
+    STARTS_PROCESSING = 2
+    """A server woke up to process its queue"""
+    SHIFT_STARTS = 3
+    """A shift of a server starts, the value is the capacity"""
+    SHIFT_ENDS = 4
+    """A shift of a server ends"""
+    FAILURE = 5
+    """A server breaks down"""
+    FAILURE_CORRECTED = 6
+    """A server is repaired"""
+    PROCESSED = 7
+    """A server finished processing the entity, the value is the time since the processing started"""
+    DESTROYED = 8
+    """A sink destroyed the entity"""
+
+
+EVENT_NAMES = {code: name for name, code in vars(TraceEvent).items() if name.isupper()}
+"""Event code to its name"""
+
+MESSAGES = {
+    TraceEvent.CREATED: "{component} created {entity}",
+    TraceEvent.ADDED: "{component} added {entity} to {next_component}",
+    TraceEvent.STARTS_PROCESSING: "{component} starts processing",
+    TraceEvent.SHIFT_STARTS: "{component} shift starts with capacity {value:g}",
+    TraceEvent.SHIFT_ENDS: "{component} shift ends",
+    TraceEvent.FAILURE: "{component} failure at ",
+    TraceEvent.FAILURE_CORRECTED: "{component} failure corrected at ",
+    TraceEvent.PROCESSED: "{component} processing {entity} done, time {value}",
+    TraceEvent.DESTROYED: "{component} destroyed {entity}",
+}
+"""Message of the former TRACE log entries per event code"""
+
+
+class EventTrace:
+    """
+    Records the events of a run as fixed-width binary records (simulation time, event code, component ID, entity ID,
+    value) in a preallocated ring buffer, optionally memory-mapped to a file. Once the buffer is full, the oldest
+    records are overwritten, or with a directory, the buffer is written as .npy chunk file. Component and entity names
+    are only rendered on export, so recording an event costs a single `struct.pack_into` instead of formatting a log
+    entry with a date.
+
+    The components record into the active trace, see `start`, e.g.:
+
+        trace = EventTrace().start()
+        run_simulation(...)
+        EventTrace.stop()
+        trace.to_dataframe()
+    """
+    RECORD = Struct('<dBHqd')
+    """Binary layout of a record"""
+    RECORD_DTYPE = np.dtype([('time', '<f8'), ('code', 'u1'), ('component', '<u2'), ('entity', '<i8'),
+                             ('value', '<f8')])
+    """NumPy counterpart of `RECORD`"""
+
+    active: Optional['EventTrace'] = None
+    """Trace the components record into, None if tracing is off"""
+
+    def __init__(self, capacity: int = 1_000_000, path: Optional[str] = None, directory: Optional[str] = None,
+                 log_records: bool = False) -> None:
+        """
+        :param capacity: Number of records kept, older records are overwritten
+        :param path: File to memory-map the ring buffer to, None to keep it in memory
+        :param directory: Directory to stream the records into as 'events' chunks of `capacity` records, see
+            `load_table`. Entity names are not kept then, the entity IDs refer to a `LifecycleExport`. 'events' chunks
+            of a previous trace in it are removed.
+        :param log_records: Whether to write each full buffer to the TRACE log instead of overwriting it, the rest is
+            written by `log`
+        """
+        self.capacity = capacity
+        self.directory = directory
+        if directory is not None:
+            remove_chunks(directory, 'events')
+        self.log_records = log_records
+        self.chunks_written = 0
+        self.buffer = np.memmap(path, self.RECORD_DTYPE, 'w+', shape=(capacity,)) if path \
+            else np.zeros(capacity, self.RECORD_DTYPE)
+        self.memory = self.buffer.data.cast('B')
+        self.pack_into = self.RECORD.pack_into
+        self.component_ids = {}
+        """Component name to its ID in `ComponentIds`, cached as the lookup is part of every record"""
+        self.position = 0
+        """Index of the next record in the ring buffer"""
+        self.number_of_records = 0
+        """Number of recorded events, including overwritten ones"""
+        self.entity_names = {} if directory is None else None
+        """Entity ID to the (lazy) name of the entity"""
+
+    def start(self) -> 'EventTrace':
+        """Makes this trace the active trace of the components."""
+        EventTrace.active = self
+        return self
+
+    @classmethod
+    def stop(cls) -> None:
+        """Stops tracing."""
+        cls.active = None
+
+    def record(self, time: Union[int, float], code: int, component: str, entity: Optional[Entity] = None,
+               value: Union[int, float] = 0) -> bool:
+        """
+        Records an event.
+
+        :param time: Simulation time of the event
+        :param code: Event code, see `TraceEvent`
+        :param component: Name of the component
+        :param entity: Entity of the event if any
+        :param value: Additional value, see `TraceEvent`
+        :return: True, so the call can be chained like the former log calls
+        """
+        if entity is None:
+            entity_id = -1
+        else:
+            entity_id = entity.id
+            if self.entity_names is not None and entity_id not in self.entity_names:
+                self.entity_names[entity_id] = entity._name
+        component_id = self.component_ids.get(component)
+        if component_id is None:
+            component_id = self.component_ids[component] = ComponentIds.get(component)
+        position = self.position
+        self.pack_into(self.memory, position * self.RECORD.size, time, code, component_id, entity_id, value)
+        position += 1
+        if position == self.capacity:
+            position = 0
+            if self.directory is not None:
+                self._write_chunk(self.capacity)
+            elif self.log_records:
+                self._log_lines(self.render(self.buffer))
+        self.position = position
+        self.number_of_records += 1
+        return True
+
+    def _write_chunk(self, number_of_records: int) -> None:
+        np.save(chunk_path(self.directory, 'events', self.chunks_written), self.buffer[:number_of_records])
+        self.chunks_written += 1
+
+    def flush(self) -> None:
+        """Writes the records not written yet and the component names to the directory."""
+        if self.position:
+            self._write_chunk(self.position)
+            self.position = 0
+        write_component_names(self.directory)
+
+    def records(self) -> np.ndarray:
+        """
+        :return: Records kept in the ring buffer in chronological order, only the records not written or logged yet
+            with a directory or `log_records`
+        """
+        if self.directory is not None or self.log_records:
+            return np.array(self.buffer[:self.position])
+        if self.number_of_records <= self.capacity:
+            return np.array(self.buffer[:self.number_of_records])
+        return np.concatenate((self.buffer[self.position:], self.buffer[:self.position]))
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        :return: Records with rendered event, component and entity names
+        """
+        records = self.records()
+        return pd.DataFrame({
+            'Time': records['time'],
+            'Event': [EVENT_NAMES[code] for code in records['code']],
+            'Component': [ComponentIds.name(component) for component in records['component']],
+            'Entity': [self._entity_name(entity) for entity in records['entity'].tolist()],
+            'Value': records['value'],
+        })
+
+    def _entity_name(self, entity_id: int) -> Optional[str]:
+        """Renders the name of an entity, its ID if the names are not kept."""
+        if entity_id < 0:
+            return None
+        return str(self.entity_names[entity_id]) if self.entity_names is not None else str(entity_id)
+
+    def render(self, records: Optional[np.ndarray] = None) -> list[str]:
+        """
+        :param records: Records to render, by default the ones of `records`
+        :return: Records rendered as the former TRACE log entries
+        """
+        lines = []
+        for time, code, component, entity, value in (self.records() if records is None else records).tolist():
+            message = MESSAGES[code].format(
+                component=ComponentIds.name(component),
+                entity=self._entity_name(entity),
+                next_component=ComponentIds.name(int(value)) if code == TraceEvent.ADDED else None,
+                value=round_value(value))
+            lines.append(ENTITY_PROCESSING_LOG_ENTRY.format(message, DateTime.get(time)))
+        return lines
+
+    def log(self) -> None:
+        """Writes the rendered records to the TRACE log, with `log_records` the ones not logged yet."""
+        if not self.log_records and self.number_of_records > self.capacity:
+            logging.warning(f"The event trace overwrote the first {self.number_of_records - self.capacity} of "
+                            f"{self.number_of_records} records, only the last {self.capacity} are logged")
+        self._log_lines(self.render())
+        if self.log_records:
+            self.position = 0
+
+    @staticmethod
+    def _log_lines(lines: list[str]) -> None:
+        for line in lines:
+            logging.trace(line)
@@ -1,6 +1,7 @@
 import json
 import logging
 from typing import Tuple, Callable, Union
+from src.core.routing_table import RoutingTable
 
 
 ROUND_DECIMAL_PLACES = 4
@@ -71,6 +72,15 @@ def create_connection_cache(component) -> None:
         component.connection_cache[cumulative_probability] = component.connections[connection]
 
 
+def create_routing_table(component) -> None:
+    """
+    Create the precompiled routing table for a given component from its connections with validated probabilities.
+
+    :param component:
+    """
+    component.routing_table = RoutingTable.from_connections(component.connections)
+
+
 def add_logging_level(level_name, level_num, method_name=None) -> None:
     """
     Comprehensively adds a new logging level to the `logging` module and the
@@ -0,0 +1,330 @@
+import logging
+from graphlib import TopologicalSorter, CycleError
+from typing import Optional, Union
+import numpy as np
+import src.util.global_imports as gi
+from src.core.entity import Entity, EntityManager, SubEntity
+from src.core.event_calendar import EventCalendar
+from src.core.queue_type import QueueType
+from src.core.server import Server
+from src.core.sink import Sink
+from src.core.source import Source
+from src.core.time_weighted_statistic import TimeWeightedStatistic
+from src.util.columnar_export import LifecycleExport
+from src.util.event_trace import EventTrace
+from src.util.warm_up import MserWarmUp
+from src.util.distribution_stream import DistributionStream
+
+
+def draw_values(dwp, count: int) -> np.ndarray:
+    """
+    Draws values from a distribution with parameters, in the same order as `count` single draws.
+
+    :param dwp: Tuple of distribution function and parameters
+    :param count: Number of values
+    :return: Drawn values
+    """
+    distribution, parameters = dwp[0], dwp[1:]
+    if isinstance(distribution, DistributionStream) and not parameters:
+        return distribution.take(count)
+    return np.fromiter((distribution(*parameters) for _ in range(count)), dtype=float, count=count)
+
+
+def lindley_departure_times(arrival_times: np.ndarray, processing_times: np.ndarray) -> np.ndarray:
+    """
+    Departure times of a FIFO single server by the Lindley recursion D_i = max(A_i, D_i-1) + S_i, vectorized as
+    D_i = C_i + max_k<=i (A_k - C_k-1) with the cumulative processing times C.
+
+    :param arrival_times: Sorted arrival times A
+    :param processing_times: Processing times S in order of arrival
+    :return: Departure times D
+    """
+    cumulative_processing_times = np.cumsum(processing_times)
+    return cumulative_processing_times + np.maximum.accumulate(
+        arrival_times - (cumulative_processing_times - processing_times))
+
+
+def record_level_changes(statistic: TimeWeightedStatistic, times_up: np.ndarray, times_down: np.ndarray,
+                         until: Union[int, float]) -> None:
+    """
+    Records a level which rises by one at each time of `times_up` and falls by one at each time of `times_down` in a
+    time-weighted statistic, with the same integral and maximum as recording every change up to the given time.
+
+    :param statistic: Time-weighted statistic at level 0 without recorded changes
+    :param times_up: Times the level rises
+    :param times_down: Times the level falls
+    :param until: Simulation time at the end
+    """
+    times = np.concatenate((times_up[times_up < until], times_down[times_down < until]))
+    changes = np.concatenate((np.ones(np.count_nonzero(times_up < until), dtype=int),
+                              -np.ones(np.count_nonzero(times_down < until), dtype=int)))
+    order = np.argsort(times, kind='stable')
+    times, levels = times[order], np.cumsum(changes[order])
+
+    # the level after the last change at a time holds until the next change
+    last_changes = np.append(times[1:] != times[:-1], True)
+    times, levels = times[last_changes], levels[last_changes]
+    durations = np.append(times[1:], until) - np.maximum(times, gi.DURATION_WARM_UP)
+    held = durations > 0
+
+    statistic.integral += float(np.sum(levels[held] * durations[held]))
+    statistic.maximum = max(statistic.maximum, int(levels[held].max()) if np.any(held) else 0)
+    statistic.level = int(levels[-1]) if len(levels) else 0
+    statistic.last_change = until
+
+
+def draw_uniforms(random_instance, count: int) -> np.ndarray:
+    """
+    Draws uniform random numbers from a Random instance, in the same order as `count` single draws.
+
+    :param random_instance: Random instance, e.g., the routing stream of a component
+    :param count: Number of values
+    :return: Drawn values
+    """
+    return np.fromiter((random_instance.random() for _ in range(count)), dtype=float, count=count)
+
+
+def find_components(env) -> tuple[list[Source], list[Server], list[Sink]]:
+    """
+    :param env: Environment a model is built on
+    :return: Sources, servers and sinks of the model in order of creation
+    """
+    return ([source for source in Source.sources if source.env is env],
+            [server for server in Server.servers if server.env is env],
+            [sink for sink in Sink.sinks if sink.env is env])
+
+
+def incoming_connections(component, routing_objects: list) -> list:
+    """
+    :param component: Server or sink
+    :param routing_objects: Sources and servers
+    :return: Connections of the routing objects to the component
+    """
+    return [connection for routing_object in routing_objects for connection in routing_object.connections.values()
+            if connection.next_component is component]
+
+
+def unsupported_feature(env, sources: list[Source], servers: list[Server], sinks: list[Sink]) -> Optional[str]:
+    """
+    Checks whether a model only uses the standard features which the vectorized engines can compute: sources with a
+    creation time distribution, FIFO servers without machine breakdowns and work schedules, sinks without add-on method
+    and probabilistic routing over direct connections.
+
+    :return: Description of the first unsupported feature, None if the model is supported
+    """
+    if not isinstance(env, EventCalendar):
+        return "the model is not built on an event calendar"
+    if EntityManager.retain_entities:
+        return "entities are retained"
+    if EventTrace.active is not None or LifecycleExport.active is not None:
+        return "events are traced or lifecycles are exported"
+    if MserWarmUp.active is not None:
+        return "the warm-up is detected online"
+    for source in sources:
+        if source.arrival_table is not None or source.creation_time_dwp is None:
+            return f"source {source.name} has no creation time distribution"
+        if source.entity_class not in (Entity, SubEntity):
+            return f"source {source.name} creates custom entities"
+    for server in servers:
+        if server.queue_order != QueueType.FIFO:
+            return f"server {server.name} has no FIFO queue"
+        if server.units_utilized.bucket_size or Server.trace_units_utilized:
+            return f"server {server.name} collects units utilized per time bucket or as trace"
+        if server.time_between_machine_breakdowns is not None or server.week:
+            return f"server {server.name} has machine breakdowns or a work schedule"
+    for sink in sinks:
+        if sink.addon_processing_done_method_with_parameters:
+            return f"sink {sink.name} has an add-on method"
+    for routing_object in sources + servers:
+        if routing_object.routing_expression or not routing_object.connections:
+            return f"{routing_object.name} has a routing expression or no connections"
+        for connection in routing_object.connections.values():
+            if not connection.is_direct:
+                return f"connection {connection.name} of {routing_object.name} has a process duration"
+            if connection.next_component not in servers and connection.next_component not in sinks:
+                return f"connection {connection.name} of {routing_object.name} leads to an unknown component"
+    return None
+
+
+class LindleyNetwork:
+    """
+    Fast path for feed-forward networks of FIFO single servers. Instead of running events, the arrival, processing and
+    routing variates are drawn from the components' own random streams in the order the event simulation draws them,
+    and the departure times of every server are computed with the vectorized Lindley recursion. The results are
+    written to the same counters of the components as the event simulation, so `calculate_statistics` works
+    unchanged and yields the same statistics up to floating point rounding.
+    """
+
+    def __init__(self, env: EventCalendar, sources: list[Source], servers: list[Server], sinks: list[Sink]) -> None:
+        """
+        :param env: Event calendar the model is built on, no events are executed
+        :param sources: Sources of the model
+        :param servers: Servers of the model in topological order
+        :param sinks: Sinks of the model
+        """
+        self.env = env
+        self.sources = sources
+        self.servers = servers
+        self.sinks = sinks
+        self.arrivals = {component: [] for component in servers + sinks}
+        """Arrival times and creation times of the entities arriving at each server and sink"""
+        self.creation_times = []
+        self.destruction_times = []
+
+    @classmethod
+    def from_environment(cls, env) -> Optional['LindleyNetwork']:
+        """
+        Analyzes the model built on an environment.
+
+        :param env: Environment the model is built on
+        :return: Network if the model qualifies for the fast path, None otherwise
+        """
+        sources, servers, sinks = find_components(env)
+        reason = unsupported_feature(env, sources, servers, sinks)
+        if reason is None:
+            reason = next((f"server {server.name} has a capacity of {server.capacity}"
+                           for server in servers if server.capacity != 1), None)
+        if reason is None:
+            try:
+                servers = list(TopologicalSorter({server: [connection.origin_component
+                                                           for connection in incoming_connections(server, servers)]
+                                                  for server in servers}).static_order())
+            except CycleError:
+                reason = "servers are connected in a cycle"
+        if reason is not None:
+            logging.debug(f"Lindley fast path not applicable: {reason}")
+            return None
+        return cls(env, sources, servers, sinks)
+
+    def run(self, until: Union[int, float]) -> None:
+        """
+        Computes the model until the given time and sets the time of the event calendar to it.
+
+        :param until: Simulation time to stop at, like in the event simulation nothing happens at this time
+        """
+        for source in self.sources:
+            source._initialize_source()
+            self._create_entities(source, until)
+        for server in self.servers:
+            server._initialize_server()
+            self._process_entities(server, until)
+        for sink in self.sinks:
+            self._destroy_entities(sink)
+        record_level_changes(EntityManager.statistics.number_in_system, np.concatenate(self.creation_times),
+                             np.concatenate(self.destruction_times or [np.empty(0)]), until)
+        self.env.now = until
+
+    def _merged_arrivals(self, component) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: Arrival times in order of arrival and the corresponding creation times of the entities
+        """
+        arrivals = self.arrivals[component]
+        if not arrivals:
+            return np.empty(0), np.empty(0)
+        arrival_times = np.concatenate([times for times, _ in arrivals])
+        creation_times = np.concatenate([times for _, times in arrivals])
+        order = np.argsort(arrival_times, kind='stable')
+        return arrival_times[order], creation_times[order]
+
+    def _route(self, routing_object, departure_times: np.ndarray, creation_times: np.ndarray) -> None:
+        """Routes departing entities with one routing variate per entity in order of departure."""
+        uniforms = draw_uniforms(routing_object.routing_random, len(departure_times))
+        selected = routing_object.routing_table.sample_indices(uniforms)
+        for index, connection in enumerate(routing_object.routing_table.connections):
+            routed = selected == index
+            number_routed = int(np.count_nonzero(routed))
+            connection.number_entered += number_routed
+            connection.entities_processed += number_routed
+            routing_object.number_exited += number_routed
+            self.arrivals[connection.next_component].append((departure_times[routed], creation_times[routed]))
+
+    def _create_entities(self, source: Source, until: Union[int, float]) -> None:
+        """Creates the entities of a source from its interarrival times."""
+        chunks = []
+        now = 0.0
+        count = 1024
+        while now < until:
+            # the sequential cumulative sum adds up the times like the event simulation
+            chunk = np.cumsum(np.concatenate(([now], draw_values(source.creation_time_dwp, count))))[1:]
+            chunks.append(chunk)
+            now = chunk[-1]
+            count = int((until - now) / max(now, 1e-9) * sum(map(len, chunks)) * 1.1) + 64
+        creation_times = np.concatenate(chunks)
+        creation_times = creation_times[creation_times < until]
+
+        self.creation_times.append(creation_times)
+        source.entities_created_pivot_table += int(np.count_nonzero(creation_times >= gi.DURATION_WARM_UP))
+        EntityManager.statistics.number_created += len(creation_times)
+        self._route(source, creation_times, creation_times)
+
+    def _process_entities(self, server: Server, until: Union[int, float]) -> None:
+        """Processes the entities arriving at a server with the Lindley recursion."""
+        arrival_times, creation_times = self._merged_arrivals(server)
+        processing_times = draw_values(server.processing_time_dwp, len(arrival_times))
+        departure_times = lindley_departure_times(arrival_times, processing_times)
+        # processing starts at arrival or when the previous entity departs
+        start_times = np.maximum(arrival_times, np.concatenate(([-np.inf], departure_times[:-1])))
+        record_level_changes(server.units_utilized, start_times, departure_times, until)
+        record_level_changes(server.queue_length, arrival_times, start_times, until)
+
+        left_queue = (start_times >= gi.DURATION_WARM_UP) & (start_times < until)
+        times_in_queue = (start_times - arrival_times)[left_queue]
+        server.number_left_queue += len(times_in_queue)
+        server.total_time_in_queue += float(np.sum(times_in_queue))
+        server.max_time_in_queue = max(server.max_time_in_queue, float(np.max(times_in_queue, initial=0)))
+
+        finished = departure_times < until
+        departure_times, creation_times = departure_times[finished], creation_times[finished]
+
+        server.number_entered_pivot_table += int(np.count_nonzero(arrival_times >= gi.DURATION_WARM_UP))
+        counted = departure_times >= gi.DURATION_WARM_UP
+        number_counted = int(np.count_nonzero(counted))
+        total_processing_time = float(np.sum(processing_times[finished][counted]))
+        server.entities_processed += number_counted
+        server.number_exited_pivot_table += number_counted
+        server.total_processing_time_pivot_table += total_processing_time
+
+        self._route(server, departure_times, creation_times)
+
+    def _destroy_entities(self, sink: Sink) -> None:
+        """Destroys the entities arriving at a sink and records the time in system."""
+        destruction_times, creation_times = self._merged_arrivals(sink)
+        times_in_system = destruction_times - creation_times
+        self.destruction_times.append(destruction_times)
+        sink.entities_processed += len(destruction_times)
+
+        counted = destruction_times >= gi.DURATION_WARM_UP
+        if np.any(counted):
+            sink.total_time_in_system += float(np.sum(times_in_system[counted]))
+            sink.max_time_in_system_pivot_table = max(sink.max_time_in_system_pivot_table,
+                                                      float(np.max(times_in_system[counted])))
+            sink.min_time_in_system_pivot_table = min(sink.min_time_in_system_pivot_table,
+                                                      float(np.min(times_in_system[counted])))
+            sink.number_entered_pivot_table += int(np.count_nonzero(counted))
+
+        # entities destroyed during the warm-up are not taken into account at all, see EntityStatistics
+        statistics = EntityManager.statistics
+        after_warm_up = destruction_times > gi.DURATION_WARM_UP
+        statistics.number_created -= len(destruction_times) - int(np.count_nonzero(after_warm_up))
+        if np.any(after_warm_up):
+            statistics.number_destroyed += int(np.count_nonzero(after_warm_up))
+            statistics.total_time_in_system += float(np.sum(times_in_system[after_warm_up]))
+            statistics.max_time_in_system = max(statistics.max_time_in_system,
+                                                float(np.max(times_in_system[after_warm_up])))
+            statistics.min_time_in_system = min(statistics.min_time_in_system,
+                                                float(np.min(times_in_system[after_warm_up])))
+
+
+def run_lindley_fast_path(env, until: Union[int, float]) -> bool:
+    """
+    Computes the model built on an environment with the Lindley fast path if it qualifies.
+
+    :param env: Environment the model is built on
+    :param until: Simulation time to stop at
+    :return: True if the model was computed, False if it has to be simulated with events
+    """
+    network = LindleyNetwork.from_environment(env)
+    if network is None:
+        return False
+    network.run(until)
+    return True
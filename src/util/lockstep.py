@@ -0,0 +1,420 @@
+import logging
+import random
+from typing import Callable, Optional, Union
+import numpy as np
+import src.util.global_imports as gi
+from src.core.event_calendar import EventCalendar
+from src.core.model import Model
+from src.util.lindley import draw_values, draw_uniforms, find_components, unsupported_feature
+
+
+class VariateBuffer:
+    """
+    Block buffer of one random stream per replication. Exhausted rows are refilled from the stream of their replication,
+    so the variates of every replication are the same as with single draws.
+    """
+
+    def __init__(self, draw_functions: list[Callable[[int], np.ndarray]], block_size: int) -> None:
+        """
+        :param draw_functions: Per replication a function drawing the given number of variates from its stream
+        :param block_size: Number of variates drawn at once
+        """
+        self.draw_functions = draw_functions
+        self.block_size = block_size
+        self.values = np.empty((len(draw_functions), block_size))
+        self.positions = np.full(len(draw_functions), block_size)
+        """Position of the next variate of each replication"""
+
+    def next(self, replications: np.ndarray) -> np.ndarray:
+        """
+        :param replications: Distinct replications
+        :return: Next variate of each replication
+        """
+        positions = self.positions[replications]
+        for replication in replications[positions >= self.block_size]:
+            self.values[replication] = self.draw_functions[replication](self.block_size)
+            self.positions[replication] = 0
+        positions = self.positions[replications]
+        self.positions[replications] = positions + 1
+        return self.values[replications, positions]
+
+
+class LevelStatistics:
+    """Vectorized counterpart of `TimeWeightedStatistic` for a level per replication and component."""
+
+    def __init__(self, shape: tuple) -> None:
+        """
+        :param shape: Shape of the levels, e.g., (replications, servers)
+        """
+        self.levels = np.zeros(shape, dtype=int)
+        self.last_changes = np.zeros(shape)
+        self.integrals = np.zeros(shape)
+        """Levels integrated over the time after the warm-up up to the last change"""
+        self.maxima = np.zeros(shape, dtype=int)
+        """Maximum levels held after the warm-up up to the last change"""
+
+    def change(self, index: tuple, now: Union[np.ndarray, float], change: int) -> None:
+        """
+        Changes the levels at the given index, each index at most once.
+
+        :param index: Index of the levels, e.g., (replications, server)
+        :param now: Simulation times of the change
+        :param change: Change of the levels
+        """
+        start = np.maximum(self.last_changes[index], gi.DURATION_WARM_UP)
+        levels = self.levels[index]
+        held = now > start
+        self.integrals[index] += np.where(held, levels * (now - start), 0)
+        self.maxima[index] = np.where(held, np.maximum(self.maxima[index], levels), self.maxima[index])
+        self.last_changes[index] = now
+        self.levels[index] = levels + change
+
+    def averages(self, now: Union[int, float]) -> np.ndarray:
+        """
+        :param now: Simulation time at the end
+        :return: Time-weighted averages of the levels after the warm-up, the levels are integrated up to `now`
+        """
+        self.change(np.s_[...], now, 0)
+        elapsed = now - gi.DURATION_WARM_UP
+        return self.integrals / elapsed if elapsed > 0 else np.zeros_like(self.integrals)
+
+
+class LockstepReplications:
+    """
+    Runs replications of a model in lockstep: in every step, each replication executes its next event, and the events
+    of all replications at the same component are computed together on NumPy arrays of shape (replications, ...). The
+    per-event Python overhead is thereby shared by all replications.
+
+    The model is built once per replication with the seed of the replication, so every replication draws from the same
+    component streams as the event simulation and gets the same results, up to floating point rounding and the order
+    of simultaneous events. Models with features beyond sources, FIFO servers, sinks and probabilistic routing over
+    direct connections are not supported, see `unsupported_feature`.
+    """
+
+    BLOCK_SIZE = 256
+    """Number of variates drawn at once per stream and replication"""
+
+    def __init__(self, builds: list[tuple[list, list, list]]) -> None:
+        """
+        :param builds: Per replication the sources, servers and sinks of the model built with its seed
+        """
+        self.number_of_replications = len(builds)
+        self.sources, self.servers, self.sinks = builds[0]
+        self.capacities = np.array([server.capacity for server in self.servers], dtype=int)
+        self.max_capacity = int(self.capacities.max()) if len(self.servers) else 1
+
+        self.routing_tables = {routing_object.name: routing_object.routing_table
+                               for routing_object in self.sources + self.servers}
+        self.destination_codes = {}
+        """Per routing object the component codes of its connections: server index or number of servers + sink index"""
+        for routing_object in self.sources + self.servers:
+            self.destination_codes[routing_object.name] = np.array(
+                [self.servers.index(connection.next_component) if connection.next_component in self.servers
+                 else len(self.servers) + self.sinks.index(connection.next_component)
+                 for connection in routing_object.routing_table.connections], dtype=int)
+
+        def buffer(draw_functions):
+            return VariateBuffer(draw_functions, LockstepReplications.BLOCK_SIZE)
+
+        self.creation_times = [buffer([lambda count, dwp=sources[s].creation_time_dwp: draw_values(dwp, count)
+                                       for sources, _, _ in builds]) for s in range(len(self.sources))]
+        self.processing_times = [buffer([lambda count, dwp=servers[v].processing_time_dwp: draw_values(dwp, count)
+                                         for _, servers, _ in builds]) for v in range(len(self.servers))]
+        self.routing_uniforms = {
+            routing_object.name: buffer([lambda count, stream=components[i].routing_random: draw_uniforms(stream, count)
+                                         for components in [sources + servers for sources, servers, _ in builds]])
+            for i, routing_object in enumerate(self.sources + self.servers)}
+
+    @classmethod
+    def from_model(cls, model: Callable, num_replications: int,
+                   antithetic: bool = False) -> Optional['LockstepReplications']:
+        """
+        Builds the model for every replication.
+
+        :param model: Model function
+        :param num_replications: Number of replications
+        :param antithetic: Whether the replications run in antithetic pairs, like in `replication`
+        :return: Lockstep replications or None if the model is not supported
+        """
+        builds = []
+        for r in range(num_replications):
+            seed, complement = (r // 2, r % 2 == 1) if antithetic else (r, None)
+            random.seed(seed)
+            # every replication is built in its own context, so the components do not pile up in one registry
+            with Model(seed, complement):
+                env = EventCalendar()
+                model(env)
+                sources, servers, sinks = find_components(env)
+                reason = unsupported_feature(env, sources, servers, sinks)
+                if reason is not None:
+                    logging.debug(f"Lockstep replications not applicable: {reason}")
+                    return None
+                for routing_object in sources + servers:
+                    routing_object._initialize_source() if routing_object in sources \
+                        else routing_object._initialize_server()
+            builds.append((sources, servers, sinks))
+        return cls(builds)
+
+    def run(self, until: Union[int, float]) -> list[tuple]:
+        """
+        Runs all replications until the given time.
+
+        :param until: Simulation time to stop at, like in the event simulation nothing happens at this time
+        :return: Per replication the entity, server, sink and source statistics like `calculate_statistics`
+        """
+        self._reset()
+        all_replications = np.arange(self.number_of_replications)
+        number_of_sources = len(self.sources)
+        for s in range(number_of_sources):
+            self.event_times[:, s] = self.creation_times[s].next(all_replications)
+
+        while True:
+            columns = self.event_times.argmin(axis=1)
+            times = self.event_times[all_replications, columns]
+            active = np.flatnonzero(times < until)
+            if not len(active):
+                break
+
+            # group the replications by the component of their next event
+            order = np.argsort(columns[active], kind='stable')
+            active, columns = active[order], columns[active][order]
+            event_columns, starts = np.unique(columns, return_index=True)
+            for column, replications in zip(event_columns, np.split(active, starts[1:])):
+                now = times[replications]
+                if column < number_of_sources:
+                    self._create_entities(column, replications, now)
+                else:
+                    server, unit = divmod(column - number_of_sources, self.max_capacity)
+                    self._finish_processing(server, unit, replications, now)
+
+        self.average_units_utilized = self.units_utilized.averages(until)
+        self.average_queue_lengths = self.queue_lengths.averages(until)
+        self.average_numbers_in_system = self.number_in_system.averages(until)
+        return [self._statistics(r, until) for r in range(self.number_of_replications)]
+
+    def _reset(self) -> None:
+        """Creates the state arrays of all replications."""
+        shape = (self.number_of_replications, len(self.servers))
+        units_shape = shape + (self.max_capacity,)
+        self.event_times = np.full((self.number_of_replications,
+                                    len(self.sources) + len(self.servers) * self.max_capacity), np.inf)
+        """Next creation time of every source followed by the end of processing of every server unit"""
+        self.unit_creation_times = np.zeros(units_shape)
+        self.unit_processing_times = np.zeros(units_shape)
+
+        self.queues = np.zeros(shape + (16, 2))
+        """Ring buffers of the creation and arrival times of the queued entities"""
+        self.queue_heads = np.zeros(shape, dtype=int)
+        self.queue_lengths = LevelStatistics(shape)
+
+        self.source_created = np.zeros((self.number_of_replications, len(self.sources)), dtype=int)
+        self.server_entered = np.zeros(shape, dtype=int)
+        self.server_exited = np.zeros(shape, dtype=int)
+        self.server_processing_times = np.zeros(shape)
+        self.units_utilized = LevelStatistics(shape)
+        self.server_left_queue = np.zeros(shape, dtype=int)
+        self.server_times_in_queue = np.zeros(shape)
+        self.server_max_times_in_queue = np.zeros(shape)
+
+        sinks_shape = (self.number_of_replications, len(self.sinks))
+        self.sink_processed = np.zeros(sinks_shape, dtype=int)
+        self.sink_entered = np.zeros(sinks_shape, dtype=int)
+        self.sink_times_in_system = np.zeros(sinks_shape)
+        self.sink_max_times_in_system = np.zeros(sinks_shape)
+        self.sink_min_times_in_system = np.full(sinks_shape, np.inf)
+
+        self.entities_created = np.zeros(self.number_of_replications, dtype=int)
+        self.entities_destroyed = np.zeros(self.number_of_replications, dtype=int)
+        self.entities_times_in_system = np.zeros(self.number_of_replications)
+        self.entities_max_times_in_system = np.zeros(self.number_of_replications)
+        self.entities_min_times_in_system = np.full(self.number_of_replications, np.inf)
+        self.number_in_system = LevelStatistics((self.number_of_replications,))
+
+    def _create_entities(self, source: int, replications: np.ndarray, now: np.ndarray) -> None:
+        """Creates an entity at a source in each replication and schedules the next creation."""
+        self.source_created[replications, source] += now >= gi.DURATION_WARM_UP
+        self.entities_created[replications] += 1
+        self.number_in_system.change(replications, now, 1)
+        self.event_times[replications, source] = now + self.creation_times[source].next(replications)
+        self._route(self.sources[source].name, replications, now, now)
+
+    def _route(self, name: str, replications: np.ndarray, now: np.ndarray, creation_times: np.ndarray) -> None:
+        """Routes an entity of a routing object to the next component in each replication."""
+        uniforms = self.routing_uniforms[name].next(replications)
+        destinations = self.destination_codes[name][self.routing_tables[name].sample_indices(uniforms)]
+        for destination in np.unique(destinations):
+            routed = destinations == destination
+            if destination < len(self.servers):
+                self._arrive_at_server(destination, replications[routed], now[routed], creation_times[routed])
+            else:
+                self._destroy_entities(destination - len(self.servers), replications[routed], now[routed],
+                                       creation_times[routed])
+
+    def _arrive_at_server(self, server: int, replications: np.ndarray, now: np.ndarray,
+                          creation_times: np.ndarray) -> None:
+        """Starts processing the arriving entities if a unit is free and nobody waits, otherwise queues them."""
+        self.server_entered[replications, server] += now >= gi.DURATION_WARM_UP
+        capacity = self.capacities[server]
+        units = np.isinf(self._unit_end_times(replications, server)[:, :capacity])
+        start = units.any(axis=1) & (self.queue_lengths.levels[replications, server] == 0)
+        self._start_processing(server, units[start].argmax(axis=1), replications[start], now[start],
+                               creation_times[start], now[start])
+        self._enqueue(server, replications[~start], now[~start], creation_times[~start])
+
+    def _unit_end_times(self, replications: np.ndarray, server: int) -> np.ndarray:
+        """End of processing of the units of a server, inf if a unit is free."""
+        first_column = len(self.sources) + server * self.max_capacity
+        return self.event_times[replications, first_column:first_column + self.max_capacity]
+
+    def _start_processing(self, server: int, units: np.ndarray, replications: np.ndarray, now: np.ndarray,
+                          creation_times: np.ndarray, arrival_times: np.ndarray) -> None:
+        """Starts processing an entity on a unit of a server in each replication."""
+        if not len(replications):
+            return
+        processing_times = self.processing_times[server].next(replications)
+        self.event_times[replications, len(self.sources) + server * self.max_capacity + units] = now + processing_times
+        self.unit_creation_times[replications, server, units] = creation_times
+        self.unit_processing_times[replications, server, units] = processing_times
+        self.units_utilized.change((replications, server), now, 1)
+
+        counted = now >= gi.DURATION_WARM_UP
+        replications, times_in_queue = replications[counted], (now - arrival_times)[counted]
+        self.server_left_queue[replications, server] += 1
+        self.server_times_in_queue[replications, server] += times_in_queue
+        self.server_max_times_in_queue[replications, server] = np.maximum(
+            self.server_max_times_in_queue[replications, server], times_in_queue)
+
+    def _finish_processing(self, server: int, unit: int, replications: np.ndarray, now: np.ndarray) -> None:
+        """Finishes processing on a unit of a server, routes the entity and starts processing the next queued one."""
+        creation_times = self.unit_creation_times[replications, server, unit]
+        self.units_utilized.change((replications, server), now, -1)
+
+        counted = now >= gi.DURATION_WARM_UP
+        counted_replications = replications[counted]
+        self.server_exited[counted_replications, server] += 1
+        self.server_processing_times[counted_replications, server] += \
+            self.unit_processing_times[counted_replications, server, unit]
+
+        self.event_times[replications, len(self.sources) + server * self.max_capacity + unit] = np.inf
+        self._route(self.servers[server].name, replications, now, creation_times)
+
+        waiting = (self.queue_lengths.levels[replications, server] > 0) & \
+            np.isinf(self.event_times[replications, len(self.sources) + server * self.max_capacity + unit])
+        replications, now = replications[waiting], now[waiting]
+        self._start_processing(server, np.full(len(replications), unit), replications, now,
+                               *self._dequeue(server, replications, now))
+
+    def _enqueue(self, server: int, replications: np.ndarray, now: np.ndarray, creation_times: np.ndarray) -> None:
+        """Appends the entities to the queue of a server in each replication."""
+        if not len(replications):
+            return
+        size = self.queues.shape[2]
+        if self.queue_lengths.levels[replications, server].max() >= size:
+            # unroll the ring buffers into buffers of double size
+            positions = (self.queue_heads[:, :, None] + np.arange(size)) % size
+            self.queues = np.concatenate((np.take_along_axis(self.queues, positions[..., None], axis=2),
+                                          np.zeros_like(self.queues)), axis=2)
+            self.queue_heads[:] = 0
+            size *= 2
+        positions = (self.queue_heads[replications, server] + self.queue_lengths.levels[replications, server]) % size
+        self.queues[replications, server, positions] = np.column_stack((creation_times, now))
+        self.queue_lengths.change((replications, server), now, 1)
+
+    def _dequeue(self, server: int, replications: np.ndarray, now: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Removes the first entity from the queue of a server in each replication.
+
+        :return: Creation times and queue arrival times of the entities
+        """
+        heads = self.queue_heads[replications, server]
+        creation_times, arrival_times = self.queues[replications, server, heads].T
+        self.queue_heads[replications, server] = (heads + 1) % self.queues.shape[2]
+        self.queue_lengths.change((replications, server), now, -1)
+        return creation_times, arrival_times
+
+    def _destroy_entities(self, sink: int, replications: np.ndarray, now: np.ndarray,
+                          creation_times: np.ndarray) -> None:
+        """Destroys an entity at a sink in each replication, see `Sink.handle_entity_arrival`."""
+        times_in_system = now - creation_times
+        self.sink_processed[replications, sink] += 1
+        self.number_in_system.change(replications, now, -1)
+
+        counted = now >= gi.DURATION_WARM_UP
+        counted_replications, counted_times = replications[counted], times_in_system[counted]
+        self.sink_entered[counted_replications, sink] += 1
+        self.sink_times_in_system[counted_replications, sink] += counted_times
+        self.sink_max_times_in_system[counted_replications, sink] = np.maximum(
+            self.sink_max_times_in_system[counted_replications, sink], counted_times)
+        self.sink_min_times_in_system[counted_replications, sink] = np.minimum(
+            self.sink_min_times_in_system[counted_replications, sink], counted_times)
+
+        # entities destroyed during the warm-up are not taken into account at all, see EntityStatistics
+        after_warm_up = now > gi.DURATION_WARM_UP
+        self.entities_created[replications[~after_warm_up]] -= 1
+        replications, times_in_system = replications[after_warm_up], times_in_system[after_warm_up]
+        self.entities_destroyed[replications] += 1
+        self.entities_times_in_system[replications] += times_in_system
+        self.entities_max_times_in_system[replications] = np.maximum(
+            self.entities_max_times_in_system[replications], times_in_system)
+        self.entities_min_times_in_system[replications] = np.minimum(
+            self.entities_min_times_in_system[replications], times_in_system)
+
+    def _statistics(self, r: int, now: Union[int, float]) -> tuple:
+        """
+        :param r: Replication
+        :param now: Simulation time at the end
+        :return: Entity, server, sink and source statistics of a replication like `calculate_statistics`
+        """
+        number_destroyed = int(self.entities_destroyed[r])
+        number_created = int(self.entities_created[r])
+        entity_stats = {
+            'NumberInSystem': number_created,
+            'AvgTimeInSystem': float(self.entities_times_in_system[r]) / number_destroyed if number_destroyed else 0,
+            'MaxTimeInSystem': float(self.entities_max_times_in_system[r]) if number_destroyed else 0,
+            'MinTimeInSystem': float(self.entities_min_times_in_system[r]) if number_destroyed else 0,
+            'NumberCreated': number_created,
+            'NumberDestroyed': number_destroyed,
+            'AvgNumberInSystem': float(self.average_numbers_in_system[r]),
+            'MaxNumberInSystem': int(self.number_in_system.maxima[r])
+        }
+
+        server_stats = []
+        for v, server in enumerate(self.servers):
+            exited = int(self.server_exited[r, v])
+            left_queue = int(self.server_left_queue[r, v])
+            total_processing_time = float(self.server_processing_times[r, v])
+            after_warm_up = now > gi.DURATION_WARM_UP
+            server_stats.append({
+                'Server': server.name,
+                'ScheduledUtilization': total_processing_time / (now - gi.DURATION_WARM_UP) * 100
+                if after_warm_up else 0,
+                'UnitsUtilized': float(self.average_units_utilized[r, v]),
+                'AvgTimeProcessing': total_processing_time / exited if after_warm_up and exited else 0,
+                'TotalTimeProcessing': total_processing_time,
+                'NumberEntered': int(self.server_entered[r, v]),
+                'NumberExited': exited,
+                'NumberDowntimes': 0,
+                'TotalDowntime': 0,
+                'AvgNumberInQueue': float(self.average_queue_lengths[r, v]),
+                'MaxNumberInQueue': int(self.queue_lengths.maxima[r, v]),
+                'AvgTimeInQueue': float(self.server_times_in_queue[r, v]) / left_queue if left_queue else 0,
+                'MaxTimeInQueue': float(self.server_max_times_in_queue[r, v])
+            })
+
+        sink_stats = {}
+        for k, sink in enumerate(self.sinks):
+            processed = int(self.sink_processed[r, k])
+            sink_stats[sink.name] = {
+                'AvgTimeInSystem': float(self.sink_times_in_system[r, k]) / processed if processed else 0,
+                'MaxTimeInSystem': float(self.sink_max_times_in_system[r, k]),
+                'MinTimeInSystem': float(self.sink_min_times_in_system[r, k]) if processed else None,
+                'NumberEntered': int(self.sink_entered[r, k]),
+                'NumTimesProcessed_Avg': None,
+                'NumTimesProcessed_Max': None,
+                'NumTimesProcessed_Min': None,
+            }
+
+        source_stats = {source.name: {'NumberCreated': int(self.source_created[r, s]), 'NumberExited': 0}
+                        for s, source in enumerate(self.sources)}
+
+        return entity_stats, server_stats, sink_stats, source_stats
@@ -0,0 +1,101 @@
+import random
+import zlib
+from typing import Callable, Optional, Tuple, Union
+import numpy as np
+from src.util.distribution_stream import DistributionStream
+from src.util.global_imports import RANDOM_SEED
+
+
+class AntitheticRandom(random.Random):
+    """Random instance which returns the complementary uniforms 1 - U of the same seed."""
+
+    def random(self) -> float:
+        uniform = super().random()
+        # stays in [0, 1) like random.random
+        return 1.0 - uniform if uniform else 0.0
+
+
+class RandomStreams:
+    """
+    Provides every component with its own random number streams, derived deterministically from the replication seed
+    with a NumPy SeedSequence. The children are spawned with a spawn key derived from the component name and the
+    purpose of the stream (instead of the creation order), so adding a component to a model does not change the
+    random numbers any other component sees. This gives common random numbers across scenarios.
+    """
+
+    seed_sequence: np.random.SeedSequence = np.random.SeedSequence(RANDOM_SEED)
+    """Root seed sequence of the current replication"""
+    antithetic: Optional[bool] = None
+    """None for independent replications, False and True for the first and second run of an antithetic pair"""
+
+    @classmethod
+    def seed(cls, seed: int, antithetic: Optional[bool] = None) -> None:
+        """
+        Sets the replication seed. Streams created afterwards are derived from it.
+
+        :param seed: Seed of the replication
+        :param antithetic: None for independent replications. False for the first run of an antithetic pair and
+            True for the second run, whose streams use the complementary uniforms 1 - U
+        """
+        cls.seed_sequence = np.random.SeedSequence(seed)
+        cls.antithetic = antithetic
+
+    @classmethod
+    def spawn(cls, component_name: str, purpose: str) -> np.random.SeedSequence:
+        """
+        Spawns the seed sequence of a stream.
+
+        :param component_name: Name of the component using the stream
+        :param purpose: Purpose of the stream within the component, e.g., 'processing'
+        :return: Child seed sequence
+        """
+        spawn_key = zlib.crc32(f"{component_name}/{purpose}".encode())
+        return np.random.SeedSequence(cls.seed_sequence.entropy,
+                                      spawn_key=cls.seed_sequence.spawn_key + (spawn_key,))
+
+    @classmethod
+    def random(cls, component_name: str, purpose: str) -> random.Random:
+        """
+        :param component_name: Name of the component using the stream
+        :param purpose: Purpose of the stream within the component
+        :return: Random instance of the stream, offering the same distributions as the random module
+        """
+        state = cls.spawn(component_name, purpose).generate_state(4, np.uint32)
+        random_class = AntitheticRandom if cls.antithetic else random.Random
+        return random_class(int.from_bytes(state.tobytes(), 'little'))
+
+    @classmethod
+    def generator(cls, component_name: str, purpose: str) -> np.random.Generator:
+        """
+        :param component_name: Name of the component using the stream
+        :param purpose: Purpose of the stream within the component
+        :return: NumPy Generator of the stream
+        """
+        return np.random.default_rng(cls.spawn(component_name, purpose))
+
+    @classmethod
+    def bind(cls, dwp: Union[Tuple[Callable[..., float]], None], component_name: str, purpose: str):
+        """
+        Binds a distribution with parameters to the stream of a component. Distributions of the random module are
+        replaced by the same distribution of the component's Random instance and distribution streams get the
+        component's NumPy Generator. Any other distribution is returned unchanged and keeps using its own source of
+        randomness, so it is not complemented in antithetic runs.
+
+        :param dwp: Tuple of distribution function and parameters
+        :param component_name: Name of the component using the stream
+        :param purpose: Purpose of the stream within the component
+        :return: Tuple of distribution function and parameters using the component's stream
+        """
+        if not isinstance(dwp, tuple) or not dwp:
+            return dwp
+
+        distribution, parameters = dwp[0], dwp[1:]
+        if isinstance(distribution, DistributionStream):
+            stream = DistributionStream(distribution.distribution, *distribution.parameters,
+                                        block_size=distribution.block_size,
+                                        generator=cls.generator(component_name, purpose),
+                                        complement=cls.antithetic)
+            return (stream,) + parameters
+        if getattr(distribution, '__self__', None) is random._inst:
+            return (getattr(cls.random(component_name, purpose), distribution.__name__),) + parameters
+        return dwp
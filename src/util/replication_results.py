@@ -0,0 +1,308 @@
+import math
+import warnings
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+import numpy as np
+import pandas as pd
+from src.core.server import Server
+from src.core.sink import Sink
+from src.core.source import Source
+
+
+class StatLayout:
+    """
+    Fixed order of the statistics of a model, one column per (Type, Name, Stat) of the pivot table. The statistics of
+    a replication, as returned by `calculate_statistics`, are written as one row of floats with NaN for missing values,
+    so the results of all replications form a replication × statistic array.
+    """
+
+    def __init__(self, entity_stat_names: list[str], servers: list[str], server_stat_names: list[str],
+                 sinks: list[str], sink_stat_names: list[str], sources: list[str],
+                 source_stat_names: list[str]) -> None:
+        """
+        :param servers: Names of the servers, in the same way the sinks and sources
+        """
+        self.entity_stat_names = entity_stat_names
+        self.server_stat_names = server_stat_names
+        self.sink_stat_names = sink_stat_names
+        self.source_stat_names = source_stat_names
+        self.keys = ([('Entity', 'Entity', stat) for stat in entity_stat_names] +
+                     [('Server', server, stat) for server in servers for stat in server_stat_names] +
+                     [('Sink', sink, stat) for sink in sinks for stat in sink_stat_names] +
+                     [('Source', source, stat) for source in sources for stat in source_stat_names])
+        """(Type, Name, Stat) of every column"""
+        self.servers = servers
+        self.sinks = sinks
+        self.sources = sources
+
+    @classmethod
+    def from_result(cls, result: tuple, entity_stat_names: list[str], server_stat_names: list[str],
+                    sink_stat_names: list[str], source_stat_names: list[str]) -> 'StatLayout':
+        """
+        :param result: Entity, server, sink and source statistics of a replication like returned by
+            `calculate_statistics`
+        :return: Layout of the statistics of the components of the replication
+        """
+        _, server_stats, sink_stats, source_stats = result
+        return cls(entity_stat_names, [stats['Server'] for stats in server_stats], server_stat_names,
+                   list(sink_stats), sink_stat_names, list(source_stats), source_stat_names)
+
+    @classmethod
+    def from_components(cls, entity_stat_names: list[str], server_stat_names: list[str], sink_stat_names: list[str],
+                        source_stat_names: list[str]) -> 'StatLayout':
+        """
+        :return: Layout of the statistics of the components of the active model context
+        """
+        return cls(entity_stat_names, [server.name for server in Server.servers], server_stat_names,
+                   [sink.name for sink in Sink.sinks], sink_stat_names,
+                   [source.name for source in Source.sources], source_stat_names)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def write(self, row: np.ndarray, result: tuple) -> None:
+        """
+        Writes the statistics of a replication into a row.
+
+        :param row: Row of the replication
+        :param result: Entity, server, sink and source statistics like returned by `calculate_statistics`
+        """
+        entity_stats, server_stats, sink_stats, source_stats = result
+        self.write_components(row, entity_stats, {stat['Server']: stat for stat in server_stats}, sink_stats,
+                              source_stats)
+
+    def write_components(self, row: np.ndarray, entity_stats: dict, server_stats: dict, sink_stats: dict,
+                         source_stats: dict) -> None:
+        """
+        Writes the statistics of a replication into a row.
+
+        :param row: Row of the replication
+        :param entity_stats: Entity statistics by statistic name
+        :param server_stats: Statistics by statistic name per server name, in the same way the sinks and sources
+        """
+        try:
+            values = ([entity_stats[stat] for stat in self.entity_stat_names] +
+                      [server_stats[server][stat] for server in self.servers for stat in self.server_stat_names] +
+                      [sink_stats[sink][stat] for sink in self.sinks for stat in self.sink_stat_names] +
+                      [source_stats[source][stat] for source in self.sources for stat in self.source_stat_names])
+        except KeyError as e:
+            raise ValueError(f"The replication has no statistic {e}, every replication needs the components of the "
+                             f"layout") from e
+        row[:] = [math.nan if value is None else value for value in values]
+
+    def pivot(self, values: np.ndarray, antithetic: bool = False) -> pd.DataFrame:
+        """
+        Aggregates the statistics of the replications like `create_pivot`.
+
+        :param values: Replication × statistic array, NaN for missing values
+        :param antithetic: Whether consecutive replications form antithetic pairs, the half-width is then computed
+            from the pair means
+        :return: Pivot table with average, minimum, maximum and half-width per statistic
+        """
+        aggregator = ReplicationAggregator(self, antithetic)
+        aggregator.add_rows(values)
+        return aggregator.pivot()
+
+
+class StatAccumulator:
+    """
+    Running count, mean, sum of squared deviations from the mean (M2), minimum and maximum of every statistic, updated
+    with one replication at a time (Welford) or merged with the accumulator of a block of replications (Chan et al.),
+    so the memory does not depend on the number of replications. Missing values (NaN) are skipped.
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        :param size: Number of statistics
+        """
+        self.count = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.minimum = np.full(size, math.inf)
+        self.maximum = np.full(size, -math.inf)
+
+    def update(self, row: np.ndarray) -> None:
+        """
+        :param row: Statistics of a replication
+        """
+        valid = ~np.isnan(row)
+        self.count += valid
+        delta = np.where(valid, row - self.mean, 0)
+        self.mean += delta / np.maximum(self.count, 1)
+        self.m2 += np.where(valid, delta * (row - self.mean), 0)
+        self.minimum = np.fmin(self.minimum, row)
+        self.maximum = np.fmax(self.maximum, row)
+
+    def update_many(self, rows: np.ndarray) -> None:
+        """
+        :param rows: Statistics of a block of replications, one row per replication
+        """
+        block = StatAccumulator(rows.shape[1])
+        # one contiguous row per statistic, so every reduction runs over contiguous memory
+        columns = np.ascontiguousarray(rows.T)
+        with warnings.catch_warnings():
+            # statistics without any value in the block yield NaN, their count is 0
+            warnings.simplefilter('ignore', RuntimeWarning)
+            block.count = np.sum(~np.isnan(columns), axis=1).astype(float)
+            block.mean = np.nan_to_num(np.nanmean(columns, axis=1))
+            block.m2 = np.nansum((columns - block.mean[:, None]) ** 2, axis=1)
+            block.minimum = np.fmin(block.minimum, np.nanmin(columns, axis=1))
+            block.maximum = np.fmax(block.maximum, np.nanmax(columns, axis=1))
+        self.merge(block)
+
+    def merge(self, other: 'StatAccumulator') -> None:
+        """
+        :param other: Accumulator of other replications of the same statistics
+        """
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        weight = np.divide(other.count, count, out=np.zeros_like(count), where=count > 0)
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * weight
+        self.count = count
+        self.minimum = np.fmin(self.minimum, other.minimum)
+        self.maximum = np.fmax(self.maximum, other.maximum)
+
+    def half_width(self) -> np.ndarray:
+        """
+        :return: Half-width of the 95 % confidence interval of the mean, NaN without values
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 1.96 * np.sqrt(self.m2 / self.count) / np.sqrt(self.count)
+
+
+class ReplicationAggregator:
+    """
+    Aggregates the statistics of the replications of a `StatLayout` in a single pass, as each replication completes,
+    into the pivot table of `create_pivot`. With antithetic replications, the first run of a pair is kept until its
+    partner completes, and the pair means are accumulated separately for the average and half-width.
+    """
+
+    def __init__(self, layout: StatLayout, antithetic: bool = False) -> None:
+        """
+        :param layout: Layout of the statistics
+        :param antithetic: Whether consecutive replications form antithetic pairs
+        """
+        self.layout = layout
+        self.values = StatAccumulator(len(layout))
+        self.pair_means = StatAccumulator(len(layout)) if antithetic else None
+        self.pending: Optional[np.ndarray] = None
+        """First run of the current antithetic pair"""
+        self.row = np.empty(len(layout))
+        self.number_of_replications = 0
+
+    def add(self, result: tuple) -> None:
+        """
+        :param result: Statistics of the next replication like returned by `calculate_statistics`
+        """
+        self.layout.write(self.row, result)
+        self.add_row(self.row)
+
+    def add_components(self, entity_stats: dict, server_stats: dict, sink_stats: dict, source_stats: dict) -> None:
+        """
+        Adds the next replication, see `StatLayout.write_components`.
+        """
+        self.layout.write_components(self.row, entity_stats, server_stats, sink_stats, source_stats)
+        self.add_row(self.row)
+
+    def add_row(self, row: np.ndarray) -> None:
+        """
+        :param row: Statistics of the next replication in the order of the layout
+        """
+        self.values.update(row)
+        self.number_of_replications += 1
+        if self.pair_means is not None:
+            if self.pending is None:
+                self.pending = row.copy()
+            else:
+                self.pair_means.update((self.pending + row) / 2)
+                self.pending = None
+
+    def add_rows(self, rows: np.ndarray) -> None:
+        """
+        :param rows: Statistics of the next replications, one row per replication
+        """
+        self.values.update_many(rows)
+        self.number_of_replications += len(rows)
+        if self.pair_means is not None:
+            if self.pending is not None:
+                rows = np.vstack([self.pending, rows])
+                self.pending = None
+            if len(rows) % 2:
+                self.pending = rows[-1].copy()
+                rows = rows[:-1]
+            self.pair_means.update_many((rows[0::2] + rows[1::2]) / 2)
+
+    def pivot(self) -> pd.DataFrame:
+        """
+        :return: Pivot table with average, minimum, maximum and half-width per statistic of the replications so far
+        """
+        values = self.values
+        has_values = values.count > 0
+        average = np.where(has_values, values.mean, np.nan)
+        half_width = values.half_width()
+        if self.pair_means is not None:
+            # pairs with a missing value are left out of the half-width
+            has_pairs = self.pair_means.count > 0
+            average = np.where(has_pairs, self.pair_means.mean, average)
+            half_width = self.pair_means.half_width()
+
+        index = pd.MultiIndex.from_tuples(self.layout.keys, names=['Type', 'Name', 'Stat'])
+        pivot_table = pd.DataFrame({'Average': average,
+                                    'Minimum': np.where(has_values, values.minimum, np.nan),
+                                    'Maximum': np.where(has_values, values.maximum, np.nan),
+                                    'Half-Width': half_width}, index=index)
+        # rounded like the values of `create_pivot`
+        pivot_table = pivot_table.map(lambda value: round(value, 4))
+        return pivot_table.dropna(how='all').sort_index()
+
+
+class SharedResults:
+    """
+    Replication × statistic array of a `StatLayout` in shared memory. The workers of the pool write the statistics of
+    their replications directly into it, instead of returning them, so nothing is pickled back to the parent. Pickling
+    the object only passes the name of the shared memory, which the workers attach to. The rows form a window of
+    consecutive replications starting at `first_replication`, so the memory does not grow with the number of
+    replications.
+    """
+    window: int = 4096
+    """Maximum number of rows of the shared memory of `run_replications`"""
+
+    def __init__(self, layout: StatLayout, num_replications: int, name: Optional[str] = None,
+                 first_replication: int = 0) -> None:
+        """
+        :param layout: Layout of the statistics
+        :param num_replications: Number of rows
+        :param name: Name of the shared memory to attach to, None to create it
+        :param first_replication: Index of the replication of the first row
+        """
+        self.layout = layout
+        self.num_replications = num_replications
+        self.first_replication = first_replication
+        shape = (num_replications, len(layout))
+        # the workers share the resource tracker of the parent, so attaching does not track the memory a second time
+        self.shared_memory = SharedMemory(name=name, create=name is None, size=max(1, math.prod(shape)) * 8)
+        self.values = np.ndarray(shape, dtype=float, buffer=self.shared_memory.buf)
+        """Statistics of each replication, NaN for missing values and replications not run"""
+        if name is None:
+            self.values.fill(math.nan)
+
+    def __reduce__(self) -> tuple:
+        return SharedResults, (self.layout, self.num_replications, self.shared_memory.name, self.first_replication)
+
+    def write(self, r: int, result: tuple) -> None:
+        """
+        :param r: Index of the replication, within the window of the rows
+        :param result: Statistics of the replication like returned by `calculate_statistics`
+        """
+        self.layout.write(self.values[r - self.first_replication], result)
+
+    def close(self) -> None:
+        """Detaches from the shared memory, the values are no longer accessible."""
+        self.values = None
+        self.shared_memory.close()
+
+    def unlink(self) -> None:
+        """Detaches from and frees the shared memory, called by the creating process when all workers are done."""
+        self.close()
+        self.shared_memory.unlink()
@@ -0,0 +1,97 @@
+import math
+from typing import Any, Optional, Union
+import numpy as np
+import pandas as pd
+from src.util.helper import round_value
+
+
+class SimulationResult:
+    """
+    Statistics of a single run of `run_simulation`, one rounded value per (Type, Name, Stat) in a flat dictionary.
+    Single statistics are read directly, e.g., `result['Server', 'Server1', 'NumberExited']`, the pandas pivot table
+    is only built when needed, see `to_pivot`. Other attributes, e.g., `loc` and `at`, are the ones of the pivot
+    table, so the result can be used like the pivot table itself.
+    """
+
+    def __init__(self, statistics: dict[tuple, Union[int, float]]) -> None:
+        """
+        :param statistics: Value per (Type, Name, Stat), missing values are left out
+        """
+        self.statistics = statistics
+        self._pivot_table: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def from_statistics(cls, entity_stats: dict, server_stats: list[dict], sink_stats: dict,
+                        source_stats: dict) -> 'SimulationResult':
+        """
+        :param entity_stats: Entity, server, sink and source statistics like returned by `calculate_statistics`
+        :return: Result of the run
+        """
+        statistics = {}
+        for key, value in entity_stats.items():
+            statistics['Entity', 'Entity', key] = value
+        for stats in server_stats:
+            for key, value in stats.items():
+                if key != 'Server':
+                    statistics['Server', stats['Server'], key] = value
+        for component_type, component_stats in (('Sink', sink_stats), ('Source', source_stats)):
+            for name, stats in component_stats.items():
+                for key, value in stats.items():
+                    statistics[component_type, name, key] = value
+        # rounded and without missing values like the pivot table
+        return cls({key: round_value(value) for key, value in statistics.items()
+                    if value is not None and not (isinstance(value, float) and math.isnan(value))})
+
+    def __getitem__(self, key: Union[tuple, Any]) -> Any:
+        """
+        :param key: (Type, Name, Stat) of a statistic, other keys select from the pivot table, e.g., 'Value'
+        :return: Value of the statistic
+        """
+        if isinstance(key, tuple) and len(key) == 3:
+            return self.statistics[key]
+        return self.to_pivot()[key]
+
+    def get(self, component_type: str, name: str, stat: str, default: Any = None) -> Any:
+        """
+        :param component_type: 'Entity', 'Server', 'Sink' or 'Source'
+        :param name: Name of the component, 'Entity' for the entity statistics
+        :param stat: Name of the statistic
+        :param default: Value if the run has no such statistic
+        :return: Value of the statistic
+        """
+        return self.statistics.get((component_type, name, stat), default)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self.statistics
+
+    def __len__(self) -> int:
+        return len(self.statistics)
+
+    def to_pivot(self) -> pd.DataFrame:
+        """
+        :return: Pivot table with the value per (Type, Name, Stat), built on the first call
+        """
+        if self._pivot_table is None:
+            index = pd.MultiIndex.from_tuples(list(self.statistics), names=['Type', 'Name', 'Stat'])
+            self._pivot_table = pd.DataFrame({'Value': np.array(list(self.statistics.values()), dtype=float)},
+                                             index=index).sort_index()
+        return self._pivot_table
+
+    def equals(self, other: Union['SimulationResult', pd.DataFrame]) -> bool:
+        """
+        :param other: Result or pivot table of another run
+        :return: True if both runs have the same statistics
+        """
+        return self.to_pivot().equals(other.to_pivot() if isinstance(other, SimulationResult) else other)
+
+    def __getattr__(self, name: str) -> Any:
+        # called for the attributes the result does not have itself, they are the ones of the pivot table
+        if name.startswith('__') or name in ('statistics', '_pivot_table'):
+            raise AttributeError(name)
+        return getattr(self.to_pivot(), name)
+
+    def __str__(self) -> str:
+        return str(self.to_pivot())
+
+    def __repr__(self) -> str:
+        return f"SimulationResult({len(self.statistics)} statistics)"
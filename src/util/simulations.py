@@ -15,87 +15,111 @@ import src.util.global_imports as gi
 from src.database.database_connection import save_to_db
 
 from src.core.entity import EntityManager
+from src.core.event_calendar import EventCalendar
+from src.core.model import Model
 from src.core.server import Server
 from src.core.sink import Sink
 from src.core.source import Source
 from src.util.global_imports import RANDOM_SEED, set_duration_warm_up
-from src.util.helper import round_value
+from src.util.lindley import run_lindley_fast_path
+from src.util.batch_means import autocorrelated_statistics
+from src.util.columnar_export import LifecycleExport
+from src.util.event_trace import EventTrace
+from src.util.lockstep import LockstepReplications
+from src.util.replication_results import ReplicationAggregator, SharedResults, StatLayout
+from src.util.simulation_result import SimulationResult
+from src.util.warm_up import MserWarmUp
+from src.util.worker_pool import WorkerPool
 from src.util.flask.runtime_prediction import send_progress_to_server
 
 global seconds_previous_computations
 
+# names of the statistics of the entities, servers, sinks, and sources in the pivot tables of several runs
+ENTITY_STAT_NAMES = ['AvgTimeInSystem', 'MaxTimeInSystem', 'MinTimeInSystem', 'NumberCreated', 'NumberDestroyed',
+                     'NumberInSystem', 'AvgNumberInSystem', 'MaxNumberInSystem']
+SERVER_STAT_NAMES = ['ScheduledUtilization', 'UnitsUtilized', 'AvgTimeProcessing', 'TotalTimeProcessing',
+                     'NumberEntered', 'NumberExited', 'TotalDowntime', 'NumberDowntimes', 'AvgNumberInQueue',
+                     'MaxNumberInQueue', 'AvgTimeInQueue', 'MaxTimeInQueue']
+SINK_STAT_NAMES = ['AvgTimeInSystem', 'MaxTimeInSystem', 'MinTimeInSystem', 'NumberEntered']
+SOURCE_STAT_NAMES = ['NumberCreated', 'NumberExited']
 
-def run_simulation(model: Callable, minutes: Union[int, float], warm_up: Union[int, float] = None,
-                   store_pivot_in_file: str = None) -> pd.DataFrame:
+
+def run_simulation(model: Callable, minutes: Union[int, float], warm_up: Union[int, float, str] = None,
+                   store_pivot_in_file: str = None, event_calendar: bool = False,
+                   fast_path: bool = False, event_trace: EventTrace = None,
+                   lifecycle_export: LifecycleExport = None, log_pivot: bool = True) -> SimulationResult:
     """
     Run a simulation using the specified model for the given number of minutes.
 
     :param model (Callable): The simulation model function.
     :param minutes (int): The number of minutes to run the simulation.
-
-    :return pivot_table (DataFrame): The pivot
+    :param warm_up (Union[int, float, str]): The warm-up duration, or 'mser' to detect it online with MSER-5, see
+        `MserWarmUp`. The detected warm-up is reported as the entity statistic 'WarmUp', the warm-up from before the
+        run is set again afterwards.
+    :param event_calendar (bool): Whether to run the model on the lightweight event calendar instead of SimPy.
+    :param fast_path (bool): Whether to compute feed-forward networks of FIFO single servers with the vectorized
+        Lindley recursion instead of running events. Other models run on the event calendar.
+    :param event_trace (EventTrace): Trace to record the events of the run into. With the TRACE log level and no
+        trace given, the events are recorded and written to the log after the run.
+    :param lifecycle_export (LifecycleExport): Export to stream the entity lifecycles into, closed after the run.
+    :param log_pivot (bool): Whether to log the pivot table at INFO level, it is only built if the level is enabled.
+
+    :return result (SimulationResult): The statistics of the run, with scalar access by (Type, Name, Stat) and the
+        pivot table on demand, see `SimulationResult.to_pivot`
     """
 
-    if warm_up is not None:
+    warm_up_detector = MserWarmUp(minutes) if warm_up == 'mser' else None
+    if warm_up is not None and warm_up_detector is None:
         set_duration_warm_up(warm_up)
 
     random.seed(RANDOM_SEED)
-    env = simpy.Environment()
+    # the context stays active after the run, so the components can be inspected until the next run
+    Model(RANDOM_SEED).activate()
+    env = EventCalendar() if event_calendar or fast_path else simpy.Environment()
     model(env)
-    env.run(until=minutes)
-
-    # Get the statistics
-    entity_stats, server_stats, sink_stats, source_stats = calculate_statistics(env)
-
-    # Structure the data for the DataFrame
-    data = []
-
-    # Function to round the values
-
-    # Entity Stats
-    for key, value in entity_stats.items():
-        data.append({'Type': 'Entity', 'Name': 'Entity', 'Stat': key, 'Value': round_value(value)})
-
-    # Server Stats
-    for stat in server_stats:
-        for key, value in stat.items():
-            if key != 'Server':
-                data.append({'Type': 'Server', 'Name': stat['Server'], 'Stat': key, 'Value': round_value(value)})
-
-    # Sink Stats
-    for sink_name, stats in sink_stats.items():
-        for key, value in stats.items():
-            data.append({'Type': 'Sink', 'Name': sink_name, 'Stat': key, 'Value': round_value(value)})
-
-    # Source Stats
-    for source_name, stats in source_stats.items():
-        for key, value in stats.items():
-            data.append({'Type': 'Source', 'Name': source_name, 'Stat': key, 'Value': round_value(value)})
-
-    # Create DataFrame
-    df = pd.DataFrame(data)
-
-    # Create Pivot Table
-    pivot_table = df.pivot_table(index=['Type', 'Name', 'Stat'], values='Value', aggfunc='mean')
-
-    # Print Pivot Table
-    logging.info(pivot_table)
+    log_trace = event_trace is None and logging.root.level <= logging.TRACE
+    if log_trace:
+        # full buffers are logged during the run, so no event is lost
+        event_trace = EventTrace(log_records=True)
+    if event_trace is not None:
+        event_trace.start()
+    if lifecycle_export is not None:
+        lifecycle_export.start()
+    if warm_up_detector is not None:
+        warm_up_detector.start()
+    try:
+        try:
+            if not (fast_path and run_lindley_fast_path(env, minutes)):
+                env.run(until=minutes)
+        finally:
+            EventTrace.stop()
+            if lifecycle_export is not None:
+                lifecycle_export.close()
+        if log_trace:
+            event_trace.log()
+        elif event_trace is not None and event_trace.directory is not None:
+            event_trace.flush()
+
+        # Get the statistics, with the detected warm-up
+        if warm_up_detector is not None:
+            warm_up_detector.finish(minutes)
+        entity_stats, server_stats, sink_stats, source_stats = calculate_statistics(env)
+    finally:
+        if warm_up_detector is not None:
+            warm_up_detector.restore()
+    if warm_up_detector is not None:
+        entity_stats['WarmUp'] = warm_up_detector.warm_up
+
+    # the pivot table is only built if it is logged, stored or used
+    result = SimulationResult.from_statistics(entity_stats, server_stats, sink_stats, source_stats)
+    if log_pivot:
+        logging.info(result)
 
     # Optionally save to CSV
     if store_pivot_in_file:
-        pivot_table.to_csv(store_pivot_in_file)
-
-    return pivot_table
+        result.to_pivot().to_csv(store_pivot_in_file)
 
-
-def calculate_units_utilized(units_utilized_over_time, capacity, time):
-    total_utilization = 0
-    total_time = 0
-    for start, end, units in units_utilized_over_time:
-        total_utilization += (end - start) * min(units, capacity)
-        total_time += (end - start)
-    average_units_utilized = total_utilization / total_time if total_time > 0 else 0
-    return average_units_utilized
+    return result
 
 
 def calculate_statistics(env) -> Tuple:
@@ -107,44 +131,12 @@ def calculate_statistics(env) -> Tuple:
     :return Tuple[Dict, List[Dict], Dict, Dict]: A tuple containing dictionaries for entity, server, sink,
      and source statistics.
     """
-    # Calculate entity statistics
-    all_entities_with_warm_up_time = EntityManager.entities
-    all_entities = []
-
-    for objekt in all_entities_with_warm_up_time:
-        if objekt.destruction_time is not None:
-            if objekt.destruction_time > gi.DURATION_WARM_UP:
-                all_entities.append(objekt)
-            else:
-                pass
-        else:
-            all_entities.append(objekt)
-
-    times_in_system = [entity.destruction_time - entity.creation_time
-                       for entity in all_entities if entity.destruction_time]
+    # Calculate entity statistics, collected online during the run
+    entity_stats = EntityManager.statistics.calculate_statistics(env.now)
 
-    logging.debug(f"Entities not processed: {len(all_entities)} - {len(times_in_system)} "
-                  f"= {len(all_entities) - len(times_in_system)} "
-                  f"({len(times_in_system) / len(all_entities)} %)")
+    logging.debug(f"Entities not processed: {entity_stats['NumberCreated']} - {entity_stats['NumberDestroyed']} "
+                  f"= {entity_stats['NumberCreated'] - entity_stats['NumberDestroyed']}")
 
-    if times_in_system:
-        avg_time_in_system_pivot_table = sum(times_in_system) / len(times_in_system)
-        max_time_in_system_pivot_table = max(times_in_system)
-        min_time_in_system_pivot_table = min(times_in_system)
-    else:
-        avg_time_in_system_pivot_table = max_time_in_system_pivot_table = min_time_in_system_pivot_table = 0
-
-    number_created_pivot_table = len(all_entities)
-    number_destroyed_pivot_table = sum(entity.destruction_time is not None for entity in all_entities)
-
-    entity_stats = {
-        'NumberInSystem': len(all_entities),
-        'AvgTimeInSystem': avg_time_in_system_pivot_table,
-        'MaxTimeInSystem': max_time_in_system_pivot_table,
-        'MinTimeInSystem': min_time_in_system_pivot_table,
-        'NumberCreated': number_created_pivot_table,
-        'NumberDestroyed': number_destroyed_pivot_table
-    }
     # Calculate server statistics
     server_stats = []
     for server in Server.servers:
@@ -152,15 +144,24 @@ def calculate_statistics(env) -> Tuple:
         scheduled_utilization_pivot_table = 0
         avg_time_processing_pivot_table = 0
         if env.now > gi.DURATION_WARM_UP:
-            scheduled_utilization_pivot_table = (
-                    (server.total_processing_time_pivot_table / current_simulation_time) * 100) \
-                if current_simulation_time > 0 else 0
+            if server.week:
+                # utilization of the capacity available in the shifts
+                server.update_scheduled_capacity_time()
+                scheduled_utilization_pivot_table = (
+                        (server.total_processing_time_pivot_table / server.scheduled_capacity_time) * 100) \
+                    if server.scheduled_capacity_time > 0 else 0
+            else:
+                # of the time after the warm-up, in which the processing time is collected
+                time_after_warm_up = current_simulation_time - gi.DURATION_WARM_UP
+                scheduled_utilization_pivot_table = (
+                        (server.total_processing_time_pivot_table / time_after_warm_up) * 100) \
+                    if time_after_warm_up > 0 else 0
             avg_time_processing_pivot_table = (
                 server.total_processing_time_pivot_table / server.entities_processed
                 if server.entities_processed > 0 else 0)
 
-        # Calculate Units Utilized
-        units_utilized_pivot_table = calculate_units_utilized(server.units_utilized_over_time, server.capacity, env.now)
+        # Calculate Units Utilized, time-weighted average of the busy units
+        units_utilized_pivot_table = server.units_utilized.average(env.now)
 
         server_stats.append({
             'Server': server.name,
@@ -171,7 +172,12 @@ def calculate_statistics(env) -> Tuple:
             'NumberEntered': server.number_entered_pivot_table,
             'NumberExited': server.number_exited_pivot_table,
             'NumberDowntimes': server.number_downtimes_pivot_table,
-            'TotalDowntime': server.total_downtime_pivot_table
+            'TotalDowntime': server.total_downtime_pivot_table,
+            'AvgNumberInQueue': server.queue_length.average(env.now),
+            'MaxNumberInQueue': server.queue_length.maximum,
+            'AvgTimeInQueue': server.total_time_in_queue / server.number_left_queue
+            if server.number_left_queue > 0 else 0,
+            'MaxTimeInQueue': server.max_time_in_queue
         })
 
     # Calculate sink statistics
@@ -209,7 +215,8 @@ def calculate_statistics(env) -> Tuple:
     return entity_stats, server_stats, sink_stats, source_stats
 
 
-def replication(env_setup_func, calculate_stats_func, minutes, r) -> pd.DataFrame:
+def replication(env_setup_func, calculate_stats_func, minutes, r, antithetic=False,
+                event_calendar=False, fast_path=False, mser_warm_up=False) -> pd.DataFrame:
     """
     Replicate a simulation run.
 
@@ -217,25 +224,69 @@ def replication(env_setup_func, calculate_stats_func, minutes, r) -> pd.DataFram
     :param calculate_stats_func (Callable): A function that calculates statistics based on the simulation environment.
     :param minutes (int): The number of minutes to run the replication.
     :param r (int): iteration.
+    :param antithetic (bool): Whether the replications run in antithetic pairs. Replications 2p and 2p + 1 share the
+        seed p and the second one uses the complementary uniforms 1 - U.
+    :param event_calendar (bool): Whether to run the model on the lightweight event calendar instead of SimPy.
+    :param fast_path (bool): Whether to compute qualifying models with the vectorized Lindley recursion.
+    :param mser_warm_up (bool): Whether to detect the warm-up of the replication online with MSER-5. The detected
+        warm-up is added to the entity statistics as 'WarmUp'.
 
     :return Tuple[Dict, List[Dict], Dict, Dict]: A tuple containing dictionaries for entity, server, sink, and source statistics.
     """
-    random.seed(r)
-    EntityManager.destroy_all_entities()
-    Source.sources.reset_all()
-    Server.servers.reset_all()
-    Sink.sinks.reset_all()
-    env = simpy.Environment()
-    env_setup_func(env)
-    env.run(until=minutes)
-
-    result = calculate_stats_func(env)
-
-    del env
-    gc.collect()
+    seed, complement = (r // 2, r % 2 == 1) if antithetic else (r, None)
+    random.seed(seed)
+    # the components and entities of the replication are discarded with its context
+    with Model(seed, complement):
+        env = EventCalendar() if event_calendar or fast_path else simpy.Environment()
+        env_setup_func(env)
+        warm_up_detector = MserWarmUp(minutes).start() if mser_warm_up else None
+        try:
+            if not (fast_path and run_lindley_fast_path(env, minutes)):
+                env.run(until=minutes)
+            # the statistics are calculated with the detected warm-up, then the previous one is set again
+            if warm_up_detector is not None:
+                warm_up_detector.finish(minutes)
+            result = calculate_stats_func(env)
+        finally:
+            if warm_up_detector is not None:
+                warm_up_detector.restore()
+    if warm_up_detector is not None:
+        result[0]['WarmUp'] = warm_up_detector.warm_up
     return result
 
 
+def replication_chunk(env_setup_func, calculate_stats_func, minutes, replications, warm_up, antithetic=False,
+                      event_calendar=False, fast_path=False, mser_warm_up=False,
+                      shared_results: SharedResults = None) -> Union[list, int]:
+    """
+    Runs a chunk of replications in a worker of the `WorkerPool`, so the model function and the settings are sent
+    once per chunk and the garbage of the discarded model contexts is collected once per chunk.
+
+    :param replications (range): Indices of the replications.
+    :param warm_up (Union[int, float]): Warm-up of the calling process, the worker may have been started with another.
+    :param shared_results (SharedResults): Shared memory to write the statistics of the replications into, instead
+        of returning them.
+
+    The other parameters are the ones of `replication`.
+
+    :return Union[List[Tuple[Dict, List[Dict], Dict, Dict]], int]: The statistics of each replication, or the number
+        of replications written into the shared memory.
+    """
+    set_duration_warm_up(warm_up)
+    results = []
+    for r in replications:
+        result = replication(env_setup_func, calculate_stats_func, minutes, r, antithetic, event_calendar, fast_path,
+                             mser_warm_up)
+        if shared_results is not None:
+            shared_results.write(r, result)
+        else:
+            results.append(result)
+    if shared_results is not None:
+        shared_results.close()
+    gc.collect()
+    return len(replications) if shared_results is not None else results
+
+
 def get_percentage_and_computingtimes(computing_time_start, i, num_replications) -> Tuple[str, str, str, str, str]:
     """
     Calculate the percentage completion and various time metrics for a set of replications.
@@ -262,18 +313,52 @@ def get_percentage_and_computingtimes(computing_time_start, i, num_replications)
             f"[time per iteration] {str(timedelta(seconds=seconds_computed_iteration)):<15}")
 
 
-def run_replications(model: Callable, minutes, num_replications, warm_up: Union[int, float] = None,
-                     multiprocessing = False, save_to_database = False) -> tuple:
+def run_replications(model: Callable, minutes, num_replications, warm_up: Union[int, float, str] = None,
+                     multiprocessing = False, save_to_database = False, antithetic = False,
+                     event_calendar = False, fast_path = False, lockstep = False,
+                     target_precision: dict = None, min_replications: int = 10, batch_size: int = None) -> tuple:
     """
     Run multiple replications of a simulation and collect statistics.
 
     param: model (Callable): The simulation model function.
     param: minutes (int): The number of minutes to run each replication.
     param: num_replications (int): The total number of replications.
+    param: warm_up (Union[int, float, str]): The warm-up duration, or 'mser' to detect it per replication online with
+        MSER-5. The detected warm-ups are reported as the entity statistic 'WarmUp'.
     param: multiprocessing (bool): Whether to use multiprocessing for parallel execution.
+    param: antithetic (bool): Whether to run the replications in antithetic pairs, where the second run of each pair
+        uses the complementary uniforms 1 - U. The half-widths are computed from the pair means.
+    param: event_calendar (bool): Whether to run the replications on the lightweight event calendar instead of SimPy.
+    param: fast_path (bool): Whether to compute feed-forward networks of FIFO single servers with the vectorized
+        Lindley recursion instead of running events. Other models run on the event calendar.
+    param: lockstep (bool): Whether to run all replications together in lockstep, vectorized across the replications.
+        Models the lockstep engine does not support run replication by replication.
+    param: target_precision (dict): Target relative half-width per KPI, keyed by the (Type, Name, Stat) index of the
+        pivot table, e.g., {('Sink', 'Sink1', 'AvgTimeInSystem'): 0.01}. If given, the replications run in batches
+        and stop as soon as the half-width of every KPI is at most its target times the absolute average, with
+        num_replications as the maximum. Replications are not run in lockstep then.
+    param: min_replications (int): Number of replications before the precision is checked for the first time.
+    param: batch_size (int): Number of replications between two checks of the precision, by default the number of
+        cores with multiprocessing and 10 otherwise.
     """
 
-    if warm_up is not None:
+    if antithetic and num_replications % 2:
+        raise ValueError(f"Antithetic replications run in pairs, got an odd number of replications: "
+                         f"{num_replications}")
+
+    sequential = target_precision is not None
+    if sequential:
+        if min_replications < 2:
+            raise ValueError(f"The half-widths need at least 2 replications, got min_replications={min_replications}")
+        if batch_size is None:
+            batch_size = os.cpu_count() if multiprocessing else 10
+        if antithetic:
+            # batches of whole pairs
+            min_replications += min_replications % 2
+            batch_size += batch_size % 2
+
+    mser_warm_up = warm_up == 'mser'
+    if warm_up is not None and not mser_warm_up:
         set_duration_warm_up(warm_up)
 
     global seconds_previous_computations
@@ -281,105 +366,178 @@ def run_replications(model: Callable, minutes, num_replications, warm_up: Union[
     start = time.time()
     local_start_time = datetime.now()
 
-    # Define the names of the statistics for entities, servers, sinks, and sources
-    entity_stat_names = ['AvgTimeInSystem', 'MaxTimeInSystem', 'MinTimeInSystem',
-                         'NumberCreated', 'NumberDestroyed', 'NumberInSystem']
-    server_stat_names = ['ScheduledUtilization', 'UnitsUtilized', 'AvgTimeProcessing',
-                         'TotalTimeProcessing', 'NumberEntered', 'NumberExited', 'TotalDowntime', 'NumberDowntimes']
-    sink_stat_names = ['AvgTimeInSystem', 'MaxTimeInSystem', 'MinTimeInSystem', 'NumberEntered']
-    source_stat_names = ['NumberCreated', 'NumberExited']
-
-    all_entity_stats = []
-    all_server_stats = {}
-    all_sink_stats = {}
-    all_source_stats = {}
+    entity_stat_names = ENTITY_STAT_NAMES + (['WarmUp'] if mser_warm_up else [])
 
     gi.Stats.all_detailed_stats = []
 
-    def process_results(entity_stats, server_stats, sink_stats, source_stats) -> None:
-        """
-        Process the results of a single replication and store the statistics.
-
-        param: entity_stats (Dict): Statistics for entities.
-        param: server_stats (List[Dict]): Statistics for servers.
-        param: sink_stats (Dict): Statistics for sinks.
-        param: source_stats (Dict): Statistics for sources.
-        """
-        all_entity_stats.append(entity_stats)
-        for server_stat in server_stats:
-            server_name = server_stat['Server']
-            all_server_stats.setdefault(server_name, []).append(server_stat)
-        for sink_name, stat in sink_stats.items():
-            all_sink_stats.setdefault(sink_name, []).append(stat)
-        for source_name, stat in source_stats.items():
-            all_source_stats.setdefault(source_name, []).append(stat)
-
-        """detailed_stats = {
-            'Entity': entity_stats,
-            'Server': server_stats,
-            'Sink': sink_stats,
-            'Source': source_stats
-        }
-        Stats.all_detailed_stats.append(detailed_stats)"""
-        """Stats.all_detailed_stats.append({
-            'Entity': entity_stats,
-            'Server': server_stats,
-            'Sink': sink_stats,
-            'Source': source_stats
-        })"""
-
     tenth_percentage = int(num_replications / 10)
 
-    """if multiprocessing:
-        chunk_size = max(1, num_replications // (os.cpu_count() or 1))
-        with concurrent.futures.ProcessPoolExecutor() as executor:
-            results = executor.map(
-                replication,
-                [model] * num_replications,
-                [calculate_statistics] * num_replications,
-                [minutes] * num_replications,
-                range(num_replications),
-                chunksize=chunk_size
-            )
-            for r, result in enumerate(results, 1):
-                process_results(*result)
-                if r % tenth_percentage == 0 or r == num_replications:
-                    print_stats(r, num_replications, start, tenth_percentage)
+    # the lockstep engine applies a fixed warm-up and runs all replications at once
+    lockstep_replications = LockstepReplications.from_model(model, num_replications, antithetic) \
+        if lockstep and not mser_warm_up and not sequential else None
+    use_pool = multiprocessing and lockstep_replications is None
+
+    # the layout of the statistics is taken from the first replication, so the model is not built an extra time
+    if lockstep_replications is not None:
+        results = lockstep_replications.run(minutes)
+        first_result = results[0]
     else:
-        for r in range(num_replications):
-            process_results(*replication(model, calculate_statistics, minutes, r))
-            if r % tenth_percentage == 0 or r == num_replications:
-                print_stats(r, num_replications, start, tenth_percentage)"""
-
-    if multiprocessing:
-        num_cores = min(os.cpu_count(), num_replications)
-        # print(f"Running on {num_cores} cores")
-        try:
-            with concurrent.futures.ProcessPoolExecutor(max_workers=num_cores) as executor:
-                future_results = [executor.submit(replication, model, calculate_statistics, minutes, r)
-                                  for r in range(num_replications)]
-                for r, future in enumerate(concurrent.futures.as_completed(future_results)):
-                    process_results(*future.result())
+        first_result = replication(model, calculate_statistics, minutes, 0, antithetic, event_calendar, fast_path,
+                                   mser_warm_up)
+    layout = StatLayout.from_result(first_result, entity_stat_names, SERVER_STAT_NAMES, SINK_STAT_NAMES,
+                                    SOURCE_STAT_NAMES)
+    # the statistics of every replication are accumulated as it completes, the workers of the pool write them into
+    # a window of rows in shared memory
+    aggregator = ReplicationAggregator(layout, antithetic)
+    aggregator.add(first_result)
+    print_stats(0, num_replications, start, tenth_percentage)
+    shared_results = SharedResults(layout, min(num_replications, SharedResults.window)) if use_pool else None
+
+    def run_batches(run_batch: Callable) -> None:
+        """
+        Runs all replications at once, or in batches until the target precision or the maximum number of
+        replications is reached.
+
+        param: run_batch (Callable): Runs the replications of a range of replication indices.
+        """
+        if not sequential:
+            run_batch(range(aggregator.number_of_replications, num_replications))
+            return
+        while aggregator.number_of_replications < num_replications:
+            completed = aggregator.number_of_replications
+            size = max(batch_size, min_replications - completed)
+            run_batch(range(completed, min(completed + size, num_replications)))
+            if target_precision_reached(aggregator.pivot(), target_precision):
+                logging.info(f"Target precision reached after {aggregator.number_of_replications} replications")
+                return
+        logging.warning(f"Target precision not reached after the maximum of {num_replications} replications")
+
+    try:
+        if lockstep_replications is not None:
+            for r in range(1, num_replications):
+                aggregator.add(results[r])
+                print_stats(r, num_replications, start, tenth_percentage)
+        elif use_pool:
+            num_cores = min(os.cpu_count(), num_replications)
+            # print(f"Running on {num_cores} cores")
+            # the pool is kept for the next call, its workers run chunks of replications
+            executor = WorkerPool.get()
+            try:
+                def run_window(replications: range) -> None:
+                    # a few chunks per worker, so the workers finishing early take over the remaining chunks
+                    chunk_size = max(1, len(replications) // (4 * num_cores))
+                    shared_results.first_replication = replications.start
+                    future_results = [executor.submit(replication_chunk, model, calculate_statistics, minutes,
+                                                      replications[i:i + chunk_size], gi.DURATION_WARM_UP,
+                                                      antithetic, event_calendar, fast_path, mser_warm_up,
+                                                      shared_results)
+                                      for i in range(0, len(replications), chunk_size)]
+                    r = replications.start
+                    try:
+                        for future in concurrent.futures.as_completed(future_results):
+                            # the workers wrote the statistics into the shared memory
+                            for _ in range(future.result()):
+                                print_stats(r, num_replications, start, tenth_percentage)
+                                r += 1
+                    except BaseException:
+                        # the chunks not started yet would write into the shared memory after it is freed
+                        for future in future_results:
+                            future.cancel()
+                        raise
+                    # accumulated as one block in the order of the replications, so the results do not depend on the
+                    # scheduling
+                    aggregator.add_rows(shared_results.values[:len(replications)])
+
+                def run_batch(replications: range) -> None:
+                    window = shared_results.num_replications
+                    for first in range(0, len(replications), window):
+                        run_window(replications[first:first + window])
+
+                run_batches(run_batch)
+            except concurrent.futures.process.BrokenProcessPool:
+                # a worker died, the next call starts a new pool
+                WorkerPool.shutdown()
+                raise
+        else:
+            def run_batch(replications: range) -> None:
+                for r in replications:
+                    aggregator.add(replication(model, calculate_statistics, minutes, r, antithetic, event_calendar,
+                                               fast_path, mser_warm_up))
                     print_stats(r, num_replications, start, tenth_percentage)
-        except Exception as e:
-            print(f"An Exception occurred: {e}")
-    else:
-        for r in range(num_replications):
-            process_results(*replication(model, calculate_statistics, minutes, r))
-            print_stats(r, num_replications, start, tenth_percentage)
 
-    local_end_time = datetime.now()
+            run_batches(run_batch)
+    finally:
+        if shared_results is not None:
+            shared_results.unlink()
 
-    combined_pivot = create_pivot(all_entity_stats, all_server_stats, all_sink_stats, all_source_stats,
-                                  entity_stat_names,
-                                  server_stat_names, sink_stat_names, source_stat_names)
+    local_end_time = datetime.now()
+    combined_pivot = aggregator.pivot()
+    logging.info("\n" + str(combined_pivot))
 
     if save_to_database:
-        save_to_db(combined_pivot, local_start_time, local_end_time, minutes, num_replications)
+        save_to_db(combined_pivot, local_start_time, local_end_time, minutes, aggregator.number_of_replications)
 
     return combined_pivot
 
 
+def run_batch_means(model: Callable, minutes: Union[int, float], warm_up: Union[int, float] = None,
+                    num_batches: int = 20, event_calendar: bool = False,
+                    store_pivot_in_file: str = None) -> pd.DataFrame:
+    """
+    Run a single long simulation for steady-state statistics with the method of batch means. After a single warm-up,
+    the remaining run is split into batches of equal length, the statistics are collected per batch like per
+    replication of `run_replications` and aggregated into the same pivot table, with the half-widths of the batch
+    means. The warm-up is thus paid once instead of per replication. The batches are checked for autocorrelation,
+    see `autocorrelated_statistics`. Counts, e.g., 'NumberEntered', are per batch.
+
+    param: model (Callable): The simulation model function.
+    param: minutes (Union[int, float]): The number of minutes to run the simulation, including the warm-up.
+    param: warm_up (Union[int, float]): The warm-up duration, by default the current one.
+    param: num_batches (int): The number of batches after the warm-up.
+    param: event_calendar (bool): Whether to run the model on the lightweight event calendar instead of SimPy.
+    param: store_pivot_in_file (str): Path of a CSV file to store the pivot table in.
+
+    return: DataFrame: Pivot table with average, minimum, maximum and half-width per statistic over the batches
+    """
+    if warm_up is not None:
+        set_duration_warm_up(warm_up)
+    warm_up = gi.DURATION_WARM_UP
+    if num_batches < 2:
+        raise ValueError(f"The half-widths need at least 2 batches, got num_batches={num_batches}")
+    if minutes <= warm_up:
+        raise ValueError(f"The run of {minutes} minutes ends within the warm-up of {warm_up} minutes")
+
+    random.seed(RANDOM_SEED)
+    # the context stays active after the run, so the components can be inspected until the next run
+    context = Model(RANDOM_SEED).activate()
+    env = EventCalendar() if event_calendar else simpy.Environment()
+    model(env)
+    layout = StatLayout.from_components(ENTITY_STAT_NAMES, SERVER_STAT_NAMES, SINK_STAT_NAMES, SOURCE_STAT_NAMES)
+    values = np.empty((num_batches, len(layout)))
+    batch_length = (minutes - warm_up) / num_batches
+    try:
+        if warm_up > 0:
+            env.run(until=warm_up)
+        context.clear_statistics(env.now)
+        for batch in range(num_batches):
+            env.run(until=minutes if batch == num_batches - 1 else warm_up + (batch + 1) * batch_length)
+            layout.write(values[batch], calculate_statistics(env))
+            # the next batch starts like a run after its warm-up
+            context.clear_statistics(env.now)
+            set_duration_warm_up(env.now)
+    finally:
+        set_duration_warm_up(warm_up)
+
+    autocorrelated_statistics(layout, values)
+    pivot_table = layout.pivot(values)
+    logging.info("\n" + str(pivot_table))
+
+    if store_pivot_in_file:
+        pivot_table.to_csv(store_pivot_in_file)
+
+    return pivot_table
+
+
 def print_stats(i, num_replications, start, tenth_percentage) -> None:
     """
     Prints statistics
@@ -400,7 +558,7 @@ def print_stats(i, num_replications, start, tenth_percentage) -> None:
 def create_pivot(all_entity_stats, all_server_stats, all_sink_stats,
                  all_source_stats, entity_stat_names, server_stat_names,
                  sink_stat_names, source_stat_names,
-                 store_pivot_in_file: str = None) -> tuple:
+                 store_pivot_in_file: str = None, antithetic: bool = False, log_pivot: bool = True) -> tuple:
     """
         Create a pivot table from collected simulation statistics.
 
@@ -412,92 +570,44 @@ def create_pivot(all_entity_stats, all_server_stats, all_sink_stats,
         param: server_stat_names (list): List of server statistics names.
         param: sink_stat_names (list): List of sink statistics names.
         param: source_stat_names (list): List of source statistics names.
+        param: antithetic (bool): Whether consecutive replications form antithetic pairs. The half-width is then
+            computed from the pair means, which are independent, instead of the correlated replications.
+        param: log_pivot (bool): Whether to log the pivot table.
         """
 
-    def calculate_aggregate_stats(values) -> tuple:
-        """
-        Calculate aggregate statistics (average, minimum, maximum, half-width).
-
-        param: values (list): List of numeric values.
-
-        return: Tuple: Tuple containing average, minimum, maximum, half
-        """
-        numeric_values = [value for value in values if isinstance(value, (int, float))]
-        if not numeric_values:
-            return None, None, None, None
-
-        avg = np.mean(numeric_values)
-        min_val = np.min(numeric_values)
-        max_val = np.max(numeric_values)
-        half_width = 1.96 * (np.std(numeric_values) / np.sqrt(len(numeric_values)))
-        return avg, min_val, max_val, half_width
-
-    def flatten_stats(stats, name, stat_names, is_entity=False) -> list:
-        """
-        Flatten statistics into a list for DataFrame.
-
-        param: stats (dict): Dictionary containing statistics for a particular component.
-        param: name (str): Name of the component type (entity, Server, Sink, Source).
-        param: stat_names (list): List of statistic names.
-        param: is_entity (bool): Indicates if the component is an entity.
-
-        return: List of dictionaries containing statistics for a particular component
-        """
-        flattened = []
-        for component_name, stat_values in stats.items():
-            for stat_name in stat_names:
-                values = stat_values.get(stat_name, {}) if is_entity else stat_values.get(stat_name)
-                if values:
-                    avg, min_val, max_val, half_width = values if is_entity else \
-                        (values[0], values[1], values[2], values[3])
-                    row = {'Type': name, 'Name': component_name, 'Stat': stat_name,
-                           'Average': round(avg, 4) if avg is not None else None,
-                           'Minimum': round(min_val, 4) if min_val is not None else None,
-                           'Maximum': round(max_val, 4) if max_val is not None else None,
-                           'Half-Width': round(half_width, 4) if half_width is not None else None}
-                    flattened.append(row)
-        return flattened
-
-    # Calculate aggregate statistics
-    entity_aggregate_stats = {stat: calculate_aggregate_stats([run[stat] for run in all_entity_stats])
-                              for stat in entity_stat_names}
-    modified_entity_stats = {'Entity': {}}
-    for stat_name, values in entity_aggregate_stats.items():
-        avg, min_val, max_val, half_width = values if values else (None, None, None, None)
-        modified_entity_stats['Entity'][stat_name] = (avg, min_val, max_val, half_width)
-
-    aggregate_server_stats = {server_name: {key: calculate_aggregate_stats([stat[key] for stat in stats_list])
-                                            for key in server_stat_names}
-                              for server_name, stats_list in all_server_stats.items()}
-
-    aggregate_sink_stats = {sink_name: {key: calculate_aggregate_stats([stat[key] for stat in stats_list])
-                                        for key in sink_stat_names}
-                            for sink_name, stats_list in all_sink_stats.items()}
-
-    aggregate_source_stats = {source_name: {key: calculate_aggregate_stats([stat[key] for stat in stats_list])
-                                            for key in source_stat_names}
-                              for source_name, stats_list in all_source_stats.items()}
-
-    # Flatten all stats into a single list
-    flattened_stats = []
-    flattened_stats.extend(flatten_stats(modified_entity_stats, 'Entity', entity_stat_names, is_entity=True))
-    flattened_stats.extend(flatten_stats(aggregate_server_stats, 'Server', server_stat_names))
-    flattened_stats.extend(flatten_stats(aggregate_sink_stats, 'Sink', sink_stat_names))
-    flattened_stats.extend(flatten_stats(aggregate_source_stats, 'Source', source_stat_names))
-    # Creating a combined DataFrame from flattened stats
-    df_combined = pd.DataFrame(flattened_stats)
-    # Creating the pivot table
-    pivot_table_combined = df_combined.pivot_table(
-        index=['Type', 'Name', 'Stat'],
-        values=['Average', 'Minimum', 'Maximum', 'Half-Width'],
-        aggfunc='mean'
-    )
-    # Reorder the columns
-    pivot_table_combined = pivot_table_combined[['Average', 'Minimum', 'Maximum', 'Half-Width']]
+    # a single pass over the replications with mergeable accumulators, in the layout of the given statistics
+    layout = StatLayout(entity_stat_names, list(all_server_stats), server_stat_names, list(all_sink_stats),
+                        sink_stat_names, list(all_source_stats), source_stat_names)
+    aggregator = ReplicationAggregator(layout, antithetic)
+    for r, entity_stats in enumerate(all_entity_stats):
+        aggregator.add_components(entity_stats,
+                                  {server: stats[r] for server, stats in all_server_stats.items()},
+                                  {sink: stats[r] for sink, stats in all_sink_stats.items()},
+                                  {source: stats[r] for source, stats in all_source_stats.items()})
+    pivot_table_combined = aggregator.pivot()
     # Print the Pivot Table
-    logging.info("\n" + str(pivot_table_combined))
+    if log_pivot:
+        logging.info("\n" + str(pivot_table_combined))
 
     if store_pivot_in_file:
         pivot_table_combined.to_csv('combined_simulation_stats.csv')
 
     return pivot_table_combined
+
+
+def target_precision_reached(pivot_table, target_precision: dict) -> bool:
+    """
+    Checks whether the half-widths of the KPIs reached their target relative precision.
+
+    param: pivot_table (DataFrame): Pivot table of `create_pivot`.
+    param: target_precision (dict): Target relative half-width per (Type, Name, Stat) index of the pivot table.
+
+    return: True if the half-width of every KPI is at most its target times the absolute average
+    """
+    for kpi, target in target_precision.items():
+        if kpi not in pivot_table.index:
+            raise KeyError(f"KPI {kpi} is not in the statistics of the model")
+        average, half_width = pivot_table.loc[kpi, ['Average', 'Half-Width']]
+        if pd.isna(average) or pd.isna(half_width) or half_width > target * abs(average):
+            return False
+    return True
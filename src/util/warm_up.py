@@ -0,0 +1,114 @@
+import logging
+import math
+from typing import Optional, Union
+import numpy as np
+import src.util.global_imports as gi
+from src.util.global_imports import set_duration_warm_up
+
+
+def mser(batch_means: np.ndarray) -> int:
+    """
+    Marginal standard error rule: the truncation point which minimizes the standard error of the mean of the remaining
+    batch means, MSER-5 if the batches have 5 observations.
+
+    :param batch_means: Batch means in order of time
+    :return: Number of batches to truncate, only the first half of the batches is considered
+    """
+    n = len(batch_means)
+    # sums and sums of squares of the batch means from batch d to the end, for every d
+    tail_sums = np.cumsum(batch_means[::-1])[::-1]
+    tail_squares = np.cumsum(batch_means[::-1] ** 2)[::-1]
+    remaining = n - np.arange(n)
+    statistics = (tail_squares - tail_sums ** 2 / remaining) / remaining ** 2
+    return int(np.argmin(statistics[:max(1, n // 2)]))
+
+
+class MserWarmUp:
+    """
+    Detects the warm-up of a run online with MSER-5 on the time in system of the destroyed entities. Until the
+    truncation point is found, the warm-up is infinite and no statistics are collected. When MSER-5 places the
+    truncation point in the first half of the batches, the warm-up ends at the current time, so every statistic which
+    is filtered at event time, see `gi.DURATION_WARM_UP`, is collected from there on. The observations up to the
+    detection are never collected, even if the truncation point lies before. If no truncation point is found in the
+    first half of the run, the run is too short for the rule and the warm-up ends at half the run length.
+    """
+    active: Optional['MserWarmUp'] = None
+    """Detector of the current run, None with a fixed warm-up"""
+
+    def __init__(self, minutes: Union[int, float], batch_size: int = 5, min_batches: int = 40) -> None:
+        """
+        :param minutes: Run length, the warm-up ends at half of it at the latest
+        :param batch_size: Observations per batch mean, 5 for MSER-5
+        :param min_batches: Number of batches before the rule is applied for the first time
+        """
+        self.max_warm_up = minutes / 2
+        self.batch_size = batch_size
+        self.batch_sum = 0
+        self.batch_count = 0
+        self.batch_means = []
+        self.batch_end_times = []
+        self.next_check = min_batches
+        """Number of batches at which the rule is applied next, grows geometrically"""
+        self.truncation_time = None
+        """End time of the truncated batches when the warm-up was detected"""
+        self.warm_up = math.inf
+        """Warm-up applied to the statistics, infinite until detected"""
+        self.previous_warm_up = None
+        """Warm-up before the start, set again by `restore`"""
+
+    def start(self) -> 'MserWarmUp':
+        """Makes this detector the active detector and holds back all statistics until the warm-up is detected."""
+        MserWarmUp.active = self
+        self.previous_warm_up = gi.DURATION_WARM_UP
+        set_duration_warm_up(math.inf)
+        return self
+
+    def restore(self) -> None:
+        """Sets the warm-up from before the start again, once the statistics of the run are calculated."""
+        if MserWarmUp.active is self:
+            MserWarmUp.active = None
+        set_duration_warm_up(self.previous_warm_up)
+
+    def observe(self, time: Union[int, float], value: Union[int, float]) -> bool:
+        """
+        Adds an observation, e.g., the time in system of a destroyed entity.
+
+        :param time: Simulation time of the observation
+        :param value: Observed value
+        :return: True, so the call can be chained
+        """
+        self.batch_sum += value
+        self.batch_count += 1
+        if self.batch_count == self.batch_size:
+            self.batch_means.append(self.batch_sum / self.batch_size)
+            self.batch_end_times.append(time)
+            self.batch_sum = self.batch_count = 0
+            if len(self.batch_means) >= self.next_check:
+                self.next_check = math.ceil(self.next_check * 1.25)
+                truncated = mser(np.array(self.batch_means))
+                if truncated < len(self.batch_means) // 2 - 1:
+                    self.end_warm_up(time, self.batch_end_times[truncated - 1] if truncated else 0)
+                    return True
+        if time >= self.max_warm_up:
+            logging.warning(f"MSER-5 found no warm-up until {time}, the run is too short for the rule")
+            self.end_warm_up(time, None)
+        return True
+
+    def end_warm_up(self, time: Union[int, float], truncation_time: Optional[Union[int, float]]) -> None:
+        """
+        Ends the warm-up at the given time and stops observing.
+
+        :param time: Simulation time the statistics are collected after
+        :param truncation_time: End time of the truncated batches, None if not detected
+        """
+        # just after the time, so the events at the time are left out like the ones before the detection
+        self.warm_up = math.nextafter(time, math.inf)
+        self.truncation_time = truncation_time
+        set_duration_warm_up(self.warm_up)
+        MserWarmUp.active = None
+
+    def finish(self, minutes: Union[int, float]) -> None:
+        """Ends a warm-up which is still running at the end of the run, e.g., if no entity left the system."""
+        if MserWarmUp.active is self:
+            logging.warning("MSER-5 found no warm-up until the end of the run")
+            self.end_warm_up(minutes, None)
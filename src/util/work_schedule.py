@@ -1,4 +1,5 @@
 import unittest
+from bisect import bisect_right
 import pandas as pd
 import calendar
 import logging
@@ -16,6 +17,9 @@ class WorkScheduleWeek:
         self.start_simulation_in_steps = DateTime.map_time_to_steps(start_day - 1, start_hour, start_minute)
         # Check for overlapping shifts within the schedule
         self.find_overlaps()
+        # Precompile the shifts into sorted transition times, so shift changes are found by binary search
+        self.steps_per_week = DateTime.map_time_to_steps(7)
+        self.transition_times, self.transition_capacities = self.compile_transitions()
 
     # Method to get the combined weekly schedule and start simulation time in steps
     def get(self):
@@ -57,6 +61,21 @@ class WorkScheduleWeek:
                 if shifts[i][0] < shifts[j][1] and shifts[i][1] > shifts[j][0]:
                     raise ValueError("There are overlaps in the work schedule!")
 
+    # Method to compile the shifts into the sorted steps in the week at which the capacity changes and the capacity
+    # from then on, None if off shift. Adjacent shifts with the same capacity are merged.
+    def compile_transitions(self):
+        capacities = {}
+        for _, end, _ in self.work_schedule:
+            capacities[end % self.steps_per_week] = None
+        for start, _, capacity in self.work_schedule:
+            capacities[start % self.steps_per_week] = capacity
+        transitions = sorted(capacities.items()) or [(0, None)]
+
+        # A transition is only kept if the capacity changes, the last transition of the week precedes the first one
+        changes = [(step, capacity) for i, (step, capacity) in enumerate(transitions)
+                   if capacity != transitions[i - 1][1]] or transitions[:1]
+        return [step for step, _ in changes], [capacity for _, capacity in changes]
+
 
 class WorkScheduleDay(unittest.TestCase):
 
@@ -115,29 +134,35 @@ def steps_in_time(step):
     return int(weekday), int(hour), int(minute)
 
 
-def ask_work_schedule(current_time, work_schedule):
-    # Initialize a list to track the start of each shift relative to the current week time
-    start_of_shifts = []
-    # Calculate the total number of steps in a week
-    steps_per_week = DateTime.map_time_to_steps(7)
-    # Retrieve the work schedule and the simulation start time in steps
-    time_to_work, start_simulation_in_steps = work_schedule.get()
-    # Adjust the current time by adding the simulation start offset
-    current_time += start_simulation_in_steps
-    # Calculate the current time's position within the weekly cycle
-    step_in_week = current_time % steps_per_week
-
-    # Check each shift to determine if the current time falls within the shift duration
-    for shift in time_to_work:
-        if shift[0] <= step_in_week < shift[1]:
-            return True, 0, shift[2]
-        else:
-            start_of_shifts.append(shift[0] - step_in_week)
-
-    # Check if all calculated start times are in the past
-    if all(element < 0 for element in start_of_shifts):
-        time_to_wait = steps_per_week - step_in_week + time_to_work[0][0]
-        return False, time_to_wait, None
+def find_transition(current_time, work_schedule):
+    # Calculate the current time's position within the weekly cycle, adjusted by the simulation start offset
+    step_in_week = (current_time + work_schedule.start_simulation_in_steps) % work_schedule.steps_per_week
+    # Find the last transition at or before the current time, index -1 is the last transition of the previous week
+    return bisect_right(work_schedule.transition_times, step_in_week) - 1, step_in_week
+
+
+def current_shift_start(current_time, work_schedule):
+    # Step in the week at which the current shift (or break) started
+    index, _ = find_transition(current_time, work_schedule)
+    return work_schedule.transition_times[index]
+
+
+def next_shift_change(current_time, work_schedule):
+    index, step_in_week = find_transition(current_time, work_schedule)
+    transition_times = work_schedule.transition_times
+    capacity = work_schedule.transition_capacities[index]
+
+    # Time until the next transition, which wraps around to the first transition of the next week
+    if index + 1 < len(transition_times):
+        time_until_change = transition_times[index + 1] - step_in_week
     else:
-        difference = [element for element in start_of_shifts if element >= 0]
-        return False, min(difference), None
+        time_until_change = work_schedule.steps_per_week - step_in_week + transition_times[0]
+    return capacity is not None, time_until_change, capacity
+
+
+def ask_work_schedule(current_time, work_schedule):
+    # Check whether the current time falls within a shift, otherwise return the time to wait until the next shift
+    active, time_until_change, capacity = next_shift_change(current_time, work_schedule)
+    if active:
+        return True, 0, capacity
+    return False, time_until_change, None
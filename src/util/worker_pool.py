@@ -0,0 +1,50 @@
+import concurrent.futures
+import gc
+import os
+from typing import Optional
+
+
+def initialize_worker() -> None:
+    """
+    Prepares a new worker process. The objects inherited from the parent process are moved to the permanent
+    generation of the garbage collector, so the collections in the worker only traverse the objects of its own
+    replications and do not touch, and thereby copy, the inherited memory pages.
+    """
+    gc.freeze()
+
+
+class WorkerPool:
+    """
+    Process pool which is started once and kept for the successive `run_replications` calls of a process, instead of
+    starting and tearing down a pool per call. The workers are forked with the modules already imported. Settings
+    which differ between the calls, like the warm-up, are passed with each task. Other process-wide settings are the
+    ones at the start of the pool, so call `shutdown` after changing them.
+    """
+    executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+    """Running pool, None until first used"""
+    max_workers: int = 0
+    """Number of worker processes of the running pool"""
+
+    @classmethod
+    def get(cls, max_workers: Optional[int] = None) -> concurrent.futures.ProcessPoolExecutor:
+        """
+        Returns the running pool, started on the first call and restarted if it has fewer workers than requested.
+
+        :param max_workers: Number of worker processes, by default the number of cores
+        :return: Process pool
+        """
+        max_workers = max_workers or os.cpu_count()
+        if cls.executor is None or cls.max_workers < max_workers:
+            cls.shutdown()
+            cls.executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers,
+                                                                  initializer=initialize_worker)
+            cls.max_workers = max_workers
+        return cls.executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stops the worker processes, e.g., after a worker died, the next call of `get` starts a new pool."""
+        if cls.executor is not None:
+            cls.executor.shutdown(cancel_futures=True)
+            cls.executor = None
+            cls.max_workers = 0
@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import src.util.global_imports as gi
+from src.models.model4_1 import setup_model4_1
+from src.util.batch_means import autocorrelated_statistics, lag1_autocorrelation
+from src.util.global_imports import set_duration_warm_up
+from src.util.replication_results import StatLayout
+from src.util.simulations import run_batch_means, run_simulation
+
+
+class TestAutocorrelation(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        noise = rng.normal(0, 1, (200, 2))
+        self.values = np.empty((200, 3))
+        self.values[:, 0] = noise[:, 0]
+        # AR(1) with a coefficient of 0.9
+        self.values[0, 1] = noise[0, 1]
+        for i in range(1, 200):
+            self.values[i, 1] = 0.9 * self.values[i - 1, 1] + noise[i, 1]
+        self.values[:, 2] = 5
+
+    def test_lag1_autocorrelation(self):
+        autocorrelation = lag1_autocorrelation(self.values)
+        self.assertLess(abs(autocorrelation[0]), 0.15)
+        self.assertGreater(autocorrelation[1], 0.7)
+        self.assertTrue(np.isnan(autocorrelation[2]))
+
+    def test_autocorrelated_statistics(self):
+        layout = StatLayout(['AvgTimeInSystem', 'AvgNumberInSystem', 'NumberCreated'], [], [], [], [], [], [])
+        with self.assertLogs(level='WARNING'):
+            autocorrelated = autocorrelated_statistics(layout, self.values)
+        self.assertEqual(autocorrelated, [('Entity', 'Entity', 'AvgNumberInSystem')])
+
+
+class TestRunBatchMeans(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(set_duration_warm_up, 0)
+
+    def test_time_averages_of_the_run(self):
+        pivot_table = run_batch_means(setup_model4_1, minutes=20000, warm_up=2000, num_batches=10)
+        self.assertEqual(gi.DURATION_WARM_UP, 2000)
+        self.assertEqual(list(pivot_table.columns), ['Average', 'Minimum', 'Maximum', 'Half-Width'])
+        self.assertTrue((pivot_table['Minimum'] <= pivot_table['Maximum']).all())
+
+        # the batches have equal lengths, so the averages of the batch time averages are the ones of the whole run
+        run_pivot_table = run_simulation(setup_model4_1, minutes=20000, warm_up=2000)
+        stats = [('Entity', 'Entity', 'AvgNumberInSystem'), ('Server', 'Server1', 'UnitsUtilized'),
+                 ('Server', 'Server1', 'AvgNumberInQueue'), ('Server', 'Server1', 'ScheduledUtilization')]
+        np.testing.assert_allclose(pivot_table.loc[stats, 'Average'], run_pivot_table.loc[stats, 'Value'],
+                                   atol=2e-4)
+        # the counts are per batch, the maxima over all batches
+        self.assertAlmostEqual(pivot_table.loc[('Server', 'Server1', 'NumberExited'), 'Average'] * 10,
+                               run_pivot_table.loc[('Server', 'Server1', 'NumberExited'), 'Value'], delta=1)
+        self.assertEqual(pivot_table.loc[('Server', 'Server1', 'MaxTimeInQueue'), 'Maximum'],
+                         run_pivot_table.loc[('Server', 'Server1', 'MaxTimeInQueue'), 'Value'])
+
+    def test_invalid_batches(self):
+        with self.assertRaises(ValueError):
+            run_batch_means(setup_model4_1, minutes=20000, num_batches=1)
+        with self.assertRaises(ValueError):
+            run_batch_means(setup_model4_1, minutes=1000, warm_up=1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.model import Model
+from src.models.model4_1 import setup_model4_1
+from src.util.columnar_export import ChunkedTableWriter, LifecycleExport, entity_lifecycles, load_table
+from src.util.event_trace import EventTrace
+from src.util.simulations import run_simulation
+
+
+class TestChunkedTableWriter(unittest.TestCase):
+
+    def test_chunks(self):
+        dtype = np.dtype([('id', '<i8'), ('time', '<f8'), ('component', '<u2')])
+        with tempfile.TemporaryDirectory() as directory:
+            writer = ChunkedTableWriter(directory, 'rows', dtype, chunk_size=4)
+            for i in range(10):
+                writer.append(i, i / 2, i % 3)
+            self.assertEqual(writer.chunks_written, 2)
+            writer.flush()
+            self.assertEqual(sorted(os.listdir(directory)), ['rows-00000.npy', 'rows-00001.npy', 'rows-00002.npy'])
+            table = load_table(directory, 'rows')
+            np.testing.assert_array_equal(table['id'], range(10))
+            np.testing.assert_array_equal(table['time'], np.arange(10) / 2)
+            np.testing.assert_array_equal(table['component'], np.arange(10) % 3)
+
+
+class TestLifecycleExport(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(Model.current.activate)
+
+    def test_reused_directory(self):
+        dtype = np.dtype([('id', '<i8')])
+        with tempfile.TemporaryDirectory() as directory:
+            for table in ('entities', 'visits', 'events'):
+                writer = ChunkedTableWriter(directory, table, dtype, chunk_size=2)
+                for i in range(5):
+                    writer.append(i)
+                writer.flush()
+            with open(os.path.join(directory, 'notes.txt'), 'w') as file:
+                file.write('kept')
+            export = LifecycleExport(directory, chunk_size=2)
+            self.assertEqual(os.listdir(directory), ['notes.txt'])
+            export.entities.append(7, 0, 1, 0)
+            export.entities.flush()
+            np.testing.assert_array_equal(load_table(directory, 'entities')['entity'], [7])
+
+    def test_run_simulation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            trace = EventTrace(capacity=1000, directory=directory)
+            pivot_table = run_simulation(model=setup_model4_1, minutes=1440, event_trace=trace,
+                                         lifecycle_export=LifecycleExport(directory, chunk_size=500))
+            self.assertIsNone(LifecycleExport.active)
+
+            lifecycles = entity_lifecycles(directory)
+            self.assertEqual(len(lifecycles), pivot_table.loc[('Sink', 'Sink1', 'NumberEntered'), 'Value'])
+            self.assertTrue((lifecycles['servers_visited'] == 1).all())
+            self.assertTrue((lifecycles['sink'] == 'Sink1').all())
+            time_in_system = lifecycles['destruction_time'] - lifecycles['creation_time']
+            np.testing.assert_allclose(lifecycles['waiting_time'] + lifecycles['processing_time'], time_in_system)
+            self.assertAlmostEqual(time_in_system.mean(),
+                                   pivot_table.loc[('Sink', 'Sink1', 'AvgTimeInSystem'), 'Value'], places=3)
+
+            visits = load_table(directory, 'visits')
+            self.assertEqual(len(visits), pivot_table.loc[('Server', 'Server1', 'NumberExited'), 'Value'])
+            events = load_table(directory, 'events')
+            self.assertEqual(len(events), trace.number_of_records)
+            self.assertTrue(set(events['entity']) >= set(lifecycles['entity']))
+
+
+if __name__ == '__main__':
+    unittest.main()
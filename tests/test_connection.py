@@ -113,7 +113,8 @@ class TestConnection(unittest.TestCase):
             env=self.env,
             origin_component=self.origin_component,
             next_component=self.next_component,
-            name="TestConnection"
+            name="TestConnection",
+            process_duration=0
         )
         # processing event is not triggered
         self.assertFalse(connection.processing.triggered)
@@ -126,7 +127,8 @@ class TestConnection(unittest.TestCase):
             env=self.env,
             origin_component=self.origin_component,
             next_component=self.next_component,
-            name="TestConnection"
+            name="TestConnection",
+            process_duration=0
         )
         # Manually trigger processing
         connection.processing.succeed()
@@ -155,12 +157,13 @@ class TestConnection(unittest.TestCase):
         self.next_component.handle_entity_arrival.assert_called_with(self.entity)
         self.assertEqual(self.env.now, 2)
 
-    def test_run_without_process_duration(self):
+    def test_run_with_process_duration_zero(self):
         connection = Connection(
             env=self.env,
             origin_component=self.origin_component,
             next_component=self.next_component,
-            name="TestConnection"
+            name="TestConnection",
+            process_duration=0
         )
         # Add entities to the connection
         connection.handle_entity_arrival(self.entity)
@@ -173,6 +176,24 @@ class TestConnection(unittest.TestCase):
         self.next_component.handle_entity_arrival.assert_called_with(self.entity)
         self.assertEqual(self.env.now, 0)  # No time should have passed
 
+    def test_direct_dispatch_without_process_duration(self):
+        connection = Connection(
+            env=self.env,
+            origin_component=self.origin_component,
+            next_component=self.next_component,
+            name="TestConnection"
+        )
+        self.assertTrue(connection.is_direct)
+        self.assertIsNone(connection.action)
+        # Entity is handed over without running the environment
+        connection.handle_entity_arrival(self.entity)
+        self.assertEqual(connection.entities_processed, 1)
+        self.assertEqual(connection.number_entered, 1)
+        self.assertEqual(self.origin_component.number_exited, 1)
+        self.assertEqual(len(connection.entities_queue), 0)
+        self.next_component.handle_entity_arrival.assert_called_once_with(self.entity)
+        self.assertEqual(len(self.env._queue), 0)  # No event was scheduled
+
     def test_run_with_empty_queue(self):
         connection = Connection(
             env=self.env,
@@ -0,0 +1,90 @@
+import unittest
+import random
+import numpy as np
+from src.util.distribution_stream import DistributionStream
+from src.util.helper import get_value_from_distribution_with_parameters
+
+
+class TestDistributionStream(unittest.TestCase):
+
+    def test_values_are_handed_out_in_drawing_order(self):
+        stream = DistributionStream('uniform', 0, 1, block_size=4, generator=np.random.default_rng(1))
+        expected = np.random.default_rng(1).uniform(0, 1, size=8).tolist()
+        self.assertEqual([stream() for _ in range(8)], expected)
+
+    def test_buffer_is_refilled_when_empty(self):
+        stream = DistributionStream('exponential', 1, block_size=3)
+        for _ in range(3):
+            stream()
+        self.assertEqual(len(stream._values), 0)
+        stream()
+        self.assertEqual(len(stream._values), 2)
+
+    def test_usable_as_distribution_with_parameters(self):
+        stream = DistributionStream('uniform', 2, 4)
+        value = get_value_from_distribution_with_parameters((stream,))
+        self.assertTrue(2 <= value < 4)
+
+    def test_follows_random_seed(self):
+        random.seed(7)
+        first = DistributionStream('exponential', 1)()
+        random.seed(7)
+        second = DistributionStream('exponential', 1)()
+        self.assertEqual(first, second)
+
+    def test_from_distribution(self):
+        stream = DistributionStream.from_distribution((random.expovariate, 1 / 1.25))
+        self.assertEqual(stream.distribution, 'exponential')
+        self.assertEqual(stream.parameters, (1.25,))
+
+        stream = DistributionStream.from_distribution((random.triangular, 3, 5, 4))
+        self.assertEqual(stream.distribution, 'triangular')
+        self.assertEqual(stream.parameters, (3, 4, 5))
+
+        mean = np.mean([stream() for _ in range(10_000)])
+        self.assertAlmostEqual(mean, 4, delta=0.05)
+
+    def test_inversion_matches_distribution(self):
+        for distribution, parameters, mean in [('exponential', (2,), 2), ('uniform', (1, 3), 2),
+                                               ('triangular', (3, 4, 5), 4), ('normal', (5, 1), 5)]:
+            stream = DistributionStream(distribution, *parameters, generator=np.random.default_rng(1),
+                                        complement=False)
+            self.assertAlmostEqual(np.mean([stream() for _ in range(10_000)]), mean, delta=0.05)
+
+    def test_complement_is_antithetic(self):
+        stream = DistributionStream('uniform', 1, 3, generator=np.random.default_rng(1), complement=False)
+        complement = DistributionStream('uniform', 1, 3, generator=np.random.default_rng(1), complement=True)
+        for _ in range(10):
+            self.assertAlmostEqual(stream() + complement(), 4)
+
+        stream = DistributionStream('exponential', 1, generator=np.random.default_rng(1), complement=False)
+        complement = DistributionStream('exponential', 1, generator=np.random.default_rng(1), complement=True)
+        values = [(stream(), complement()) for _ in range(1000)]
+        self.assertLess(np.corrcoef(np.array(values).T)[0, 1], -0.5)
+
+    def test_take_matches_single_draws(self):
+        stream = DistributionStream('exponential', 1, block_size=7, generator=np.random.default_rng(1))
+        single = DistributionStream('exponential', 1, block_size=7, generator=np.random.default_rng(1))
+        values = [stream()] + stream.take(0).tolist() + stream.take(20).tolist() + [stream()]
+        self.assertEqual(values, [single() for _ in range(22)])
+
+    def test_take_whole_buffer(self):
+        stream = DistributionStream('uniform', 0, 1, block_size=4, generator=np.random.default_rng(1))
+        expected = np.random.default_rng(1).uniform(0, 1, size=8).tolist()
+        stream()
+        # the buffer holds exactly the 3 requested values
+        self.assertEqual(stream.take(3).tolist(), expected[1:4])
+        self.assertEqual(len(stream._values), 0)
+        self.assertEqual(stream.take(4).tolist(), expected[4:8])
+
+    def test_unsupported_distribution(self):
+        with self.assertRaises(ValueError):
+            DistributionStream('no_distribution')
+        with self.assertRaises(ValueError):
+            DistributionStream.from_distribution((lambda: 1,))
+        with self.assertRaises(ValueError):
+            DistributionStream('gamma', 2, 1, complement=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,17 @@
 import unittest
-from src.core.entity import Entity, EntityManager, SubEntity
+import src.util.global_imports as gi
+from src.core.entity import Entity, EntityManager, SubEntity, EntityStatistics, EntityName, ComponentIds, \
+    PriorityEntity
 
 
 class TestEntity(unittest.TestCase):
     def setUp(self):
         # Clear EntityManager before each test
         EntityManager.destroy_all_entities()
+        EntityManager.retain_entities = True
+
+    def tearDown(self):
+        EntityManager.retain_entities = False
 
     def test_entity_initialization(self):
         entity = Entity(name="TestEntity", creation_time=10)
@@ -25,11 +31,37 @@ class TestEntity(unittest.TestCase):
         expected_repr = "TestEntity (5)"
         self.assertEqual(repr(entity), expected_repr)
 
+    def test_entity_lazy_name(self):
+        entity = Entity(name=EntityName("Source1", 3), creation_time=10)
+        self.assertEqual(entity.name, "Source1_Entity_3")
+        self.assertEqual(repr(entity), "Source1_Entity_3 (10)")
+
+    def test_entity_has_no_instance_dict(self):
+        entity = Entity(name="TestEntity", creation_time=10)
+        self.assertFalse(hasattr(entity, '__dict__'))
+        self.assertFalse(hasattr(PriorityEntity(name="TestEntity", creation_time=10, priority=2), '__dict__'))
+
+    def test_entity_id_assigned_on_first_access(self):
+        first = Entity(name="Entity1", creation_time=0)
+        second = Entity(name="Entity2", creation_time=0)
+        self.assertEqual(first._id, -1)
+        self.assertEqual(second.id, second.id)
+        self.assertGreater(first.id, second.id)
+
+    def test_priority_entity(self):
+        self.assertEqual((Entity("Entity1", 0).priority, Entity("Entity1", 0).due_date), (0, None))
+        entity = PriorityEntity("Entity2", 0, priority=2, due_date=30)
+        self.assertEqual((entity.priority, entity.due_date), (2, 30))
+
 
 class TestEntityManager(unittest.TestCase):
     def setUp(self):
         # Clear EntityManager before each test
         EntityManager.destroy_all_entities()
+        EntityManager.retain_entities = True
+
+    def tearDown(self):
+        EntityManager.retain_entities = False
 
     def test_add_entity(self):
         entity1 = Entity(name="Entity1", creation_time=5)
@@ -43,12 +75,83 @@ class TestEntityManager(unittest.TestCase):
         entity2 = Entity(name="Entity2", creation_time=10)
         EntityManager.destroy_all_entities()
         self.assertEqual(len(EntityManager.entities), 0)
+        self.assertEqual(EntityManager.statistics.number_created, 0)
+
+    def test_entities_not_retained_by_default(self):
+        EntityManager.retain_entities = False
+        Entity(name="Entity1", creation_time=5)
+        self.assertEqual(len(EntityManager.entities), 0)
+        self.assertEqual(EntityManager.statistics.number_created, 1)
+
+    def test_destroy_entity(self):
+        entity = Entity(name="Entity1", creation_time=5)
+        EntityManager.destroy_entity(entity, 12)
+        self.assertEqual(entity.destruction_time, 12)
+        self.assertEqual(EntityManager.statistics.number_destroyed, 1)
+
+
+class TestEntityStatistics(unittest.TestCase):
+    def setUp(self):
+        self.statistics = EntityStatistics()
+
+    def tearDown(self):
+        gi.DURATION_WARM_UP = 0
+
+    def _destroy(self, creation_time, destruction_time):
+        entity = Entity(name="Entity", creation_time=creation_time)
+        self.statistics.record_creation(entity)
+        entity.destruction_time = destruction_time
+        self.statistics.record_destruction(entity)
+
+    def test_empty_statistics(self):
+        stats = self.statistics.calculate_statistics()
+        self.assertEqual(stats['AvgTimeInSystem'], 0)
+        self.assertEqual(stats['MinTimeInSystem'], 0)
+        self.assertEqual(stats['NumberCreated'], 0)
+
+    def test_time_in_system(self):
+        self._destroy(0, 4)
+        self._destroy(1, 3)
+        self.statistics.record_creation(Entity(name="Entity", creation_time=2))
+        stats = self.statistics.calculate_statistics()
+        self.assertEqual(stats['AvgTimeInSystem'], 3)
+        self.assertEqual(stats['MaxTimeInSystem'], 4)
+        self.assertEqual(stats['MinTimeInSystem'], 2)
+        self.assertEqual(stats['NumberCreated'], 3)
+        self.assertEqual(stats['NumberDestroyed'], 2)
+        self.assertEqual(stats['NumberInSystem'], 3)
+
+    def test_warm_up_filter_at_event_time(self):
+        gi.DURATION_WARM_UP = 5
+        self._destroy(0, 4)
+        self._destroy(1, 8)
+        stats = self.statistics.calculate_statistics()
+        self.assertEqual(stats['NumberCreated'], 1)
+        self.assertEqual(stats['NumberDestroyed'], 1)
+        self.assertEqual(stats['AvgTimeInSystem'], 7)
+
+    def test_number_in_system(self):
+        entity1 = Entity(name="Entity", creation_time=0)
+        entity2 = Entity(name="Entity", creation_time=1)
+        self.statistics.record_creation(entity1)
+        self.statistics.record_creation(entity2)
+        entity2.destruction_time = 3
+        self.statistics.record_destruction(entity2)
+        entity1.destruction_time = 4
+        self.statistics.record_destruction(entity1)
+        stats = self.statistics.calculate_statistics()
+        self.assertEqual(stats['AvgNumberInSystem'], 1.5)
+        self.assertEqual(stats['MaxNumberInSystem'], 2)
 
 
 class TestSubEntity(unittest.TestCase):
     def setUp(self):
         # Clear EntityManager before each test
         EntityManager.destroy_all_entities()
+        EntityManager.retain_entities = True
+
+    def tearDown(self):
+        EntityManager.retain_entities = False
 
     def test_subentity_initialization(self):
         sub_entity = SubEntity(name="TestSubEntity", creation_time=20)
@@ -73,6 +176,13 @@ class TestSubEntity(unittest.TestCase):
         sub_entity.add_to_server_history("Server2")
         self.assertEqual(sub_entity.server_history, ["Server1", "Server2"])
 
+    def test_server_history_is_compact(self):
+        sub_entity = SubEntity(name="TestSubEntity", creation_time=20)
+        sub_entity.add_to_server_history("Server1")
+        sub_entity.add_to_server_history("Server1")
+        self.assertEqual(sub_entity._server_history.itemsize, 2)
+        self.assertEqual(list(sub_entity._server_history), [ComponentIds.get("Server1")] * 2)
+
     def test_subentity_repr_without_destruction_time(self):
         sub_entity = SubEntity(name="TestSubEntity", creation_time=20)
         expected_repr = "TestSubEntity (20)"
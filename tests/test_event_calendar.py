@@ -0,0 +1,103 @@
+import unittest
+from src.core.event_calendar import EventCalendar
+from src.core.model import Model
+from src.core.queue_type import QueueType
+from src.core.server import Server
+from src.core.sink import Sink
+from src.core.source import Source
+from src.models.model4_1 import setup_model4_1
+from src.models.model_pcb import setup_model_pcb
+from src.models.model_work_schedule import setup_work_schedule
+from src.util.date_time import DateTime, TimeComponent
+from src.util.global_imports import random
+from src.util.simulations import run_simulation
+
+
+def setup_model_with_breakdowns_and_durations(env):
+    source1 = Source(env, "Source1", (random.expovariate, 1 / 1.25))
+    server1 = Server(env, "Server1", (random.expovariate, 1), queue_order=QueueType.LIFO,
+                     time_between_machine_breakdowns=(random.expovariate, 1 / 30),
+                     machine_breakdown_duration=(random.triangular, 1, 3, 2))
+    sink1 = Sink(env, "Sink1")
+
+    source1.connect(server1, process_duration=0.1)
+    server1.connect(sink1, process_duration=0.2)
+
+
+def setup_model_with_simultaneous_events(env):
+    source1 = Source(env, "Source1", (lambda: 0.5,))
+    server1 = Server(env, "Server1", (lambda: 1,), capacity=2, queue_order=QueueType.LIFO)
+    sink1 = Sink(env, "Sink1")
+
+    source1.connect(server1)
+    server1.connect(sink1)
+
+
+def setup_model_with_shortest_processing_time(env):
+    source1 = Source(env, "Source1", (random.expovariate, 1 / 1.1))
+    server1 = Server(env, "Server1", (random.expovariate, 1), queue_order=QueueType.SPT)
+    sink1 = Sink(env, "Sink1")
+
+    source1.connect(server1)
+    server1.connect(sink1)
+
+
+class TestEventCalendar(unittest.TestCase):
+
+    def test_events_in_time_and_scheduling_order(self):
+        calendar = EventCalendar()
+        calls = []
+        calendar.schedule(2, calls.append, 'c')
+        calendar.schedule(1, calls.append, 'a')
+        calendar.schedule(1, calls.append, 'b')
+        calendar.run()
+        self.assertEqual(calls, ['a', 'b', 'c'])
+        self.assertEqual(calendar.now, 2)
+
+    def test_run_until(self):
+        calendar = EventCalendar()
+        calls = []
+        calendar.schedule(1, calls.append, 1)
+        calendar.schedule(5, calls.append, 5)
+        calendar.run(until=5)
+        self.assertEqual(calls, [1])
+        self.assertEqual(calendar.now, 5)
+        self.assertEqual(len(calendar), 1)
+
+    def test_negative_delay(self):
+        with self.assertRaises(ValueError):
+            EventCalendar().schedule(-1, print)
+
+
+class TestEventCalendarMatchesSimPy(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(Model.current.activate)
+
+    def assert_same_statistics(self, model, minutes):
+        simpy_pivot = run_simulation(model=model, minutes=minutes)
+        event_calendar_pivot = run_simulation(model=model, minutes=minutes, event_calendar=True)
+        self.assertTrue(simpy_pivot.equals(event_calendar_pivot))
+
+    def test_model4_1(self):
+        self.assert_same_statistics(setup_model4_1, 1440)
+
+    def test_model_pcb(self):
+        self.assert_same_statistics(setup_model_pcb, 1440)
+
+    def test_breakdowns_and_process_durations(self):
+        self.assert_same_statistics(setup_model_with_breakdowns_and_durations, 1440)
+
+    def test_simultaneous_events(self):
+        self.assert_same_statistics(setup_model_with_simultaneous_events, 1440)
+
+    def test_shortest_processing_time(self):
+        self.assert_same_statistics(setup_model_with_shortest_processing_time, 1440)
+
+    def test_work_schedule(self):
+        DateTime.map(TimeComponent.minute)
+        self.assert_same_statistics(setup_work_schedule, 10080)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.entity import Entity, EntityManager, EntityName
+from src.core.model import Model
+from src.models.model4_1 import setup_model4_1
+from src.util.event_trace import EventTrace, TraceEvent
+from src.util.simulations import run_simulation
+
+
+class TestEventTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(EventTrace.stop)
+        self.addCleanup(EntityManager.destroy_all_entities)
+
+    def test_records(self):
+        trace = EventTrace(capacity=10)
+        entity = Entity(EntityName("Source1", 0), 1)
+        trace.record(1, TraceEvent.CREATED, "Source1", entity)
+        trace.record(2.5, TraceEvent.PROCESSED, "Server1", entity, 1.5)
+        trace.record(3, TraceEvent.FAILURE, "Server1")
+        records = trace.records()
+        np.testing.assert_array_equal(records['time'], [1, 2.5, 3])
+        np.testing.assert_array_equal(records['code'], [TraceEvent.CREATED, TraceEvent.PROCESSED, TraceEvent.FAILURE])
+        np.testing.assert_array_equal(records['entity'], [entity.id, entity.id, -1])
+        self.assertEqual(records['component'][1], records['component'][2])
+        self.assertEqual(records['value'][1], 1.5)
+
+        dataframe = trace.to_dataframe()
+        self.assertEqual(list(dataframe['Event']), ['CREATED', 'PROCESSED', 'FAILURE'])
+        self.assertEqual(list(dataframe['Component']), ['Source1', 'Server1', 'Server1'])
+        self.assertEqual(list(dataframe['Entity'][:2]), ['Source1_Entity_0', 'Source1_Entity_0'])
+        self.assertTrue(dataframe['Entity'].isna()[2])
+
+        lines = trace.render()
+        self.assertTrue(lines[0].startswith("Source1 created Source1_Entity_0 "))
+        self.assertTrue(lines[1].startswith("Server1 processing Source1_Entity_0 done, time 1.5 "))
+
+    def test_ring_buffer_keeps_the_latest_records(self):
+        trace = EventTrace(capacity=4)
+        for time in range(10):
+            trace.record(time, TraceEvent.STARTS_PROCESSING, "Server1")
+        self.assertEqual(trace.number_of_records, 10)
+        np.testing.assert_array_equal(trace.records()['time'], [6, 7, 8, 9])
+
+    def test_log_records_keeps_every_record(self):
+        trace = EventTrace(capacity=4, log_records=True)
+        with self.assertLogs(level='TRACE') as logs:
+            for time in range(10):
+                trace.record(time, TraceEvent.STARTS_PROCESSING, "Server1")
+            self.assertEqual(len(logs.output), 8)
+            trace.log()
+        self.assertEqual(len(logs.output), 10)
+        self.assertEqual(len(trace.records()), 0)
+
+    def test_log_warns_about_overwritten_records(self):
+        trace = EventTrace(capacity=4)
+        for time in range(10):
+            trace.record(time, TraceEvent.STARTS_PROCESSING, "Server1")
+        with self.assertLogs(level='TRACE') as logs:
+            trace.log()
+        self.assertIn("overwrote the first 6 of 10 records", logs.output[0])
+        self.assertEqual(len(logs.output), 5)
+
+    def test_memory_mapped_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.bin")
+            trace = EventTrace(capacity=8, path=path)
+            trace.record(5, TraceEvent.SHIFT_STARTS, "Server1", value=2)
+            trace.buffer.flush()
+            records = np.memmap(path, EventTrace.RECORD_DTYPE, 'r')
+            self.assertEqual(len(records), 8)
+            self.assertEqual(records['time'][0], 5)
+            self.assertEqual(records['value'][0], 2)
+            del trace, records
+
+
+class TestEventTraceOfRun(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(Model.current.activate)
+
+    def test_run_simulation(self):
+        for event_calendar in (False, True):
+            trace = EventTrace()
+            pivot_table = run_simulation(model=setup_model4_1, minutes=1440, event_trace=trace,
+                                         event_calendar=event_calendar)
+            self.assertIsNone(EventTrace.active)
+            events = trace.to_dataframe()
+            created = (events['Event'] == 'CREATED').sum()
+            self.assertEqual(created, pivot_table.loc[('Source', 'Source1', 'NumberCreated'), 'Value'])
+            self.assertEqual((events['Event'] == 'DESTROYED').sum(),
+                             pivot_table.loc[('Sink', 'Sink1', 'NumberEntered'), 'Value'])
+            self.assertTrue(np.all(np.diff(events['Time']) >= 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
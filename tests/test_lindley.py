@@ -0,0 +1,85 @@
+import unittest
+import numpy as np
+from src.core.event_calendar import EventCalendar
+from src.core.model import Model
+from src.core.queue_type import QueueType
+from src.core.server import Server
+from src.core.sink import Sink
+from src.core.source import Source
+from src.models.model4_1 import setup_model4_1
+from src.models.model_pcb import setup_model_pcb
+from src.util.global_imports import random, set_duration_warm_up
+from src.util.lindley import LindleyNetwork, lindley_departure_times
+from src.util.simulations import run_simulation
+
+
+def setup_feed_forward_model(env):
+    source1 = Source(env, "Source1", (random.expovariate, 1 / 2))
+    source2 = Source(env, "Source2", (random.expovariate, 1 / 3))
+    server1 = Server(env, "Server1", (random.expovariate, 1))
+    server2 = Server(env, "Server2", (random.uniform, 0.5, 1.5))
+    server3 = Server(env, "Server3", (random.triangular, 0.2, 1, 0.5))
+    sink1 = Sink(env, "Sink1")
+    sink2 = Sink(env, "Sink2")
+
+    source1.connect(server1, 70)
+    source1.connect(server2, 30)
+    source2.connect(server2)
+    server1.connect(server3)
+    server2.connect(server3, 50)
+    server2.connect(sink2, 50)
+    server3.connect(sink1)
+
+
+def setup_lifo_model(env):
+    source1 = Source(env, "Source1", (random.expovariate, 1 / 1.25))
+    server1 = Server(env, "Server1", (random.expovariate, 1), queue_order=QueueType.LIFO)
+    sink1 = Sink(env, "Sink1")
+
+    source1.connect(server1)
+    server1.connect(sink1)
+
+
+class TestLindley(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(Model.current.activate)
+        self.addCleanup(set_duration_warm_up, 0)
+
+    def assert_same_statistics(self, model, minutes, warm_up=0):
+        event_pivot = run_simulation(model=model, minutes=minutes, warm_up=warm_up)
+        fast_path_pivot = run_simulation(model=model, minutes=minutes, warm_up=warm_up, fast_path=True)
+        np.testing.assert_allclose(fast_path_pivot['Value'].astype(float), event_pivot['Value'].astype(float),
+                                   rtol=1e-6, atol=1e-4)
+
+    def test_departure_times(self):
+        rng = np.random.default_rng(1)
+        arrival_times = np.cumsum(rng.exponential(1.25, 1000))
+        processing_times = rng.exponential(1, 1000)
+        departure_times = []
+        departure_time = 0
+        for arrival_time, processing_time in zip(arrival_times, processing_times):
+            departure_time = max(arrival_time, departure_time) + processing_time
+            departure_times.append(departure_time)
+        np.testing.assert_allclose(lindley_departure_times(arrival_times, processing_times), departure_times)
+
+    def test_model4_1_matches_event_simulation(self):
+        self.assert_same_statistics(setup_model4_1, 10080)
+
+    def test_feed_forward_model_matches_event_simulation(self):
+        self.assert_same_statistics(setup_feed_forward_model, 10080, warm_up=100)
+
+    def test_qualification(self):
+        for model, qualifies in [(setup_model4_1, True), (setup_feed_forward_model, True),
+                                 (setup_model_pcb, False), (setup_lifo_model, False)]:
+            with Model():
+                env = EventCalendar()
+                model(env)
+                self.assertEqual(LindleyNetwork.from_environment(env) is not None, qualifies, model.__name__)
+
+    def test_fall_back_to_event_simulation(self):
+        self.assert_same_statistics(setup_model_pcb, 1440)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+from src.core.model import Model
+from src.core.server import Server
+from src.core.sink import Sink
+from src.core.source import Source
+from src.models.model4_1 import setup_model4_1
+from src.models.model_pcb import setup_model_pcb
+from src.util.global_imports import random, set_duration_warm_up
+from src.util.lockstep import LockstepReplications, VariateBuffer
+from src.util.simulations import calculate_statistics, replication
+
+
+def setup_model_with_capacity_and_loops(env):
+    source1 = Source(env, "Source1", (random.expovariate, 1 / 0.7))
+    server1 = Server(env, "Server1", (random.expovariate, 1), capacity=2)
+    server2 = Server(env, "Server2", (random.uniform, 0.1, 0.5))
+    sink1 = Sink(env, "Sink1")
+
+    source1.connect(server1)
+    server1.connect(server2, 60)
+    server1.connect(sink1, 40)
+    server2.connect(server1, 30)
+    server2.connect(sink1, 70)
+
+
+class TestLockstep(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(Model.current.activate)
+        self.addCleanup(set_duration_warm_up, 0)
+
+    def assert_same_statistics(self, expected, actual):
+        if isinstance(expected, dict):
+            self.assertEqual(expected.keys(), actual.keys())
+            for key in expected:
+                self.assert_same_statistics(expected[key], actual[key])
+        elif isinstance(expected, (list, tuple)):
+            self.assertEqual(len(expected), len(actual))
+            for expected_value, actual_value in zip(expected, actual):
+                self.assert_same_statistics(expected_value, actual_value)
+        elif isinstance(expected, str) or expected is None:
+            self.assertEqual(expected, actual)
+        else:
+            np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-4)
+
+    def assert_matches_replications(self, model, minutes, num_replications, warm_up=0, antithetic=False):
+        set_duration_warm_up(warm_up)
+        lockstep_results = LockstepReplications.from_model(model, num_replications, antithetic).run(minutes)
+        for r, lockstep_result in enumerate(lockstep_results):
+            result = replication(model, calculate_statistics, minutes, r, antithetic, event_calendar=True)
+            self.assert_same_statistics(result, lockstep_result)
+
+    def test_variate_buffer_matches_single_draws(self):
+        streams = [random.Random(seed) for seed in range(3)]
+        buffer = VariateBuffer([lambda count, stream=stream: np.array([stream.random() for _ in range(count)])
+                                for stream in streams], 4)
+        values = [buffer.next(np.array([0, 2])) for _ in range(5)] + [buffer.next(np.array([1]))]
+        expected_streams = [random.Random(seed) for seed in range(3)]
+        expected = [[expected_streams[0].random(), expected_streams[2].random()] for _ in range(5)] + \
+                   [[expected_streams[1].random()]]
+        for actual_values, expected_values in zip(values, expected):
+            np.testing.assert_array_equal(actual_values, expected_values)
+
+    def test_model4_1_matches_replications(self):
+        self.assert_matches_replications(setup_model4_1, 1440, 4)
+
+    def test_capacity_and_loops_match_replications(self):
+        self.assert_matches_replications(setup_model_with_capacity_and_loops, 1440, 4, warm_up=100)
+
+    def test_antithetic_replications(self):
+        self.assert_matches_replications(setup_model4_1, 1440, 4, antithetic=True)
+
+    def test_unsupported_model(self):
+        self.assertIsNone(LockstepReplications.from_model(setup_model_pcb, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,17 @@
+import gc
 import unittest
+import weakref
 from unittest.mock import MagicMock
+from src.core.entity import Entity, EntityManager
+from src.core.event_calendar import EventCalendar
 from src.core.resetable_named_object import ResetAbleNamedObjectManager
 from src.core.model import Model, ComponentType
+from src.core.server import Server
+from src.core.sink import Sink
+from src.core.source import Source
+from src.models.model4_1 import setup_model4_1
+from src.util.random_streams import RandomStreams
+from src.util.simulations import calculate_statistics, replication, run_simulation
 
 
 class TestModel(unittest.TestCase):
@@ -65,5 +75,64 @@ class TestModel(unittest.TestCase):
             self.model.add_component("InvalidComponent", "InvalidType")
 
 
+class TestModelContext(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(Model.current.activate)
+
+    def test_components_belong_to_the_active_context(self):
+        with Model() as first:
+            setup_model4_1(EventCalendar())
+            Entity("Entity1", 0)
+        with Model() as second:
+            Source(EventCalendar(), "Source1")
+            self.assertEqual(len(Server.servers), 0)
+            self.assertEqual(EntityManager.statistics.number_created, 0)
+
+        self.assertIsNot(Model.current, first)
+        self.assertIs(first.get_component("Server1", ComponentType.SERVERS), first.components[ComponentType.SERVERS]
+                      .resetable_named_objects[0])
+        self.assertIsNone(first.get_component("Server2", ComponentType.SERVERS))
+        self.assertEqual(len(second.components[ComponentType.SOURCES]), 1)
+        self.assertEqual(first.entity_statistics.number_created, 1)
+
+        first.activate()
+        self.assertEqual([sink.name for sink in Sink.sinks], ["Sink1"])
+
+    def test_random_streams_of_the_context(self):
+        with Model(seed=3, antithetic=True) as context:
+            self.assertIs(RandomStreams.seed_sequence, context.seed_sequence)
+            self.assertTrue(RandomStreams.antithetic)
+
+    def test_replication_discards_its_components(self):
+        previous = Model.current
+        number_of_servers = len(Server.servers)
+        first = replication(setup_model4_1, calculate_statistics, 600, 0, event_calendar=True)
+        second = replication(setup_model4_1, calculate_statistics, 600, 0, event_calendar=True)
+
+        self.assertIs(Model.current, previous)
+        self.assertEqual(len(Server.servers), number_of_servers)
+        self.assertEqual(first[0], second[0])
+        self.assertEqual(len(first[1]), 1)
+
+    def test_finished_context_is_discarded(self):
+        run_simulation(setup_model4_1, 600, log_pivot=False)
+        finished = weakref.ref(Model.current)
+        server = next(iter(Server.servers))
+        finished_server, finished_env = weakref.ref(server), weakref.ref(server.env)
+        del server
+        run_simulation(setup_model4_1, 600, log_pivot=False)
+        with Model() as context:
+            pass
+        gc.collect()
+
+        # nothing of the finished run is kept, neither the context nor its components and environment
+        self.assertIsNone(finished())
+        self.assertIsNone(finished_server())
+        self.assertIsNone(finished_env())
+        self.assertIsNone(Model.current.previous)
+        self.assertIsNone(context.previous)
+
+
 if __name__ == "__main__":
     unittest.main()
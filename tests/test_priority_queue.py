@@ -0,0 +1,92 @@
+import unittest
+from src.core.entity import Entity, EntityManager, PriorityEntity
+from src.core.event_calendar import EventCalendar
+from src.core.model import Model
+from src.core.priority_queue import PRIORITY_KEYS, PriorityQueue
+from src.core.queue_type import QueueType
+from src.core.server import Server
+from src.core.sink import Sink
+from src.util.global_imports import random
+
+
+class TestPriorityQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(EntityManager.destroy_all_entities)
+
+    def test_priority_order_with_stable_ties(self):
+        queue = PriorityQueue(PRIORITY_KEYS[QueueType.PRIORITY])
+        entities = [PriorityEntity(f"Entity{i}", 0, priority=priority) for i, priority in enumerate([2, 1, 2, 0, 1])]
+        for entity in entities:
+            queue.append(entity)
+        self.assertEqual(len(queue), 5)
+        self.assertEqual(list(queue), [entities[i] for i in (3, 1, 4, 0, 2)])
+        self.assertEqual([queue.popleft() for _ in range(5)], [entities[i] for i in (3, 1, 4, 0, 2)])
+        self.assertFalse(queue)
+        with self.assertRaises(IndexError):
+            queue.popleft()
+
+    def test_due_dates(self):
+        queue = PriorityQueue(PRIORITY_KEYS[QueueType.EDD])
+        without_due_date = Entity("Entity1", 0)
+        late = PriorityEntity("Entity2", 0, due_date=20)
+        early = PriorityEntity("Entity3", 0, due_date=10)
+        for entity in (without_due_date, late, early):
+            queue.append(entity)
+        self.assertEqual([queue.pop() for _ in range(3)], [early, late, without_due_date])
+
+    def test_lazy_removal(self):
+        queue = PriorityQueue(PRIORITY_KEYS[QueueType.PRIORITY])
+        entities = [PriorityEntity(f"Entity{i}", 0, priority=i) for i in range(100)]
+        for entity in entities:
+            queue.append(entity)
+        for entity in entities[:90]:
+            queue.remove(entity)
+        self.assertEqual(len(queue), 10)
+        self.assertNotIn(entities[0], queue)
+        self.assertLess(len(queue.heap), 100)
+        self.assertEqual([queue.popleft() for _ in range(10)], entities[90:])
+
+    def test_clear(self):
+        queue = PriorityQueue(PRIORITY_KEYS[QueueType.PRIORITY])
+        queue.append(Entity("Entity1", 0))
+        queue.clear()
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(queue.heap, [])
+
+
+class TestServerQueueOrders(unittest.TestCase):
+
+    def setUp(self):
+        # the servers of every test are built in a context of their own
+        self.addCleanup(Model.current.activate)
+        Model().activate()
+
+    def test_queue_types(self):
+        env = EventCalendar()
+        for queue_order in QueueType:
+            server = Server(env, queue_order.name, (random.expovariate, 1), queue_order=queue_order)
+            self.assertEqual(isinstance(server.server_queue, PriorityQueue), queue_order in PRIORITY_KEYS)
+
+    def test_shortest_processing_time_first(self):
+        env = EventCalendar()
+        processing_times = iter([5, 3, 1, 2])
+        server = Server(env, "Server1", (lambda: next(processing_times),), queue_order=QueueType.SPT)
+        sink = Sink(env, "Sink1")
+        server.connect(sink)
+        processed = []
+        server.route_entity = processed.append
+        entities = [Entity(f"Entity{i}", 0) for i in range(4)]
+        env.run(until=0)
+        for entity in entities:
+            server.handle_entity_arrival(entity)
+        env.run(until=20)
+
+        # all entities are queued before the processing wakes up, so they are processed with 1, 2, 3 and 5 minutes
+        self.assertEqual(processed, [entities[i] for i in (2, 3, 1, 0)])
+        self.assertEqual(env.now, 20)
+        self.assertEqual(server.total_processing_time_pivot_table, 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
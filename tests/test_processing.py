@@ -1,6 +1,6 @@
 import simpy
 import unittest
-from src.core.entity import Entity
+from src.core.entity import Entity, EntityManager
 from src.core.server import Server
 from src.core.sink import Sink
 from src.core.source import Source
@@ -11,6 +11,8 @@ class TestCases(unittest.TestCase):
 
     def setUp(self):
         self.env = simpy.Environment()
+        EntityManager.retain_entities = True
+        self.addCleanup(setattr, EntityManager, 'retain_entities', False)
 
     def test_entity_lifecycle(self):
         source = Source(self.env, "TestSource", (random.expovariate, 1 / 6))
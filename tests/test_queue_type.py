@@ -7,11 +7,18 @@ class TestQueueType(unittest.TestCase):
         self.assertEqual(QueueType.FIFO.value, 0)
         # Test the value of LIFO
         self.assertEqual(QueueType.LIFO.value, 1)
+        # Test the values of the heap-based queue orders
+        self.assertEqual(QueueType.PRIORITY.value, 2)
+        self.assertEqual(QueueType.SPT.value, 3)
+        self.assertEqual(QueueType.EDD.value, 4)
 
     def test_enum_members(self):
         """Test the enum members for proper names"""
         self.assertEqual(QueueType.FIFO.name, 'FIFO')
         self.assertEqual(QueueType.LIFO.name, 'LIFO')
+        self.assertEqual(QueueType.PRIORITY.name, 'PRIORITY')
+        self.assertEqual(QueueType.SPT.name, 'SPT')
+        self.assertEqual(QueueType.EDD.name, 'EDD')
 
     def test_enum_type(self):
         """Test that the enum members are of the correct type"""
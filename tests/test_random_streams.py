@@ -0,0 +1,75 @@
+import unittest
+import random
+import simpy
+from src.core.server import Server
+from src.core.source import Source
+from src.util.distribution_stream import DistributionStream
+from src.util.random_streams import AntitheticRandom, RandomStreams
+
+
+class TestRandomStreams(unittest.TestCase):
+
+    def setUp(self):
+        RandomStreams.seed(1)
+
+    def test_streams_are_deterministic(self):
+        first = RandomStreams.random('Server1', 'processing').random()
+        RandomStreams.seed(1)
+        second = RandomStreams.random('Server1', 'processing').random()
+        self.assertEqual(first, second)
+
+    def test_streams_differ_by_component_purpose_and_seed(self):
+        values = {RandomStreams.random('Server1', 'processing').random(),
+                  RandomStreams.random('Server2', 'processing').random(),
+                  RandomStreams.random('Server1', 'routing').random()}
+        RandomStreams.seed(2)
+        values.add(RandomStreams.random('Server1', 'processing').random())
+        self.assertEqual(len(values), 4)
+
+    def test_bind_random_module_distribution(self):
+        dwp = RandomStreams.bind((random.expovariate, 1), 'Server1', 'processing')
+        self.assertIsNot(dwp[0].__self__, random._inst)
+        self.assertEqual(dwp[0].__name__, 'expovariate')
+        self.assertEqual(dwp[1:], (1,))
+        self.assertEqual(dwp[0](*dwp[1:]), RandomStreams.random('Server1', 'processing').expovariate(1))
+
+    def test_bind_distribution_stream(self):
+        dwp = RandomStreams.bind((DistributionStream('exponential', 1),), 'Server1', 'processing')
+        expected = RandomStreams.generator('Server1', 'processing').exponential(1)
+        self.assertEqual(dwp[0](), expected)
+
+    def test_antithetic_streams_use_complementary_uniforms(self):
+        self.addCleanup(RandomStreams.seed, 1)
+        RandomStreams.seed(1, antithetic=False)
+        uniforms = [RandomStreams.random('Server1', 'processing').random()]
+        normal_stream = RandomStreams.bind((DistributionStream('normal', 5, 1),), 'Server1', 'processing')[0]
+        RandomStreams.seed(1, antithetic=True)
+        complements = [RandomStreams.random('Server1', 'processing').random()]
+        antithetic_stream = RandomStreams.bind((DistributionStream('normal', 5, 1),), 'Server1', 'processing')[0]
+
+        self.assertIsInstance(RandomStreams.random('Server1', 'processing'), AntitheticRandom)
+        self.assertAlmostEqual(uniforms[0] + complements[0], 1)
+        for _ in range(10):
+            self.assertAlmostEqual(normal_stream() + antithetic_stream(), 10)
+
+    def test_bind_leaves_other_distributions_unchanged(self):
+        dwp = (lambda: 1,)
+        self.assertIs(RandomStreams.bind(dwp, 'Server1', 'processing'), dwp)
+        self.assertIsNone(RandomStreams.bind(None, 'Server1', 'processing'))
+
+    def test_common_random_numbers_across_scenarios(self):
+        """Adding a server does not change the random numbers of the other components."""
+        def processing_times(with_additional_server):
+            RandomStreams.seed(1)
+            env = simpy.Environment()
+            Source(env, 'Source1', (random.expovariate, 1))
+            if with_additional_server:
+                Server(env, 'Additional', (random.expovariate, 1))
+            server = Server(env, 'Server1', (random.expovariate, 1))
+            return [server.processing_time_dwp[0](*server.processing_time_dwp[1:]) for _ in range(5)]
+
+        self.assertEqual(processing_times(False), processing_times(True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import concurrent.futures
+import unittest
+import numpy as np
+import pandas as pd
+from src.util.replication_results import ReplicationAggregator, SharedResults, StatAccumulator, StatLayout
+from src.util.simulations import create_pivot
+
+
+def write_replication(shared_results, r):
+    shared_results.write(r, ({'AvgTimeInSystem': r}, [{'Server': 'Server1', 'NumberExited': 2 * r}], {}, {}))
+    shared_results.close()
+
+
+class TestStatLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.layout = StatLayout(['AvgTimeInSystem', 'MinTimeInSystem'], ['Server1'], ['NumberExited'],
+                                 ['Sink1'], ['AvgTimeInSystem'], [], [])
+        self.results = [({'AvgTimeInSystem': value, 'MinTimeInSystem': None},
+                         [{'Server': 'Server1', 'NumberExited': 10 * value}],
+                         {'Sink1': {'AvgTimeInSystem': value / 2}}, {})
+                        for value in [1.0, 3.0, 2.0, 4.0, 5.0, 1.0]]
+
+    def test_from_result(self):
+        layout = StatLayout.from_result(self.results[0], ['AvgTimeInSystem', 'MinTimeInSystem'], ['NumberExited'],
+                                        ['AvgTimeInSystem'], [])
+        self.assertEqual(layout.keys, self.layout.keys)
+
+    def test_other_components(self):
+        entity_stats, server_stats, _, source_stats = self.results[0]
+        with self.assertRaisesRegex(ValueError, "Sink1"):
+            self.layout.write(np.empty(len(self.layout)),
+                              (entity_stats, server_stats, {'Sink2': {'AvgTimeInSystem': 1.0}}, source_stats))
+
+    def test_pivot(self):
+        values = np.empty((len(self.results), len(self.layout)))
+        for r, result in enumerate(self.results):
+            self.layout.write(values[r], result)
+        self.assertTrue(np.isnan(values[:, 1]).all())
+
+        pivot = self.layout.pivot(values)
+        self.assertNotIn(('Entity', 'Entity', 'MinTimeInSystem'), pivot.index)
+        row = pivot.loc[('Server', 'Server1', 'NumberExited')]
+        self.assertEqual(list(row[['Average', 'Minimum', 'Maximum']]), [26.6667, 10.0, 50.0])
+        self.assertAlmostEqual(row['Half-Width'], round(1.96 * np.std(values[:, 2]) / np.sqrt(6), 4))
+
+        # the average and half-width of antithetic replications are the ones of the pair means
+        row = self.layout.pivot(values, antithetic=True).loc[('Entity', 'Entity', 'AvgTimeInSystem')]
+        pair_means = np.array([2.0, 3.0, 3.0])
+        self.assertAlmostEqual(row['Average'], round(pair_means.mean(), 4))
+        self.assertAlmostEqual(row['Half-Width'], round(1.96 * np.std(pair_means) / np.sqrt(3), 4))
+        self.assertEqual(list(row[['Minimum', 'Maximum']]), [1.0, 5.0])
+
+    def test_pivot_as_create_pivot(self):
+        aggregator = ReplicationAggregator(self.layout)
+        for result in self.results:
+            aggregator.add(result)
+        expected = create_pivot([entity for entity, _, _, _ in self.results],
+                                {'Server1': [server for _, (server,), _, _ in self.results]},
+                                {'Sink1': [sinks['Sink1'] for _, _, sinks, _ in self.results]}, {},
+                                ['AvgTimeInSystem', 'MinTimeInSystem'], ['NumberExited'], ['AvgTimeInSystem'],
+                                [], log_pivot=False)
+        self.assertTrue(aggregator.pivot().equals(expected))
+
+
+class TestReplicationAggregator(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.values = rng.normal(100, 10, (101, 3))
+        self.values[rng.random(self.values.shape) < 0.2] = np.nan
+        self.values[:, 2] = np.nan
+
+    def test_accumulator(self):
+        one_by_one = StatAccumulator(3)
+        for row in self.values:
+            one_by_one.update(row)
+        blocks = StatAccumulator(3)
+        for first in range(0, len(self.values), 30):
+            blocks.update_many(self.values[first:first + 30])
+
+        for accumulator in (one_by_one, blocks):
+            np.testing.assert_array_equal(accumulator.count, np.sum(~np.isnan(self.values), axis=0))
+            np.testing.assert_allclose(accumulator.mean[:2], np.nanmean(self.values[:, :2], axis=0))
+            np.testing.assert_allclose(accumulator.half_width()[:2],
+                                       1.96 * np.nanstd(self.values[:, :2], axis=0) /
+                                       np.sqrt(accumulator.count[:2]))
+            np.testing.assert_array_equal(accumulator.minimum[:2], np.nanmin(self.values[:, :2], axis=0))
+            np.testing.assert_array_equal(accumulator.maximum[:2], np.nanmax(self.values[:, :2], axis=0))
+            self.assertTrue(np.isnan(accumulator.half_width()[2]))
+
+    def test_rows_and_blocks(self):
+        layout = StatLayout(['AvgTimeInSystem', 'MaxTimeInSystem', 'MinTimeInSystem'], [], [], [], [], [], [])
+        values = self.values[:100]
+        for antithetic in (False, True):
+            one_by_one = ReplicationAggregator(layout, antithetic)
+            for row in values:
+                one_by_one.add_row(row)
+            # blocks of odd sizes split the antithetic pairs
+            blocks = ReplicationAggregator(layout, antithetic)
+            for first in range(0, len(values), 33):
+                blocks.add_rows(values[first:first + 33])
+
+            self.assertEqual(blocks.number_of_replications, 100)
+            pd.testing.assert_frame_equal(one_by_one.pivot(), blocks.pivot())
+            self.assertEqual(len(blocks.pivot()), 2)
+
+
+class TestSharedResults(unittest.TestCase):
+
+    def test_workers_write_into_shared_memory(self):
+        layout = StatLayout(['AvgTimeInSystem'], ['Server1'], ['NumberExited'], [], [], [], [])
+        shared_results = SharedResults(layout, 4)
+        self.addCleanup(shared_results.unlink)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+            list(executor.map(write_replication, [shared_results] * 3, range(3)))
+
+        np.testing.assert_array_equal(shared_results.values[:3], [[0, 0], [1, 2], [2, 4]])
+        self.assertTrue(np.isnan(shared_results.values[3]).all())
+
+    def test_window(self):
+        layout = StatLayout(['AvgTimeInSystem'], ['Server1'], ['NumberExited'], [], [], [], [])
+        shared_results = SharedResults(layout, 2, first_replication=4)
+        self.addCleanup(shared_results.unlink)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+            list(executor.map(write_replication, [shared_results] * 2, range(4, 6)))
+
+        np.testing.assert_array_equal(shared_results.values, [[4, 8], [5, 10]])
+
+
+if __name__ == '__main__':
+    unittest.main()
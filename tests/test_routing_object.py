@@ -1,9 +1,7 @@
 import unittest
 from unittest.mock import MagicMock, patch
 from src.core.routing_object import RoutingObject
-# Mock random.uniform
-import random
-random.uniform = MagicMock()
+from src.core.routing_table import RoutingTable
 
 
 # Mock the Entity class
@@ -40,6 +38,7 @@ class TestRoutingObject(unittest.TestCase):
         self.assertEqual(routing_object.next_components, [])
         self.assertEqual(routing_object.number_exited, 0)
         self.assertEqual(routing_object.connection_cache, {})
+        self.assertEqual(len(routing_object.routing_table), 0)
         self.assertEqual(routing_object.connections, {})
 
     def test_route_entity_with_routing_expression(self):
@@ -51,22 +50,17 @@ class TestRoutingObject(unittest.TestCase):
         routing_object.route_entity(entity)
         func.assert_called_once_with(routing_object, entity, 'arg1', 'arg2')
 
-    @patch('random.uniform')
-    def test_route_entity_without_routing_expression(self, mock_uniform):
+    @patch('random.random')
+    def test_route_entity_without_routing_expression(self, mock_random):
         """Test route_entity when routing_expression is None."""
         routing_object = RoutingObject(self.env)
         entity = Entity()
-        # Set up connection_cache
+        # Set up routing table
         mock_server1 = MagicMock()
-        mock_server1.process_entity = MagicMock()
         mock_server2 = MagicMock()
-        mock_server2.process_entity = MagicMock()
-        routing_object.connection_cache = {
-            50: mock_server1,
-            100: mock_server2
-        }
+        routing_object.routing_table = RoutingTable([mock_server1, mock_server2], [50, 50])
         # Test decision <= 50
-        mock_uniform.return_value = 30
+        mock_random.return_value = 0.3
         routing_object.route_entity(entity)
         mock_server1.handle_entity_arrival.assert_called_once_with(entity)
         mock_server2.handle_entity_arrival.assert_not_called()
@@ -74,23 +68,16 @@ class TestRoutingObject(unittest.TestCase):
         mock_server1.handle_entity_arrival.reset_mock()
         mock_server2.handle_entity_arrival.reset_mock()
         # Test 50 < decision <= 100
-        mock_uniform.return_value = 70
+        mock_random.return_value = 0.7
         routing_object.route_entity(entity)
         mock_server1.handle_entity_arrival.assert_not_called()
         mock_server2.handle_entity_arrival.assert_called_once_with(entity)
 
-    @patch('random.uniform')
-    def test_route_entity_no_match_in_connection_cache(self, mock_uniform):
-        """Test route_entity when no cumulative_probability matches the decision."""
+    def test_route_entity_without_connections(self):
+        """Test route_entity when the routing table is empty."""
         routing_object = RoutingObject(self.env)
-        entity = Entity()
-        mock_server1 = MagicMock()
-        routing_object.connection_cache = {
-            50: mock_server1,
-        }
-        mock_uniform.return_value = 70
-        routing_object.route_entity(entity)
-        mock_server1.handle_entity_arrival.assert_not_called()
+        self.assertIsNone(routing_object.select_connection())
+        routing_object.route_entity(Entity())
 
     def test_connect_valid_next_server(self):
         """Test connect method with a valid next server."""
@@ -0,0 +1,65 @@
+import unittest
+from collections import Counter
+import numpy as np
+from src.core.routing_table import RoutingTable
+
+
+class MockConnection:
+    def __init__(self, name, probability=None):
+        self.name = name
+        self.probability = probability
+
+
+class TestRoutingTable(unittest.TestCase):
+
+    def test_empty_table(self):
+        routing_table = RoutingTable()
+        self.assertEqual(len(routing_table), 0)
+        self.assertIsNone(routing_table.sample(0.5))
+
+    def test_bisect_selection(self):
+        routing_table = RoutingTable(['a', 'b', 'c'], [66, 8, 26])
+        self.assertIsNone(routing_table.aliases)
+        self.assertEqual(routing_table.sample(0.0), 'a')
+        self.assertEqual(routing_table.sample(0.659), 'a')
+        self.assertEqual(routing_table.sample(0.66), 'a')
+        self.assertEqual(routing_table.sample(0.7), 'b')
+        self.assertEqual(routing_table.sample(0.75), 'c')
+        self.assertEqual(routing_table.sample(0.9999), 'c')
+
+    def test_zero_probability_connection_is_never_selected(self):
+        # equal cumulative probabilities silently dropped connections in the former dict-based cache
+        routing_table = RoutingTable(['a', 'never', 'b'], [50, 0, 50])
+        selected = {routing_table.sample(i / 1000) for i in range(1000)}
+        self.assertEqual(selected, {'a', 'b'})
+
+    def test_from_connections(self):
+        connections = {'Sink1': MockConnection('Sink1', 40), 'Sink2': MockConnection('Sink2', 60)}
+        routing_table = RoutingTable.from_connections(connections)
+        self.assertEqual(routing_table.cumulative_probabilities, [40, 100])
+        self.assertEqual(routing_table.sample(0.5).name, 'Sink2')
+
+    def test_alias_table_for_large_fan_out(self):
+        number_of_connections = 60
+        probabilities = [1 + i % 3 for i in range(number_of_connections)]
+        total = sum(probabilities)
+        probabilities = [probability * 100 / total for probability in probabilities]
+        routing_table = RoutingTable(list(range(number_of_connections)), probabilities)
+        self.assertIsNotNone(routing_table.aliases)
+
+        samples = 60_000
+        counts = Counter(routing_table.sample((i + 0.5) / samples) for i in range(samples))
+        for connection, probability in enumerate(probabilities):
+            self.assertAlmostEqual(counts[connection] / samples, probability / 100, delta=0.002)
+
+    def test_sample_indices_matches_sample(self):
+        uniforms = np.random.default_rng(1).random(1000)
+        for number_of_connections in [3, 20]:
+            connections = list(range(number_of_connections))
+            routing_table = RoutingTable(connections, [100 / number_of_connections] * number_of_connections)
+            self.assertEqual(routing_table.sample_indices(uniforms).tolist(),
+                             [routing_table.sample(uniform) for uniform in uniforms])
+
+
+if __name__ == '__main__':
+    unittest.main()
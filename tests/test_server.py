@@ -87,7 +87,7 @@ def mock_create_connection_cache(component):
         component.connection_cache[cumulative_probability] = connection.next_component
 
 
-def mock_ask_work_schedule(current_time, week):
+def mock_next_shift_change(current_time, week):
     return False, 1, None  # Not working time, wait for 1 time unit
 
 
@@ -110,9 +110,11 @@ class TestServer(unittest.TestCase):
         self.create_connection_cache_patch = patch('src.core.server.create_connection_cache',
                                                    side_effect=mock_create_connection_cache)
         self.mock_create_connection_cache = self.create_connection_cache_patch.start()
-        self.ask_work_schedule_patch = patch('src.core.server.ask_work_schedule',
-                                             side_effect=mock_ask_work_schedule)
-        self.mock_ask_work_schedule = self.ask_work_schedule_patch.start()
+        self.next_shift_change_patch = patch('src.core.server.next_shift_change',
+                                             side_effect=mock_next_shift_change)
+        self.mock_next_shift_change = self.next_shift_change_patch.start()
+        self.current_shift_start_patch = patch('src.core.server.current_shift_start', return_value=0)
+        self.current_shift_start_patch.start()
 
     def tearDown(self):
         self.model_patch.stop()
@@ -120,7 +122,8 @@ class TestServer(unittest.TestCase):
         self.get_value_patch.stop()
         self.validate_probabilities_patch.stop()
         self.create_connection_cache_patch.stop()
-        self.ask_work_schedule_patch.stop()
+        self.next_shift_change_patch.stop()
+        self.current_shift_start_patch.stop()
 
     def test_init(self):
         """Test the initialization of the Server class."""
@@ -324,6 +327,8 @@ class TestServer(unittest.TestCase):
         server.handle_entity_arrival(entity1)
         server.handle_entity_arrival(entity2)
         gi.DURATION_WARM_UP = 0
+        Server.trace_units_utilized = True
+        self.addCleanup(setattr, Server, 'trace_units_utilized', False)
 
         self.env.run(until=10)
 
@@ -360,10 +365,10 @@ class TestServer(unittest.TestCase):
     def test_run_with_work_schedule_active(self):
         """Test the run method when work schedule is provided and active is True."""
 
-        def mock_ask_work_schedule_active(current_time, week):
-            return True, 0, None
+        def mock_next_shift_change_active(current_time, week):
+            return True, 1, 1
 
-        self.mock_ask_work_schedule.side_effect = mock_ask_work_schedule_active
+        self.mock_next_shift_change.side_effect = mock_next_shift_change_active
 
         server = Server(self.env, 'Server1', work_schedule=MockWorkSchedule())
         next_server = Server(self.env, 'NextServer')
@@ -376,10 +381,10 @@ class TestServer(unittest.TestCase):
     def test_run_with_work_schedule_inactive(self):
         """Test the run method when work schedule is provided and active is False."""
 
-        def mock_ask_work_schedule_inactive(current_time, week):
+        def mock_next_shift_change_inactive(current_time, week):
             return False, 2, None  # Not active, wait for 2 units
 
-        self.mock_ask_work_schedule.side_effect = mock_ask_work_schedule_inactive
+        self.mock_next_shift_change.side_effect = mock_next_shift_change_inactive
 
         server = Server(self.env, 'Server1', work_schedule=MockWorkSchedule())
         next_server = Server(self.env, 'NextServer')
@@ -389,10 +394,10 @@ class TestServer(unittest.TestCase):
         self.env.run(until=5)
         self.assertEqual(server.entities_processed, 0)
 
-        def mock_ask_work_schedule_active(current_time, week):
-            return True, 0, None
+        def mock_next_shift_change_active(current_time, week):
+            return True, 1, 1
 
-        self.mock_ask_work_schedule.side_effect = mock_ask_work_schedule_active
+        self.mock_next_shift_change.side_effect = mock_next_shift_change_active
         self.env.run(until=10)
         self.assertEqual(server.entities_processed, 1)
 
@@ -450,14 +455,14 @@ class TestServer(unittest.TestCase):
         next_server = Server(self.env, 'NextServer')
         server.connect(next_server, probability=100)
         subentity = SubEntity(name='SubEntity1', creation_time=self.env.now)
-        subentity.count_processing = MagicMock()
-        subentity.add_to_server_history = MagicMock()
         server.handle_entity_arrival(subentity)
 
         # Ensure that process is executed only once.
         with patch.object(server, 'route_entity', wraps=server.route_entity) as mock_route_entity:
             self.env.run(until=5)
             mock_route_entity.assert_called_once()
+        self.assertEqual(subentity.num_times_processed, 2)
+        self.assertEqual(subentity.server_history, ['Server1', 'NextServer'])
 
     def test_units_utilized_over_time(self):
         """Test that units_utilized_over_time is updated correctly."""
@@ -467,6 +472,8 @@ class TestServer(unittest.TestCase):
         next_server = Server(self.env, 'NextServer')
         server.connect(next_server, probability=100)
         gi.DURATION_WARM_UP = 0
+        Server.trace_units_utilized = True
+        self.addCleanup(setattr, Server, 'trace_units_utilized', False)
         entity1 = Entity(name='Entity1', creation_time=self.env.now)
         entity2 = Entity(name='Entity2', creation_time=self.env.now)
         server.handle_entity_arrival(entity1)
@@ -481,6 +488,44 @@ class TestServer(unittest.TestCase):
         # Expect 2 utilization periods as both entities should have been processed
         self.assertEqual(len(server.units_utilized_over_time), 2)
 
+    def test_units_utilized(self):
+        """Test that the time-weighted units utilized follow the busy units without a trace."""
+        server = Server(self.env, 'Server1', capacity=2, utilization_bucket_size=2,
+                        processing_time_distribution_with_parameters={'distribution': 'constant',
+                                                                      'parameters': {'value': 2}})
+        next_server = Server(self.env, 'NextServer')
+        server.connect(next_server, probability=100)
+        gi.DURATION_WARM_UP = 0
+        for name in ('Entity1', 'Entity2', 'Entity3'):
+            server.handle_entity_arrival(Entity(name=name, creation_time=self.env.now))
+
+        self.env.run(until=5)
+
+        # two units busy from 0 to 2, one unit from 2 to 4, none from 4 to 5
+        self.assertEqual(server.units_utilized_over_time, [])
+        self.assertAlmostEqual(server.units_utilized.average(self.env.now), 6 / 5)
+        self.assertEqual(server.utilization_per_bucket(), [2, 1, 0])
+
+    def test_queue_statistics(self):
+        """Test that the time-weighted queue length and the times in queue follow the queue."""
+        server = Server(self.env, 'Server1', capacity=1,
+                        processing_time_distribution_with_parameters={'distribution': 'constant',
+                                                                      'parameters': {'value': 2}})
+        next_server = Server(self.env, 'NextServer')
+        server.connect(next_server, probability=100)
+        gi.DURATION_WARM_UP = 0
+        for name in ('Entity1', 'Entity2', 'Entity3'):
+            server.handle_entity_arrival(Entity(name=name, creation_time=self.env.now))
+
+        self.env.run(until=6)
+
+        # two entities waiting from 0 to 2, one from 2 to 4, none from 4 to 6
+        self.assertAlmostEqual(server.queue_length.average(self.env.now), 1)
+        self.assertEqual(server.queue_length.maximum, 2)
+        self.assertEqual(server.number_left_queue, 3)
+        self.assertEqual(server.total_time_in_queue, 6)
+        self.assertEqual(server.max_time_in_queue, 4)
+
     def test_server_capacity_limit(self):
         """Test that server does not process more entities than its capacity."""
         server = Server(self.env, 'Server1', capacity=1,
@@ -0,0 +1,62 @@
+import math
+import pickle
+import unittest
+import pandas as pd
+from src.models.model4_1 import setup_model4_1
+from src.util.simulation_result import SimulationResult
+from src.util.simulations import run_simulation
+
+
+class TestSimulationResult(unittest.TestCase):
+
+    def setUp(self):
+        self.result = SimulationResult.from_statistics(
+            {'AvgTimeInSystem': 4.123456, 'NumberCreated': 10},
+            [{'Server': 'Server1', 'UnitsUtilized': 0.5, 'NumberExited': 9}],
+            {'Sink1': {'MinTimeInSystem': None, 'NumberEntered': 9}},
+            {'Source1': {'NumberCreated': 10, 'NumberExited': math.nan}})
+
+    def test_scalar_access(self):
+        self.assertEqual(self.result['Entity', 'Entity', 'AvgTimeInSystem'], 4.1235)
+        self.assertEqual(self.result.get('Server', 'Server1', 'NumberExited'), 9)
+        self.assertIsNone(self.result.get('Sink', 'Sink1', 'MinTimeInSystem'))
+        self.assertNotIn(('Source', 'Source1', 'NumberExited'), self.result)
+        self.assertEqual(len(self.result), 6)
+        with self.assertRaises(KeyError):
+            _ = self.result['Sink', 'Sink1', 'MinTimeInSystem']
+
+    def test_pivot_on_demand(self):
+        self.assertIsNone(self.result._pivot_table)
+        pivot_table = self.result.to_pivot()
+        self.assertIs(self.result.to_pivot(), pivot_table)
+
+        # the pivot table of the rows, without the missing values
+        rows = pd.DataFrame([{'Type': component_type, 'Name': name, 'Stat': stat, 'Value': value}
+                             for (component_type, name, stat), value in self.result.statistics.items()])
+        expected = rows.pivot_table(index=['Type', 'Name', 'Stat'], values='Value', aggfunc='mean')
+        self.assertTrue(pivot_table.equals(expected))
+        self.assertTrue(self.result.equals(expected))
+
+        # used like the pivot table
+        self.assertEqual(self.result.at[('Server', 'Server1', 'UnitsUtilized'), 'Value'], 0.5)
+        self.assertEqual(self.result.loc[('Sink', 'Sink1', 'NumberEntered'), 'Value'], 9)
+        self.assertEqual(list(self.result['Value']), list(pivot_table['Value']))
+
+    def test_pickle(self):
+        result = pickle.loads(pickle.dumps(self.result))
+        self.assertEqual(result.statistics, self.result.statistics)
+        self.assertTrue(result.equals(self.result))
+
+
+class TestRunSimulationResult(unittest.TestCase):
+
+    def test_run_simulation(self):
+        result = run_simulation(model=setup_model4_1, minutes=1440, log_pivot=False)
+        self.assertIsInstance(result, SimulationResult)
+        self.assertIsNone(result._pivot_table)
+        self.assertEqual(result['Sink', 'Sink1', 'NumberEntered'],
+                         result.at[('Sink', 'Sink1', 'NumberEntered'), 'Value'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+from src.core.model import Model
+from src.models.model4_1 import setup_model4_1
+from src.util.simulations import create_pivot, run_replications, target_precision_reached
+
+
+class TestCreatePivot(unittest.TestCase):
+
+    def setUp(self):
+        self.all_entity_stats = [{'AvgTimeInSystem': value} for value in [1.0, 3.0, 2.0, 4.0, 5.0, 1.0]]
+
+    def test_independent_replications(self):
+        pivot = create_pivot(self.all_entity_stats, {}, {}, {}, ['AvgTimeInSystem'], [], [], [])
+        row = pivot.loc[('Entity', 'Entity', 'AvgTimeInSystem')]
+        values = [1.0, 3.0, 2.0, 4.0, 5.0, 1.0]
+
+        self.assertAlmostEqual(row['Average'], np.mean(values), places=4)
+        self.assertAlmostEqual(row['Half-Width'], round(1.96 * np.std(values) / np.sqrt(6), 4), places=4)
+
+    def test_antithetic_pairs(self):
+        pivot = create_pivot(self.all_entity_stats, {}, {}, {}, ['AvgTimeInSystem'], [], [], [], antithetic=True)
+        row = pivot.loc[('Entity', 'Entity', 'AvgTimeInSystem')]
+        pair_means = [2.0, 3.0, 3.0]
+
+        self.assertAlmostEqual(row['Average'], np.mean(pair_means), places=4)
+        self.assertEqual(row['Minimum'], 1.0)
+        self.assertEqual(row['Maximum'], 5.0)
+        self.assertAlmostEqual(row['Half-Width'], round(1.96 * np.std(pair_means) / np.sqrt(3), 4), places=4)
+
+    def test_target_precision_reached(self):
+        pivot = create_pivot(self.all_entity_stats, {}, {}, {}, ['AvgTimeInSystem'], [], [], [])
+        kpi = ('Entity', 'Entity', 'AvgTimeInSystem')
+        relative_half_width = pivot.loc[kpi, 'Half-Width'] / pivot.loc[kpi, 'Average']
+
+        self.assertTrue(target_precision_reached(pivot, {kpi: relative_half_width + 0.01}))
+        self.assertFalse(target_precision_reached(pivot, {kpi: relative_half_width - 0.01}))
+        with self.assertRaises(KeyError):
+            target_precision_reached(pivot, {('Sink', 'Sink1', 'AvgTimeInSystem'): 0.1})
+
+
+class TestSequentialReplications(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(Model.current.activate)
+
+    def run_sequential(self, target, **kwargs):
+        kpi = ('Sink', 'Sink1', 'AvgTimeInSystem')
+        return run_replications(model=setup_model4_1, minutes=1440, num_replications=30,
+                                target_precision={kpi: target}, **kwargs).loc[kpi]
+
+    def test_stops_at_target_precision(self):
+        with self.assertLogs(level='INFO') as logs:
+            row = self.run_sequential(0.2, min_replications=4, batch_size=2)
+        self.assertLessEqual(row['Half-Width'], 0.2 * row['Average'])
+        reached = [line for line in logs.output if "Target precision reached" in line]
+        self.assertEqual(len(reached), 1)
+        replications = int(reached[0].split()[-2])
+        self.assertTrue(4 <= replications < 30 and replications % 2 == 0)
+
+    def test_stops_at_maximum(self):
+        with self.assertLogs(level='WARNING') as logs:
+            row = self.run_sequential(0.0001, batch_size=8)
+        self.assertIn("maximum of 30 replications", logs.output[-1])
+        self.assertGreater(row['Half-Width'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
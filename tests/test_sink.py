@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import Mock, patch
 from simpy import Environment
-from src.core.entity import Entity
+from src.core.entity import Entity, EntityManager
 from src.core.model import Model, ComponentType
 from src.core.tally_statistic import TallyStatistic
 from src.util.date_time import DateTime
@@ -12,6 +12,8 @@ import logging
 
 class TestSink(unittest.TestCase):
     def setUp(self):
+        EntityManager.retain_entities = True
+        self.addCleanup(setattr, EntityManager, 'retain_entities', False)
         self.env = Mock(spec=Environment)
         self.env.now = 0  # Initialize env.now
         self.sink = Sink(self.env, "TestSink")
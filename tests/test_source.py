@@ -5,6 +5,7 @@ import logging
 import pandas as pd
 from io import StringIO
 from src.core.source import Source
+from src.core.entity import EntityManager
 
 
 # Mocking external dependencies
@@ -29,12 +30,6 @@ class Entity:
         self.creation_time = creation_time
 
 
-class DateTime:
-    @staticmethod
-    def get(time):
-        return f"Time: {time}"
-
-
 class gi:
     DURATION_WARM_UP = 0
 
@@ -52,6 +47,9 @@ class Model:
         self.components.append((component, component_type))
 
 
+Model.current = Model()
+
+
 class ComponentType:
     SOURCES = 'sources'
 
@@ -59,15 +57,16 @@ class ComponentType:
 class TestSource(unittest.TestCase):
     def setUp(self):
         # Patching the external dependencies
+        EntityManager.retain_entities = True
+        self.addCleanup(setattr, EntityManager, 'retain_entities', False)
         patcher1 = patch('src.core.source.get_value_from_distribution_with_parameters',
                          get_value_from_distribution_with_parameters)
         patcher2 = patch('src.core.source.validate_probabilities', validate_probabilities)
         patcher3 = patch('src.core.source.create_connection_cache', create_connection_cache)
         patcher4 = patch('src.core.source.Entity', Entity)
-        patcher5 = patch('src.core.source.DateTime', DateTime)
-        patcher6 = patch('src.util.global_imports', gi)
-        patcher7 = patch('src.core.source.Model', Model)
-        patcher8 = patch('src.core.source.ComponentType', ComponentType)
+        patcher5 = patch('src.util.global_imports', gi)
+        patcher6 = patch('src.core.source.Model', Model)
+        patcher7 = patch('src.core.source.ComponentType', ComponentType)
         self.addCleanup(patcher1.stop)
         self.addCleanup(patcher2.stop)
         self.addCleanup(patcher3.stop)
@@ -75,7 +74,6 @@ class TestSource(unittest.TestCase):
         self.addCleanup(patcher5.stop)
         self.addCleanup(patcher6.stop)
         self.addCleanup(patcher7.stop)
-        self.addCleanup(patcher8.stop)
         patcher1.start()
         patcher2.start()
         patcher3.start()
@@ -83,7 +81,6 @@ class TestSource(unittest.TestCase):
         patcher5.start()
         patcher6.start()
         patcher7.start()
-        patcher8.start()
 
     def test_source_creation_with_distribution(self):
         env = simpy.Environment()
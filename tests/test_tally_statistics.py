@@ -71,13 +71,13 @@ class TestCases(unittest.TestCase):
     def test_single_run_statistics(self):
         EntityManager.destroy_all_entities()
         pivot_table = run_simulation(model=setup_model_pcb, minutes=1440)
-        self.assertEqual(pivot_table.at[('Entity', 'Entity', 'AvgTimeInSystem'), 'Value'], 147.5555)
+        self.assertEqual(pivot_table.at[('Entity', 'Entity', 'AvgTimeInSystem'), 'Value'], 198.3907)
 
-        self.assertEqual(pivot_table.at[('Sink', 'GoodParts', 'NumTimesProcessed_Avg'), 'Value'], 3.6269)
+        self.assertEqual(pivot_table.at[('Sink', 'GoodParts', 'NumTimesProcessed_Avg'), 'Value'], 3.7059)
         self.assertEqual(pivot_table.at[('Sink', 'GoodParts', 'NumTimesProcessed_Max'), 'Value'], 7.0)
         self.assertEqual(pivot_table.at[('Sink', 'GoodParts', 'NumTimesProcessed_Min'), 'Value'], 3.0)
 
-        self.assertEqual(pivot_table.at[('Sink', 'BadParts', 'NumTimesProcessed_Avg'), 'Value'], 5.9231)
+        self.assertEqual(pivot_table.at[('Sink', 'BadParts', 'NumTimesProcessed_Avg'), 'Value'], 5.4348)
         self.assertEqual(pivot_table.at[('Sink', 'BadParts', 'NumTimesProcessed_Max'), 'Value'], 11.0)
         self.assertEqual(pivot_table.at[('Sink', 'BadParts', 'NumTimesProcessed_Min'), 'Value'], 3.0)
 
@@ -93,6 +93,8 @@ class TestCases(unittest.TestCase):
         self.assertEqual(self.tally_statistic.num_times_processed_list, [5], 'tally statistics are not fillled')
 
     def test_entity_class(self):
+        EntityManager.retain_entities = True
+        self.addCleanup(setattr, EntityManager, 'retain_entities', False)
         source = Source(self.env, "TestSource", (random.expovariate, 1 / 6),
                         entity_class=self.entity_sub_class)
         server = Server(self.env, "TestServer", (random.triangular, 3, 5, 4))
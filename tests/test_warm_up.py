@@ -0,0 +1,103 @@
+import math
+import unittest
+from unittest.mock import patch
+import numpy as np
+import src.util.global_imports as gi
+from src.core.model import Model
+from src.models.model4_1 import setup_model4_1
+from src.util.global_imports import set_duration_warm_up
+from src.util.simulations import calculate_statistics, replication, run_simulation
+from src.util.warm_up import MserWarmUp, mser
+
+
+class TestMser(unittest.TestCase):
+
+    def test_truncates_initial_bias(self):
+        rng = np.random.default_rng(1)
+        batch_means = rng.normal(10, 1, 400)
+        batch_means[:40] += np.linspace(30, 0, 40)
+        self.assertTrue(35 <= mser(batch_means) <= 45)
+
+    def test_no_truncation_of_stationary_output(self):
+        rng = np.random.default_rng(1)
+        self.assertLess(mser(rng.normal(10, 1, 400)), 40)
+
+    def test_only_first_half(self):
+        self.assertLess(mser(np.arange(100, 0, -1.0)), 50)
+
+
+class TestMserWarmUp(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(set_duration_warm_up, 0)
+        self.addCleanup(setattr, MserWarmUp, 'active', None)
+
+    def test_detection(self):
+        detector = MserWarmUp(minutes=10000).start()
+        self.assertEqual(gi.DURATION_WARM_UP, math.inf)
+        rng = np.random.default_rng(1)
+        time = 0
+        while MserWarmUp.active is detector:
+            time += 1
+            detector.observe(time, rng.normal(10, 1) + max(0, 50 - time / 10))
+        self.assertEqual(gi.DURATION_WARM_UP, detector.warm_up)
+        self.assertAlmostEqual(detector.warm_up, time)
+        self.assertTrue(400 <= detector.truncation_time <= 600)
+        self.assertLess(time, 5000)
+
+    def test_restore(self):
+        set_duration_warm_up(30)
+        detector = MserWarmUp(minutes=10000).start()
+        detector.observe(1, 10)
+        detector.restore()
+        self.assertEqual(gi.DURATION_WARM_UP, 30)
+        self.assertIsNone(MserWarmUp.active)
+
+    def test_run_too_short(self):
+        detector = MserWarmUp(minutes=100).start()
+        for time in range(51):
+            detector.observe(time, time)
+        self.assertIsNone(MserWarmUp.active)
+        self.assertAlmostEqual(detector.warm_up, 50)
+        self.assertIsNone(detector.truncation_time)
+
+
+class TestMserWarmUpOfRun(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(Model.current.activate)
+        self.addCleanup(set_duration_warm_up, 0)
+
+    def test_run_simulation(self):
+        detectors = []
+
+        class RecordedMserWarmUp(MserWarmUp):
+            def start(self):
+                detectors.append(self)
+                return super().start()
+
+        set_duration_warm_up(30)
+        with patch('src.util.simulations.MserWarmUp', RecordedMserWarmUp):
+            pivot_table = run_simulation(model=setup_model4_1, minutes=10080, warm_up='mser')
+        warm_up = pivot_table.loc[('Entity', 'Entity', 'WarmUp'), 'Value']
+        self.assertTrue(0 < warm_up < 10080 / 2)
+        self.assertAlmostEqual(detectors[0].warm_up, warm_up, places=3)
+        # the warm-up from before the run is set again
+        self.assertEqual(gi.DURATION_WARM_UP, 30)
+        self.assertIsNone(MserWarmUp.active)
+
+        # the statistics are the ones of a run with the detected warm-up
+        fixed_pivot_table = run_simulation(model=setup_model4_1, minutes=10080, warm_up=detectors[0].warm_up)
+        np.testing.assert_allclose(pivot_table.drop(('Entity', 'Entity', 'WarmUp'))['Value'],
+                                   fixed_pivot_table['Value'])
+
+    def test_replication(self):
+        set_duration_warm_up(30)
+        entity_stats = replication(setup_model4_1, calculate_statistics, 10080, 0, mser_warm_up=True)[0]
+        self.assertTrue(0 < entity_stats['WarmUp'] < 10080 / 2)
+        self.assertEqual(gi.DURATION_WARM_UP, 30)
+        self.assertIsNone(MserWarmUp.active)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,13 @@
 import unittest
+from src.core.event_calendar import EventCalendar
+from src.core.model import Model
 from src.core.server import Server
 from src.core.sink import Sink
 from src.core.source import Source
 from src.util.global_imports import random
 from src.util.simulations import run_simulation, run_replications
-from src.util.work_schedule import (WorkScheduleDay, WorkScheduleWeek)
-from src.util.date_time import DateTime
+from src.util.work_schedule import (WorkScheduleDay, WorkScheduleWeek, ask_work_schedule, next_shift_change)
+from src.util.date_time import DateTime, TimeComponent
 from datetime import datetime
 
 
@@ -26,13 +28,103 @@ def setup_working_schedule(env):
         workday, workday, workday, workday, friday, weekend, weekend
     )
     source1 = Source(env, "Source1", (random.expovariate, 1 / 1.25))
-    server1 = Server(env, "Server1", (random.expovariate, 1), week)
+    server1 = Server(env, "Server1", (random.expovariate, 1), work_schedule=week)
     sink1 = Sink(env, "Sink1")
 
     source1.connect(server1)
     server1.connect(sink1)
 
 
+def setup_week():
+    DateTime.set(datetime(2024, 12, 9, 0, 0, 0))   # Monday
+
+    workday = WorkScheduleDay()
+    workday.set_time(9, 0, 13, 0)
+    workday.set_time(13, 0, 16, 0)
+    workday.set_time(18, 0, 24, 0)
+
+    monday = WorkScheduleDay()
+    monday.set_time(0, 0, 5, 0)
+
+    weekend = WorkScheduleDay()
+
+    return WorkScheduleWeek(monday, workday, workday, workday, workday, weekend, workday)
+
+
+class TestShiftChanges(unittest.TestCase):
+
+    def setUp(self):
+        DateTime.map(TimeComponent.minute)
+
+    def test_transitions(self):
+        week = setup_week()
+        day = DateTime.map_time_to_steps(1)
+        hour = DateTime.map_time_to_steps(0, 1)
+        # adjacent shifts are merged, also across midnight from Sunday to Monday
+        self.assertEqual(week.transition_times[:3], [5 * hour, day + 9 * hour, day + 16 * hour])
+        self.assertEqual(week.transition_capacities[:3], [None, 1, None])
+        self.assertEqual(week.transition_times[-1], 6 * day + 18 * hour)
+        self.assertEqual(week.transition_capacities[-1], 1)
+
+    def test_next_shift_change(self):
+        week = setup_week()
+        day = DateTime.map_time_to_steps(1)
+        hour = DateTime.map_time_to_steps(0, 1)
+        self.assertEqual(next_shift_change(0, week), (True, 5 * hour, 1))
+        self.assertEqual(next_shift_change(5 * hour, week), (False, day + 4 * hour, None))
+        self.assertEqual(next_shift_change(day + 12 * hour, week), (True, 4 * hour, 1))
+        # Sunday evening wraps around to Monday morning
+        self.assertEqual(next_shift_change(6 * day + 20 * hour, week), (True, 9 * hour, 1))
+        self.assertEqual(next_shift_change(7 * day + hour, week), (True, 4 * hour, 1))
+
+    def test_ask_work_schedule(self):
+        week = setup_week()
+        hour = DateTime.map_time_to_steps(0, 1)
+        self.assertEqual(ask_work_schedule(hour, week), (True, 0, 1))
+        self.assertEqual(ask_work_schedule(6 * hour, week), (False, 27 * hour, None))
+
+
+def setup_shift_capacity(env):
+    DateTime.set(datetime(2024, 12, 9, 0, 0, 0))   # Monday
+
+    day = WorkScheduleDay()
+    day.set_time(0, 0, 12, 0, capacity=2)
+    day.set_time(12, 0, 24, 0, capacity=1)
+
+    week = WorkScheduleWeek(day, day, day, day, day, day, day)
+    source1 = Source(env, "Source1", (lambda: 0.5,))
+    server1 = Server(env, "Server1", (lambda: 1,), work_schedule=week)
+    sink1 = Sink(env, "Sink1")
+
+    source1.connect(server1)
+    server1.connect(sink1)
+
+
+class TestShiftCapacity(unittest.TestCase):
+
+    def setUp(self):
+        DateTime.map(TimeComponent.minute)
+        self.addCleanup(Model.current.activate)
+
+    def test_shift_capacity(self):
+        for event_calendar in (False, True):
+            pivot_table = run_simulation(model=setup_shift_capacity, minutes=1440, event_calendar=event_calendar)
+            # two units in the first half of the day, one unit in the second half, always busy
+            self.assertEqual(pivot_table.at[('Server', 'Server1', 'NumberExited'), 'Value'], 2 * 720 - 2 + 720)
+            self.assertEqual(pivot_table.at[('Server', 'Server1', 'ScheduledUtilization'), 'Value'], 99.9074)
+
+    def test_utilization_per_shift(self):
+        with Model():
+            env = EventCalendar()
+            setup_shift_capacity(env)
+            env.run(until=1440)
+            server, = Server.servers
+            utilization = server.utilization_per_shift()
+        # the first entity arrives after 0.5 minutes
+        self.assertAlmostEqual(utilization[(0, 0, 0)], (1440 - 1.5) / 1440 * 100)
+        self.assertAlmostEqual(utilization[(0, 12, 0)], 100)
+
+
 class TestCases(unittest.TestCase):
 
     def test_single_run(self):
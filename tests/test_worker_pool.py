@@ -0,0 +1,59 @@
+import multiprocessing
+import unittest
+import src.util.global_imports as gi
+from src.core.model import Model
+from src.core.server import Server
+from src.core.sink import Sink
+from src.core.source import Source
+from src.models.model4_1 import setup_model4_1
+from src.util.global_imports import random, set_duration_warm_up
+from src.util.simulations import run_replications
+from src.util.worker_pool import WorkerPool
+
+
+def setup_model_renamed_in_workers(env):
+    # the sink of the replications in the workers has another name than the one of the first replication
+    source1 = Source(env, "Source1", (random.expovariate, 1 / 1.25))
+    server1 = Server(env, "Server1", (random.expovariate, 1))
+    sink1 = Sink(env, "WorkerSink" if multiprocessing.parent_process() is not None else "Sink1")
+    source1.connect(server1)
+    server1.connect(sink1)
+
+
+class TestWorkerPool(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(WorkerPool.shutdown)
+        self.addCleanup(set_duration_warm_up, 0)
+        self.addCleanup(Model.current.activate)
+
+    def test_pool_is_reused(self):
+        executor = WorkerPool.get(1)
+        self.assertIs(WorkerPool.get(1), executor)
+        self.assertIsNot(WorkerPool.get(2), executor)
+        WorkerPool.shutdown()
+        self.assertIsNone(WorkerPool.executor)
+
+    def test_replications_across_calls(self):
+        sequential = run_replications(model=setup_model4_1, minutes=600, num_replications=6)
+        first = run_replications(model=setup_model4_1, minutes=600, num_replications=6, multiprocessing=True)
+        executor = WorkerPool.executor
+        # the workers were started without warm-up, it is passed with the chunks
+        with_warm_up = run_replications(model=setup_model4_1, minutes=600, num_replications=6, warm_up=300,
+                                        multiprocessing=True)
+
+        self.assertIs(WorkerPool.executor, executor)
+        self.assertTrue(first.equals(sequential))
+        self.assertEqual(gi.DURATION_WARM_UP, 300)
+        self.assertTrue(with_warm_up.equals(run_replications(model=setup_model4_1, minutes=600,
+                                                             num_replications=6, warm_up=300)))
+        self.assertFalse(with_warm_up.equals(first))
+
+    def test_worker_errors_are_raised(self):
+        with self.assertRaisesRegex(ValueError, "Sink1"):
+            run_replications(model=setup_model_renamed_in_workers, minutes=600, num_replications=4,
+                             multiprocessing=True)
+
+
+if __name__ == '__main__':
+    unittest.main()